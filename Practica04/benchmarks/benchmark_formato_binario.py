@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Compara el guardado y la carga completos de FileManager con el archivo
+JSON y con la instantánea binaria (snapshot_codec, archivos .bin/.tqs):
+tiempo de guardar y de cargar (hasta tener los contenedores listos),
+tareas por segundo y tamaño del archivo, con 10.000, 100.000 y 1.000.000
+de tareas por defecto.
+
+Uso (desde la carpeta Practica04):
+    python benchmarks/benchmark_formato_binario.py [N ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Permite importar src.* al ejecutar el script directamente
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.FileManager import FileManager
+from src.coreClasses.Task import Task
+
+TAMANOS = (10_000, 100_000, 1_000_000)
+
+def silencioso(funcion, *args):
+    """Ejecuta la función sin los mensajes de FileManager."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcion(*args)
+
+def crear_tareas(n: int) -> list[Task]:
+    """n tareas de títulos, descripciones, prioridades y fechas variados."""
+    ahora = time.time()
+    return [Task(i, f"Tarea número {i}", "Descripción de la tarea " * (i % 4), priority=(i % 3) + 1,
+                 due_at=ahora + i if i % 5 == 0 else None, depends_on=(i - 1,) if i % 10 == 0 else ())
+            for i in range(1, n + 1)]
+
+def medir(n: int, extension: str, directorio: str) -> tuple[float, float, int]:
+    """Devuelve (segundos al guardar, segundos al cargar, bytes del archivo)."""
+    ruta = os.path.join(directorio, "tareas" + extension)
+    gestor = silencioso(FileManager, ruta, os.path.join(directorio, "contador.json"))
+    pendientes, completadas = gestor.create_containers()
+    pendientes.addTasks(crear_tareas(n))
+    for _ in range(n // 10): # Una de cada diez, completada
+        completadas.addTask(pendientes.completeTask())
+
+    inicio = time.perf_counter()
+    if not silencioso(gestor.save_all_data, pendientes, completadas):
+        raise RuntimeError(f"No se pudo guardar en '{ruta}'.")
+    segundos_guardar = time.perf_counter() - inicio
+
+    gestor = silencioso(FileManager, ruta, os.path.join(directorio, "contador.json"))
+    inicio = time.perf_counter()
+    cargadas = silencioso(gestor.load_all_data)
+    segundos_cargar = time.perf_counter() - inicio
+    if [len(cargadas[0]), len(cargadas[1])] != [len(pendientes), len(completadas)]:
+        print(f"{extension}: ¡no se cargaron todas las tareas!")
+    return segundos_guardar, segundos_cargar, os.path.getsize(ruta)
+
+def main(tamanos) -> None:
+    print(f"{'tareas':>10}  {'formato':<9}{'guardar (s)':>12}{'tareas/s':>12}"
+          f"{'cargar (s)':>12}{'tareas/s':>12}{'tamaño (MB)':>13}")
+    for n in tamanos:
+        for nombre, extension in (("JSON", ".json"), ("binario", ".bin")):
+            with tempfile.TemporaryDirectory() as directorio:
+                guardar, cargar, tamano = medir(n, extension, directorio)
+            print(f"{n:>10}  {nombre:<9}{guardar:>12.3f}{n / guardar:>12.0f}"
+                  f"{cargar:>12.3f}{n / cargar:>12.0f}{tamano / 1024 / 1024:>13.1f}")
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANOS)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark de CythonQueue ante una ráfaga de elementos.
+
+Para cada configuración encola N elementos (10.000.000 por defecto), los
+desencola todos y mide el rendimiento de enqueue/dequeue junto con la
+memoria residente (RSS) antes de la ráfaga, en su pico y después de drenarla.
+Cada configuración se ejecuta en un proceso aparte para que el pico de
+memoria de una no contamine a las demás.
+
+Requiere haber compilado la extensión (python setup.py build_ext --inplace).
+
+Uso (desde la carpeta Practica04):
+    python benchmarks/benchmark_queue_burst.py [N]
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONFIGURACIONES = {
+    "modulo (original)": {},
+    "potencia de dos": {"power_of_two": True},
+    "potencia de dos + encoger": {"power_of_two": True, "shrink_threshold": 0.25},
+    "factor 1.5 + encoger": {"growth_factor": 1.5, "shrink_threshold": 0.25},
+}
+
+def _rss_actual_mb() -> float:
+    """Memoria residente actual en MB (Linux: /proc; otros: pico como aproximación)."""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return _rss_pico_mb()
+
+def _rss_pico_mb() -> float:
+    """Pico de memoria residente del proceso en MB."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB, macOS en bytes
+    return pico / 2**20 if sys.platform == "darwin" else pico / 1024
+
+def ejecutar_configuracion(nombre: str, n: int) -> None:
+    """Ejecuta la ráfaga con una configuración e imprime una línea de resultados."""
+    from src.coreClasses.queue_cython import CythonQueue
+
+    cola = CythonQueue(**CONFIGURACIONES[nombre])
+    elemento = object() # El mismo objeto siempre: solo se mide la cola
+    rss_antes = _rss_actual_mb()
+
+    inicio = time.perf_counter()
+    for _ in range(n):
+        cola.enqueue(elemento)
+    segundos_enqueue = time.perf_counter() - inicio
+    capacidad_pico = cola.get_capacity()
+
+    inicio = time.perf_counter()
+    for _ in range(n):
+        cola.dequeue()
+    segundos_dequeue = time.perf_counter() - inicio
+    rss_despues = _rss_actual_mb()
+
+    print(f"{nombre:<27}{n / segundos_enqueue / 1e6:>10.2f}{n / segundos_dequeue / 1e6:>10.2f}"
+          f"{rss_antes:>10.1f}{_rss_pico_mb():>10.1f}{rss_despues:>10.1f}"
+          f"{capacidad_pico:>12}{cola.get_capacity():>10}")
+
+def main(n: int) -> None:
+    """Lanza un subproceso por configuración."""
+    print(f"Ráfaga de {n} elementos. Rendimiento en millones de ops/s, memoria en MB.")
+    print(f"{'configuración':<27}{'enqueue':>10}{'dequeue':>10}{'RSS ant.':>10}"
+          f"{'RSS pico':>10}{'RSS desp.':>10}{'cap. pico':>12}{'cap. fin':>10}")
+    sys.stdout.flush()
+    for nombre in CONFIGURACIONES:
+        subprocess.run([sys.executable, os.path.abspath(__file__), str(n), nombre], check=True)
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    if len(sys.argv) > 2:
+        ejecutar_configuracion(sys.argv[2], cantidad)
+    else:
+        main(cantidad)
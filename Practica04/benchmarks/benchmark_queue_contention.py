@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de contención de BlockingCythonQueue con varios hilos.
+
+Para 1, 2, 4, 8 y 16 productores/consumidores reparte N elementos entre
+los productores y mide el rendimiento total (elementos/s) de:
+
+    * queue.Queue de la biblioteca estándar (put/get),
+    * BlockingCythonQueue con put/get elemento a elemento,
+    * BlockingCythonQueue con put_many/get_many por lotes.
+
+Todas las colas tienen capacidad limitada, así que también se mide el coste
+de la contrapresión sobre los productores.
+
+Requiere haber compilado la extensión (python setup.py build_ext --inplace).
+
+Uso (desde la carpeta Practica04):
+    python benchmarks/benchmark_queue_contention.py [N] [capacidad] [lote]
+"""
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.coreClasses.queue_cython import BlockingCythonQueue
+
+HILOS = (1, 2, 4, 8, 16)
+FIN = None # Centinela que indica a un consumidor que termine
+
+def ejecutar(cola, hilos: int, n: int, lote: int, por_lotes: bool) -> float:
+    """Lanza 'hilos' productores y consumidores y devuelve los segundos totales."""
+    por_productor = n // hilos
+    consumidos = [0] * hilos
+
+    def productor():
+        elementos = list(range(por_productor))
+        if por_lotes:
+            for inicio in range(0, por_productor, lote):
+                cola.put_many(elementos[inicio:inicio + lote])
+        else:
+            for elemento in elementos:
+                cola.put(elemento)
+
+    def consumidor(indice):
+        while True:
+            recibidos = cola.get_many(lote) if por_lotes else [cola.get()]
+            finales = recibidos.count(FIN)
+            consumidos[indice] += len(recibidos) - finales
+            if finales:
+                # Devolver los centinelas que pertenecen a otros consumidores
+                for _ in range(finales - 1):
+                    cola.put(FIN)
+                return
+
+    consumidores = [threading.Thread(target=consumidor, args=(i,)) for i in range(hilos)]
+    productores = [threading.Thread(target=productor) for _ in range(hilos)]
+    inicio = time.perf_counter()
+    for hilo in consumidores + productores:
+        hilo.start()
+    for hilo in productores:
+        hilo.join()
+    for _ in range(hilos):
+        cola.put(FIN)
+    for hilo in consumidores:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+    if sum(consumidos) != por_productor * hilos:
+        print(f"¡Se perdieron elementos! {sum(consumidos)} de {por_productor * hilos}")
+    return segundos
+
+def main(n: int, capacidad: int, lote: int) -> None:
+    print(f"{n} elementos, capacidad {capacidad}, lotes de {lote}. Miles de elementos/s:")
+    print(f"{'hilos':>6}{'queue.Queue':>14}{'Cython get':>14}{'Cython lotes':>14}")
+    for hilos in HILOS:
+        total = (n // hilos) * hilos
+        estandar = ejecutar(queue.Queue(capacidad), hilos, n, lote, False)
+        cython = ejecutar(BlockingCythonQueue(capacidad), hilos, n, lote, False)
+        lotes = ejecutar(BlockingCythonQueue(capacidad), hilos, n, lote, True)
+        print(f"{hilos:>6}{total / estandar / 1e3:>14.0f}{total / cython / 1e3:>14.0f}{total / lotes / 1e3:>14.0f}")
+
+if __name__ == "__main__":
+    argumentos = [int(arg) for arg in sys.argv[1:4]]
+    cantidad, capacidad, lote = argumentos + [200_000, 1024, 64][len(argumentos):]
+    main(cantidad, capacidad, lote)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Compara tres formas de guardar y reconstruir una cola de tareas:
+
+    * JSON: to_dict + json.dumps y, al volver, json.loads + Task.from_dict
+      + encolar (lo que hace FileManager).
+    * pickle de la CythonQueue (__reduce__).
+    * to_bytes/from_bytes (formato binario de task_codec).
+
+Requiere haber compilado la extensión (python setup.py build_ext --inplace).
+
+Uso (desde la carpeta Practica04):
+    python benchmarks/benchmark_task_codec.py [N]
+"""
+import json
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.coreClasses.Task import Task
+from src.coreClasses.queue_cython import CythonQueue
+
+def crear_cola(n: int) -> CythonQueue:
+    """Cola con n tareas de títulos y descripciones variados."""
+    cola = CythonQueue()
+    cola.extend_from_list([Task(i, f"Tarea número {i}", "Descripción de la tarea " * (i % 4),
+                                priority=(i % 3) + 1) for i in range(1, n + 1)])
+    return cola
+
+def guardar_json(cola: CythonQueue) -> bytes:
+    return json.dumps([task.to_dict() for task in cola], ensure_ascii=False).encode("utf-8")
+
+def cargar_json(datos: bytes) -> CythonQueue:
+    cola = CythonQueue()
+    cola.extend_from_list([Task.from_dict(d) for d in json.loads(datos)])
+    return cola
+
+def guardar_pickle(cola: CythonQueue) -> bytes:
+    return pickle.dumps(cola, protocol=pickle.HIGHEST_PROTOCOL)
+
+def guardar_binario(cola: CythonQueue) -> bytes:
+    return cola.to_bytes()
+
+def medir(funcion, argumento, repeticiones: int = 3):
+    """Devuelve (mejor tiempo en segundos, resultado de la última ejecución)."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(argumento)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+def main(n: int) -> None:
+    cola = crear_cola(n)
+    esperado = [task.to_dict() for task in cola]
+    print(f"Ida y vuelta de una cola con {n} tareas (mejor de 3):")
+    print(f"{'formato':<10}{'guardar (s)':>13}{'cargar (s)':>13}{'tamaño (KB)':>13}")
+    for nombre, guardar, cargar in (("JSON", guardar_json, cargar_json),
+                                    ("pickle", guardar_pickle, pickle.loads),
+                                    ("binario", guardar_binario, CythonQueue.from_bytes)):
+        segundos_guardar, datos = medir(guardar, cola)
+        segundos_cargar, recuperada = medir(cargar, datos)
+        if [task.to_dict() for task in recuperada] != esperado:
+            print(f"{nombre}: ¡la cola recuperada no coincide!")
+        print(f"{nombre:<10}{segundos_guardar:>13.3f}{segundos_cargar:>13.3f}{len(datos) / 1024:>13.0f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de memoria y rendimiento de Task.
+
+Compara la Task compacta (__slots__, estado y prioridad como IntEnum)
+con la representación anterior basada en __dict__ y estados en texto,
+creando N tareas (1.000.000 por defecto).
+
+Uso (desde la carpeta Practica04):
+    python benchmarks/benchmark_task_memoria.py [N]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Permite importar src.* al ejecutar el script directamente
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.coreClasses.Task import Task, TaskStatus
+
+class LegacyTask:
+    """Copia reducida de la Task anterior (con __dict__ y estados en texto)."""
+    STATUS_PENDING = "Pendiente"
+    STATUS_COMPLETED = "Completada"
+
+    def __init__(self, task_id, title, description, status=STATUS_PENDING, priority=1):
+        if not isinstance(task_id, int) or task_id <= 0:
+            raise ValueError("task_id debe ser un entero positivo.")
+        if not title:
+            raise ValueError("El título no puede estar vacío.")
+        self.task_id = task_id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.priority = priority
+
+    def changeStatus(self, newStatus):
+        if newStatus in [self.STATUS_PENDING, self.STATUS_COMPLETED]:
+            self.status = newStatus
+
+    def to_dict(self):
+        return {"task_id": self.task_id, "title": self.title, "description": self.description,
+                "status": self.status, "priority": self.priority}
+
+def _cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+def medir(clase, n, completed, es_pendiente):
+    """Mide memoria y tiempos de las operaciones habituales para una clase de tarea."""
+    # Los textos se comparten entre tareas para medir solo el coste por instancia
+    titulo, descripcion = "Tarea", "Descripción"
+    gc.collect()
+    tracemalloc.start()
+    segundos_crear, tareas = _cronometrar(
+        lambda: [clase(i, titulo, descripcion, priority=(i % 3) + 1) for i in range(1, n + 1)])
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    resultados = {
+        "bytes/tarea": memoria / n,
+        "crear (s)": segundos_crear,
+        "filtrar pendientes (s)": _cronometrar(lambda: sum(1 for t in tareas if es_pendiente(t)))[0],
+        "changeStatus (s)": _cronometrar(lambda: [t.changeStatus(completed) for t in tareas])[0],
+        "to_dict (s)": _cronometrar(lambda: [t.to_dict() for t in tareas])[0],
+    }
+    del tareas
+    gc.collect()
+    return resultados
+
+def main(n=1_000_000):
+    """Ejecuta el benchmark e imprime una tabla comparativa."""
+    anterior = medir(LegacyTask, n, LegacyTask.STATUS_COMPLETED,
+                     lambda t: t.status == LegacyTask.STATUS_PENDING)
+    pendiente = int(TaskStatus.PENDING)
+    compacta = medir(Task, n, TaskStatus.COMPLETED,
+                     lambda t: t.status_code == pendiente)
+
+    print(f"{n} tareas")
+    print(f"{'métrica':<24}{'anterior':>14}{'compacta':>14}{'mejora':>10}")
+    for metrica in anterior:
+        mejora = anterior[metrica] / compacta[metrica] if compacta[metrica] else float("inf")
+        print(f"{metrica:<24}{anterior[metrica]:>14.3f}{compacta[metrica]:>14.3f}{mejora:>9.2f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -6,6 +6,7 @@ Ensambla la interfaz gráfica y conecta la lógica de negocio.
 """
 import sys
 import os # Para asegurar rutas de importación
+from datetime import datetime
 
 # --- Añadir src al sys.path si main.py está fuera de src ---
 # Esto permite importar módulos de src usando src.module
@@ -15,7 +16,7 @@ if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 # -----------------------------------------------------------
 
-from PySide6.QtCore import Slot, QObject, Qt, QFile, QTextStream
+from PySide6.QtCore import Slot, QObject, Qt, QFile, QTextStream, QTimer
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QHBoxLayout, QMessageBox, QInputDialog, QLineEdit)
 from PySide6.QtGui import QCloseEvent
@@ -27,7 +28,12 @@ try:
     from src.coreClasses.Task import Task
     # Importar CythonQueue renombrada como Queue
     from src.coreClasses.queue_cython import CythonQueue as Queue
-    from src.coreClasses.Stack import Stack
+    # Importar CythonStack renombrada como Stack
+    from src.coreClasses.stack_cython import CythonStack as Stack
+    from src.coreClasses.TaskIndex import TaskIndex
+    from src.coreClasses.TextSearchIndex import TextSearchIndex
+    from src.coreClasses.RecurrenceRule import RecurrenceRule
+    from src.coreClasses.RecurrenceScheduler import RecurrenceScheduler
     from src.PendingTasks import PendingTasks
     from src.CompletedTasks import CompletedTasks
     from src.FileManager import FileManager
@@ -38,17 +44,48 @@ except ImportError as e:
 # GUI Classes
 try:
     from src.GUIClasses.TaskModel import TaskModel # Modelo Adaptador
-    from src.GUIClasses.PriorityFilterProxyModel import PriorityFilterProxyModel
+    from src.GUIClasses.TaskSearchProxyModel import TaskSearchProxyModel
     from src.GUIClasses.TaskListView import TaskListView
     from src.GUIClasses.TaskListManager import TaskListManager
     from src.GUIClasses.TaskDetailWidget import TaskDetailWidget
     from src.GUIClasses.ListChangeButtons import ListChangeButtons
     from src.GUIClasses.TaskFilters import TaskFilters
     from src.GUIClasses.TaskManagementButtons import TaskManagementButtons
+    from src.GUIClasses.DeadlineWatcher import DeadlineWatcher
+    from src.GUIClasses.TaskLoader import TaskLoader
+    from src.GUIClasses.AutoSaveService import AutoSaveService
 except ImportError as e:
      print(f"Error CRÍTICO importando clases de GUI: {e}. Asegúrate de que 'src/GUIClasses' existe y las clases están refactorizadas.")
      sys.exit(1)
 
+# Modo de planificación de las tareas pendientes:
+# PendingTasks.SCHEDULING_FIFO (orden de llegada) o PendingTasks.SCHEDULING_PRIORITY
+# (por prioridad, con envejecimiento para que las tareas bajas no esperen indefinidamente)
+PENDING_SCHEDULING = PendingTasks.SCHEDULING_FIFO
+
+# Tareas completadas que se mantienen en memoria (y en el JSON); las más
+# antiguas se archivan en segmentos dentro de COMPLETED_ARCHIVE_DIR
+COMPLETED_HOT_WINDOW = 1000
+COMPLETED_ARCHIVE_DIR = "completed_archive"
+
+# Modo diario: cada cambio se añade al momento a un diario JSONL junto al
+# archivo de tareas, y guardar solo reescribe el JSON (en segundo plano)
+# cuando el diario ha crecido. Con False se reescribe todo al guardar.
+TASKS_JOURNAL = False
+
+# Las series recurrentes generan sus tareas con una semana de antelación;
+# cada hora se comprueba si alguna ocurrencia nueva entra en esa ventana
+RECURRENCE_WINDOW = RecurrenceScheduler.DEFAULT_WINDOW
+RECURRENCE_CHECK_MS = 60 * 60 * 1000
+
+# Las tareas guardadas se cargan por lotes, mostrando cada lote en cuanto
+# llega (la ventana aparece sin esperar a que se lea todo el archivo)
+LOAD_BATCH_SIZE = FileManager.DEFAULT_LOAD_BATCH
+
+# Autoguardado: tras AUTOSAVE_INTERVAL_MS sin cambios se guarda en un hilo
+# de trabajo (la GUI solo copia el estado). None: solo con el botón Guardar
+AUTOSAVE_INTERVAL_MS = AutoSaveService.DEFAULT_INTERVAL_MS
+
 # --- Clase Principal de la Aplicación ---
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación Gestor de Tareas."""
@@ -65,7 +102,10 @@ class MainWindow(QMainWindow):
 
         # --- Instanciar Componentes Lógicos ---
         # Usar rutas relativas o absolutas según sea necesario
-        self.file_manager = FileManager(tasks_filepath="tasks_data.json", id_counter_filepath="task_id_data.json")
+        # Las completadas que no caben en la ventana caliente se archivan en segmentos
+        self.file_manager = FileManager(tasks_filepath="tasks_data.json", id_counter_filepath="task_id_data.json",
+                                        archive_dirpath=COMPLETED_ARCHIVE_DIR, completed_hot_window=COMPLETED_HOT_WINDOW,
+                                        journal=TASKS_JOURNAL)
         # Cargar datos al inicio
         self._load_data_on_startup()
 
@@ -84,26 +124,125 @@ class MainWindow(QMainWindow):
         # --- Estado Inicial de la GUI ---
         self._update_button_states()
         self.task_detail_view.clear() # Empezar con vista de detalle limpia
+        # Revisar periódicamente las series recurrentes
+        self.recurrence_timer = QTimer(self)
+        self.recurrence_timer.timeout.connect(self.refresh_recurring_tasks)
+        self.recurrence_timer.start(RECURRENCE_CHECK_MS)
 
+        # Cargar las tareas guardadas lote a lote, con la ventana ya visible
+        self._start_loading()
         print("Aplicación inicializada correctamente.")
 
     def _load_data_on_startup(self):
-        """Carga el contador de ID y las tareas al iniciar."""
-        print("Cargando datos iniciales...")
+        """Prepara los contenedores (vacíos) y los índices; las tareas se cargan después, por lotes."""
+        print("Preparando datos iniciales...")
+        self.recurrence = RecurrenceScheduler(RECURRENCE_WINDOW)
+        # Índice de búsqueda de texto, mantenido al día por el índice de tareas
+        self.search_index = TextSearchIndex()
+        # Fechas límite: un único timer programado para la más próxima
+        self.deadline_watcher = DeadlineWatcher(parent=self)
+        self.task_loader = TaskLoader(self)
+        self._manual_load = False # La carga en curso la pidió el usuario (botón Cargar)
+        # Se suscribe al índice al terminar cada carga (lo cargado no hay que guardarlo)
+        self.autosave = AutoSaveService(self.file_manager, self._save_state, AUTOSAVE_INTERVAL_MS, parent=self)
+        self._manual_save = False # El guardado en curso lo pidió el usuario (botón Guardar)
+        self._reset_containers()
+
+    def _reset_containers(self):
+        """Sustituye los contenedores por unos vacíos y suscribe a su índice los índices de la GUI."""
+        self.pending_tasks_container, self.completed_tasks_container = self.file_manager.create_containers(
+            scheduling=PENDING_SCHEDULING)
+        self.task_index = self.pending_tasks_container.index # Índice compartido por ambos contenedores
+        self._autosave_enabled = False # El autoguardado está suscrito al índice actual (al nuevo, aún no)
+        self.search_index.clear()
+        self.task_index.add_listener(self.search_index)
+        self.deadline_watcher.index_cleared()
+        self.task_index.add_listener(self.deadline_watcher)
+
+    def _enable_autosave(self):
+        """Suscribe el autoguardado al índice actual (lo que ya contiene no cuenta como cambio)."""
+        if not self._autosave_enabled:
+            self.task_index.add_listener(self.autosave, replay=False)
+            self._autosave_enabled = True
+
+    def _start_loading(self):
+        """Empieza a cargar las tareas guardadas en los contenedores actuales (vacíos)."""
+        print("Cargando tareas por lotes...")
+        # Lo pendiente de guardar se descarta, pero la escritura en curso termina antes de leer
+        self.autosave.cancel()
+        self.autosave.waitForDone()
+        self._set_loading(True)
+        self.task_loader.start(self.file_manager.load_batches(self.pending_tasks_container, self.completed_tasks_container,
+                                                              self.recurrence, LOAD_BATCH_SIZE))
+
+    def _set_loading(self, loading: bool):
+        """Bloquea los botones y la edición mientras dura la carga (el contador de IDs aún no se conoce)."""
+        self.task_management_buttons.setEnabled(not loading)
+        self.task_detail_view.setEnabled(not loading)
+        if loading:
+            self.statusBar().showMessage("Cargando tareas...")
+
+    @Slot(str, int)
+    def _on_batch_loaded(self, key: str, count: int):
+        """Muestra las filas del lote que se acaba de cargar."""
+        model = self.pending_source_model if key == "pending_tasks" else self.completed_source_model
+        model.tasksAppended()
+        self.statusBar().showMessage(f"Cargando tareas... {len(self.pending_tasks_container)} pendientes, "
+                                     f"{len(self.completed_tasks_container)} completadas")
+
+    @Slot()
+    def _on_load_finished(self):
+        """Completa el estado tras cargar todos los lotes."""
+        # Después de las tareas: en modo diario el contador se lee del diario
         self.current_task_id_counter = self.file_manager.load_id_counter()
-        self.pending_tasks_container, self.completed_tasks_container = self.file_manager.load_all_data()
-        print(f"Carga inicial: {len(self.pending_tasks_container)} pendientes, {len(self.completed_tasks_container)} completadas. Próximo ID: {self.current_task_id_counter + 1}")
+        self._enable_autosave()
+        self.materialize_recurring_tasks()
+        # Al final se reordenan dependencias y se archivan completadas: refresco completo
+        self.pending_source_model.refresh()
+        self.completed_source_model.refresh()
+        self._set_loading(False)
+        self.statusBar().clearMessage()
+        self._update_button_states()
+        self.deadline_watcher.check() # Avisar de las que vencieron con la aplicación cerrada
+        print(f"Carga: {len(self.pending_tasks_container)} pendientes, {len(self.completed_tasks_container)} completadas. Próximo ID: {self.current_task_id_counter + 1}")
+        if self._manual_load:
+            self._manual_load = False
+            print("Carga completada.")
+            QMessageBox.information(self, "Carga Completa", "Tareas cargadas correctamente desde el archivo.")
+
+    @Slot(str)
+    def _on_load_failed(self, message: str):
+        """
+        Descarta lo cargado a medias y sigue con contenedores vacíos. El
+        autoguardado no se activa hasta que el usuario guarde: sobrescribiría
+        con casi nada el archivo que no se pudo leer (y que aún se puede
+        recuperar).
+        """
+        self._reset_containers()
+        self.recurrence.clear()
+        self.current_task_id_counter = self.file_manager.load_id_counter()
+        self.pending_source_model.set_task_container(self.pending_tasks_container)
+        self.completed_source_model.set_task_container(self.completed_tasks_container)
+        self.pending_source_model.refresh()
+        self.completed_source_model.refresh()
+        self._set_loading(False)
+        self.statusBar().clearMessage()
+        self._update_button_states()
+        self._manual_load = False
+        QMessageBox.critical(self, "Error al Cargar", f"Ocurrió un error al cargar los datos:\n{message}\n\n"
+                             "El autoguardado queda desactivado hasta que guardes manualmente.")
 
     def _setup_models(self):
         """Inicializa los modelos fuente y proxy."""
         print("Configurando modelos Qt...")
         # Modelos Fuente (Adaptadores)
-        self.pending_source_model = TaskModel(self.pending_tasks_container)
-        self.completed_source_model = TaskModel(self.completed_tasks_container)
+        # zero_copy: leer las filas directamente de la cola, sin copiarla en cada refresh
+        self.pending_source_model = TaskModel(self.pending_tasks_container, zero_copy=True)
+        self.completed_source_model = TaskModel(self.completed_tasks_container, zero_copy=True)
 
-        # Proxy Models (para filtrado)
-        self.pending_proxy_model = PriorityFilterProxyModel(self)
-        self.completed_proxy_model = PriorityFilterProxyModel(self)
+        # Proxy Models (para filtrado por prioridad y búsqueda de texto)
+        self.pending_proxy_model = TaskSearchProxyModel(self.search_index, self)
+        self.completed_proxy_model = TaskSearchProxyModel(self.search_index, self)
 
         # Conectar Fuente -> Proxy
         self.pending_proxy_model.setSourceModel(self.pending_source_model)
@@ -162,6 +301,17 @@ class MainWindow(QMainWindow):
 
         # Cambiar filtro de prioridad
         self.task_filters.filterChanged.connect(self.apply_priority_filter)
+        # Buscar por texto
+        self.task_filters.searchChanged.connect(self.apply_search_filter)
+        # Avisos de fechas límite vencidas
+        self.deadline_watcher.tasksOverdue.connect(self.handle_overdue_tasks)
+        # Carga progresiva de las tareas guardadas
+        self.task_loader.batchLoaded.connect(self._on_batch_loaded)
+        self.task_loader.finished.connect(self._on_load_finished)
+        self.task_loader.failed.connect(self._on_load_failed)
+        self.autosave.saveStarted.connect(self._on_save_started)
+        self.autosave.saveFinished.connect(self._on_save_finished)
+        self.autosave.saveFailed.connect(self._on_save_failed)
 
         # Seleccionar una tarea en la lista activa
         self.task_list_manager.currentTaskSelected.connect(self.update_detail_view)
@@ -187,6 +337,46 @@ class MainWindow(QMainWindow):
         self.pending_proxy_model.setPriorityFilter(priority_id)
         self.completed_proxy_model.setPriorityFilter(priority_id)
 
+    @Slot(str)
+    def apply_search_filter(self, text: str):
+        """Aplica la búsqueda de texto a ambos proxy models."""
+        self.pending_proxy_model.setSearchText(text)
+        self.completed_proxy_model.setSearchText(text)
+
+    @Slot(list)
+    def handle_overdue_tasks(self, tasks: list):
+        """Refresca la lista de pendientes y avisa en la barra de estado de las tareas vencidas."""
+        print(f"Tareas vencidas: {[task.task_id for task in tasks]}")
+        self.pending_source_model.refresh() # Repintar en rojo las vencidas
+        titles = ", ".join(task.title for task in tasks[:3]) + ("..." if len(tasks) > 3 else "")
+        self.statusBar().showMessage(f"{len(tasks)} tarea(s) vencida(s): {titles}")
+
+    def _next_task_id(self) -> int:
+        """Reserva y devuelve el siguiente ID de tarea."""
+        self.current_task_id_counter += 1
+        return self.current_task_id_counter
+
+    def materialize_recurring_tasks(self) -> int:
+        """
+        Añade a pendientes las tareas de las series recurrentes que entran en
+        la ventana activa. Devuelve cuántas se generaron.
+        """
+        new_tasks = self.recurrence.materialize(self._next_task_id)
+        if new_tasks:
+            self.pending_tasks_container.addTasks(new_tasks)
+            self.file_manager.record_series(self.recurrence) # Las series avanzaron
+            print(f"Series recurrentes: {len(new_tasks)} tarea(s) nueva(s).")
+        return len(new_tasks)
+
+    @Slot()
+    def refresh_recurring_tasks(self):
+        """Genera las ocurrencias que tocan y refresca la vista si hay alguna."""
+        if self.task_loader.isRunning():
+            return # Se generan al terminar la carga
+        if self.materialize_recurring_tasks():
+            self.pending_source_model.refresh()
+            self._update_button_states()
+
     @Slot(object) # Recibe Task o None
     def update_detail_view(self, task: Task | None):
         """Actualiza la vista de detalles y el estado interno con la tarea seleccionada."""
@@ -199,11 +389,12 @@ class MainWindow(QMainWindow):
     def handle_description_change(self, task_id: int, new_description: str):
         """Maneja la edición de la descripción desde la vista de detalles."""
         print(f"Intentando actualizar descripción para Task ID: {task_id}")
-        # Buscar en qué contenedor está la tarea y editarla
-        if self.pending_tasks_container.editTask(task_id, "description", new_description):
+        # El índice sabe en qué contenedor está la tarea (O(1))
+        location = self.task_index.editTask(task_id, "description", new_description)
+        if location == TaskIndex.PENDING:
             print("Descripción actualizada en Pendientes.")
             self.pending_source_model.refresh() # Refrescar modelo (y vista proxy)
-        elif self.completed_tasks_container.editTask(task_id, "description", new_description):
+        elif location == TaskIndex.COMPLETED:
             print("Descripción actualizada en Completadas.")
             self.completed_source_model.refresh() # Refrescar modelo (y vista proxy)
         else:
@@ -216,12 +407,13 @@ class MainWindow(QMainWindow):
         """Maneja la edición de la prioridad desde la vista de detalles."""
         print(f"Intentando actualizar prioridad para Task ID: {task_id} a {new_priority_id}")
         task_refreshed = False
-        # Buscar y editar en el contenedor apropiado
-        if self.pending_tasks_container.editTask(task_id, "priority", new_priority_id):
+        # Editar a través del índice, que sabe en qué contenedor está la tarea
+        location = self.task_index.editTask(task_id, "priority", new_priority_id)
+        if location == TaskIndex.PENDING:
             print("Prioridad actualizada en Pendientes.")
             self.pending_source_model.refresh()
             task_refreshed = True
-        elif self.completed_tasks_container.editTask(task_id, "priority", new_priority_id):
+        elif location == TaskIndex.COMPLETED:
             print("Prioridad actualizada en Completadas.")
             self.completed_source_model.refresh()
             task_refreshed = True
@@ -265,7 +457,44 @@ class MainWindow(QMainWindow):
             return # Cancelado
         priority_id = priorities[priority_name]
 
-        # 4. Crear y añadir la tarea
+        # 4. Fecha límite opcional
+        due_text, ok4 = QInputDialog.getText(self, "Añadir Tarea", "Fecha límite (AAAA-MM-DD HH:MM, vacío = sin fecha):",
+                                             QLineEdit.EchoMode.Normal)
+        if not ok4:
+            print("Cancelado.")
+            return # Cancelado
+        due_at = None
+        if due_text.strip():
+            try:
+                due_at = datetime.fromisoformat(due_text.strip()).timestamp()
+            except ValueError:
+                QMessageBox.warning(self, "Añadir Tarea", f"Fecha límite no válida: '{due_text}'.")
+                return
+
+        # 5. Repetición opcional: se guarda la regla y sus tareas se generan al vuelo
+        repeat_options = ["No se repite", "Cada día", "Cada semana", "Cada N días"]
+        repeat, ok_repeat = QInputDialog.getItem(self, "Añadir Tarea", "Repetición:", repeat_options, 0, False)
+        if not ok_repeat:
+            print("Cancelado.")
+            return # Cancelado
+        if repeat != repeat_options[0]:
+            self.add_recurring_series(title.strip(), description, priority_id, due_at,
+                                      repeat_options.index(repeat))
+            return
+
+        # 6. Dependencias opcionales (tareas que deben completarse antes)
+        depends_text, ok5 = QInputDialog.getText(self, "Añadir Tarea", "Depende de (IDs separados por comas, vacío = ninguna):",
+                                                 QLineEdit.EchoMode.Normal)
+        if not ok5:
+            print("Cancelado.")
+            return # Cancelado
+        try:
+            depends_on = [int(part) for part in depends_text.split(",") if part.strip()]
+        except ValueError:
+            QMessageBox.warning(self, "Añadir Tarea", f"Dependencias no válidas: '{depends_text}'.")
+            return
+
+        # 7. Crear y añadir la tarea
         try:
             self.current_task_id_counter += 1 # Incrementar ANTES de crear
             new_task = Task(
@@ -273,7 +502,9 @@ class MainWindow(QMainWindow):
                 title=title.strip(),
                 description=description, # Mantener saltos de línea
                 status=Task.STATUS_PENDING, # Siempre pendiente al añadir
-                priority=priority_id
+                priority=priority_id,
+                due_at=due_at,
+                depends_on=depends_on
             )
             print(f"Tipo de la tarea: {type(new_task)}")
             self.pending_tasks_container.addTask(new_task)
@@ -289,6 +520,50 @@ class MainWindow(QMainWindow):
 
         self._update_button_states()
 
+    def add_recurring_series(self, title: str, description: str, priority_id: int,
+                             start_at: float | None, repeat_option: int):
+        """
+        Pide el intervalo (si hace falta) y el número de repeticiones, crea la
+        serie y genera las ocurrencias que ya caen en la ventana activa.
+
+        Args:
+            repeat_option: 1 = cada día, 2 = cada semana, 3 = cada N días.
+        """
+        if repeat_option == 1:
+            interval_days = RecurrenceRule.DAILY
+        elif repeat_option == 2:
+            interval_days = RecurrenceRule.WEEKLY
+        else:
+            interval_days, ok = QInputDialog.getInt(self, "Añadir Tarea", "Repetir cada (días):", 2, 1, 3650)
+            if not ok:
+                print("Cancelado.")
+                return
+        count, ok = QInputDialog.getInt(self, "Añadir Tarea", "Número de repeticiones (0 = sin límite):", 0, 0, 100000)
+        if not ok:
+            print("Cancelado.")
+            return
+
+        try:
+            rule = RecurrenceRule(
+                rule_id=self._next_task_id(), # Las series comparten el contador de IDs
+                title=title,
+                description=description,
+                start_at=start_at if start_at is not None else datetime.now().timestamp(),
+                interval_days=interval_days,
+                count=count or None,
+                priority=priority_id
+            )
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo crear la serie:\n{e}")
+            return
+        self.recurrence.addRule(rule)
+        self.file_manager.record_series(self.recurrence)
+        if self._autosave_enabled:
+            self.autosave.markDirty() # Las series no pasan por el índice de tareas
+        print(f"Nueva serie recurrente: {rule}")
+        self.refresh_recurring_tasks()
+        self._update_button_states()
+
     @Slot()
     def delete_selected_task(self):
         """Elimina la tarea pendiente actualmente seleccionada."""
@@ -330,28 +605,50 @@ class MainWindow(QMainWindow):
             # Opcional: Seleccionar la tarea recién completada en la vista de completadas
             # self.list_change_buttons.completed_button.click() # Cambiar a vista completadas
             # self.task_list_manager.getCompletedListView().selectTaskById(completed_task.task_id)
+        elif len(self.pending_tasks_container) > 0:
+            print("Todas las tareas pendientes esperan a otras.")
+            QMessageBox.information(self, "Completar Tarea", "Todas las tareas pendientes están bloqueadas por sus dependencias.")
         else:
             print("No hay tareas pendientes para completar.")
             QMessageBox.information(self, "Completar Tarea", "No hay tareas pendientes para completar.")
 
     @Slot()
     def save_all_tasks(self):
-        """Guarda el estado actual de las tareas y el contador de ID."""
+        """Guarda ya el estado actual de las tareas y el contador de ID (en segundo plano)."""
         print("Guardando todas las tareas y contador...")
-        # Guardar tareas
-        tasks_saved = self.file_manager.save_all_data(self.pending_tasks_container, self.completed_tasks_container)
-        # Guardar contador
-        counter_saved = self.file_manager.save_id_counter(self.current_task_id_counter)
+        self._manual_save = True
+        self._enable_autosave() # Tras un error de carga, solo a partir de un guardado explícito
+        self.autosave.saveNow() # Termina en _on_save_finished o _on_save_failed
 
-        if tasks_saved and counter_saved:
-            print("Datos guardados exitosamente.")
-            QMessageBox.information(self, "Guardado", "Tareas y estado guardados correctamente.")
+    def _save_state(self) -> tuple:
+        """Estado que guarda el autoguardado."""
+        return (self.pending_tasks_container, self.completed_tasks_container,
+                self.recurrence, self.current_task_id_counter)
+
+    @Slot()
+    def _on_save_started(self):
+        self.statusBar().showMessage("Guardando tareas...")
+
+    @Slot()
+    def _on_save_finished(self):
+        print(f"Datos guardados exitosamente ({self.autosave.last_duration * 1000:.0f} ms).")
+        if self.file_manager.last_save_skipped:
+            self.statusBar().showMessage("No había cambios que guardar.", 3000)
+        elif self.file_manager.journal_enabled:
+            self.statusBar().showMessage("Tareas guardadas.", 3000)
         else:
-            error_msg = []
-            if not tasks_saved: error_msg.append("Error al guardar las tareas.")
-            if not counter_saved: error_msg.append("Error al guardar el contador de ID.")
-            print("Error durante el guardado.")
-            QMessageBox.critical(self, "Error al Guardar", "\n".join(error_msg))
+            self.statusBar().showMessage(f"Tareas guardadas ({self.file_manager.last_save_written} registros escritos).", 3000)
+        if self._manual_save:
+            self._manual_save = False
+            QMessageBox.information(self, "Guardado", "Tareas y estado guardados correctamente.")
+
+    @Slot(str)
+    def _on_save_failed(self, message: str):
+        print("Error durante el guardado.")
+        self.statusBar().showMessage(f"Error al guardar: {message}")
+        if self._manual_save:
+            self._manual_save = False
+            QMessageBox.critical(self, "Error al Guardar", f"Error al guardar las tareas:\n{message}")
 
     @Slot()
     def load_all_tasks(self):
@@ -364,34 +661,18 @@ class MainWindow(QMainWindow):
 
         if confirm == QMessageBox.StandardButton.Yes:
             print("Cargando tareas desde archivo...")
-            try:
-                # Cargar contenedores
-                pending_loaded, completed_loaded = self.file_manager.load_all_data()
-                self.pending_tasks_container = pending_loaded
-                self.completed_tasks_container = completed_loaded
-
-                # Cargar contador
-                self.current_task_id_counter = self.file_manager.load_id_counter()
-
-                # Actualizar modelos con los nuevos contenedores
-                self.pending_source_model.set_task_container(self.pending_tasks_container)
-                self.completed_source_model.set_task_container(self.completed_tasks_container)
-
-                # Refrescar modelos/vistas
-                self.pending_source_model.refresh()
-                self.completed_source_model.refresh()
-
-                # Limpiar estado de la GUI
-                self._selected_task = None
-                self.task_detail_view.clear()
-                self._update_button_states()
-
-                print("Carga completada.")
-                QMessageBox.information(self, "Carga Completa", "Tareas cargadas correctamente desde el archivo.")
+            # Contenedores nuevos (vacíos) en los que se irán añadiendo los lotes
+            self._reset_containers()
+            self.pending_source_model.set_task_container(self.pending_tasks_container)
+            self.completed_source_model.set_task_container(self.completed_tasks_container)
+            self.pending_source_model.refresh()
+            self.completed_source_model.refresh()
 
-            except Exception as e:
-                print(f"Error durante la carga: {e}")
-                QMessageBox.critical(self, "Error al Cargar", f"Ocurrió un error al cargar los datos:\n{e}")
+            # Limpiar estado de la GUI
+            self._selected_task = None
+            self.task_detail_view.clear()
+            self._manual_load = True
+            self._start_loading() # Termina en _on_load_finished o _on_load_failed
 
     @Slot()
     def _update_button_states(self):
@@ -412,6 +693,13 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event: QCloseEvent):
         """Se ejecuta al intentar cerrar la ventana."""
         print("Evento de cierre detectado.")
+        if self.task_loader.isRunning():
+            # Lo cargado a medias no debe sobrescribir el archivo: se cierra sin guardar
+            self.task_loader.cancel()
+            self.autosave.cancel()
+            self.file_manager.close()
+            event.accept()
+            return
         reply = QMessageBox.question(self, 'Confirmar Salida',
                                      "¿Guardar cambios antes de salir?",
                                      QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel,
@@ -419,8 +707,14 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Save:
             self.save_all_tasks()
+            self.autosave.waitForDone() # El guardado va en un hilo de trabajo: esperarlo
+            self.file_manager.close() # Esperar a la compactación en curso y cerrar el diario
             event.accept() # Aceptar cierre
         elif reply == QMessageBox.StandardButton.Discard:
+            # En modo diario los cambios ya están anotados: solo se cierra el diario
+            self.autosave.cancel()
+            self.autosave.waitForDone() # Un autoguardado ya empezado se termina
+            self.file_manager.close()
             event.accept() # Aceptar cierre sin guardar
         else:
             event.ignore() # Ignorar el evento de cierre, no cerrar
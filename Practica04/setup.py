@@ -4,11 +4,15 @@ from Cython.Build import cythonize
 import os
 
 queue_module_path = os.path.join('src', 'coreClasses', 'queue_cython.pyx')
+stack_module_path = os.path.join('src', 'coreClasses', 'stack_cython.pyx')
 
 extensions = [
     Extension("src.coreClasses.queue_cython", # Nombre del módulo a importar
               [queue_module_path],
-              language="c") # Especificar lenguaje C
+              language="c"), # Especificar lenguaje C
+    Extension("src.coreClasses.stack_cython",
+              [stack_module_path],
+              language="c"),
 ]
 
 setup(
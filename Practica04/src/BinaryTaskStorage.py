@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de almacenamiento en una instantánea binaria (ver snapshot_codec).
+"""
+import os
+import threading
+
+from src.coreClasses.snapshot_codec import COUNTER, COUNTER_OFFSET, _Reader, dump_snapshot, read_header, read_snapshot
+from src.TaskStorage import TaskStorage
+from src.PendingTasks import PendingTasks
+from src.CompletedTasks import CompletedTasks
+from src.coreClasses.RecurrenceScheduler import RecurrenceScheduler
+from src.coreClasses.ChangeTracker import ChangeTracker
+
+class BinaryTaskStorage(TaskStorage):
+    """
+    Guarda el estado completo en un archivo binario con registros de
+    longitud prefijada, que se reescribe entero (de forma atómica) en cada
+    guardado. Es más pequeño y mucho más rápido de leer y escribir que el
+    JSON.
+
+    El último ID usado va en la cabecera del propio archivo: guardar el
+    contador solo reescribe esos 8 bytes.
+    """
+    FORMAT_NAME = "binario"
+
+    def __init__(self, tasks_filepath: str):
+        """Inicializa el motor con la ruta del archivo de tareas."""
+        self.tasks_filepath = tasks_filepath
+        self._id_counter = 0 # Último ID leído o guardado (va en la cabecera al reescribir)
+        self._write_lock = threading.Lock()
+
+    def read(self) -> dict | None:
+        """Lee el archivo completo."""
+        items = self.read_batches(batch_size=1 << 30)
+        if items is None:
+            return None
+        data = {"pending_tasks": [], "completed_tasks": []}
+        for key, value in items:
+            if key in data:
+                data[key].extend(value)
+            else:
+                data[key] = value
+        return data
+
+    def read_batches(self, batch_size: int):
+        """Lee el archivo por bloques (snapshot_codec.read_snapshot) en lotes de 'batch_size' tareas."""
+        if not os.path.exists(self.tasks_filepath):
+            return None
+        return self._stream(batch_size)
+
+    def _stream(self, batch_size: int):
+        with open(self.tasks_filepath, 'rb') as f:
+            for key, value in read_snapshot(f, batch_size):
+                if key == "id_counter":
+                    self._id_counter = value
+                yield key, value
+
+    def snapshot(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                 recurrence: RecurrenceScheduler | None = None, changes: ChangeTracker | None = None) -> dict:
+        """Copia el estado con cada tarea como tupla. El archivo se reescribe entero: 'changes' no se usa."""
+        return self.copy_state(pending_tasks, completed_tasks, recurrence)
+
+    def write_snapshot(self, snapshot: dict) -> int:
+        """Reescribe el archivo (de forma atómica: puede ir en segundo plano)."""
+        os.makedirs(os.path.dirname(self.tasks_filepath) or '.', exist_ok=True)
+        path = self.tasks_filepath + ".tmp"
+        with self._write_lock:
+            with open(path, 'wb') as f:
+                written = dump_snapshot(f, snapshot["pending_tasks"], snapshot["completed_tasks"], self._id_counter,
+                                        snapshot.get("archived_segments"), snapshot.get("recurring_series"),
+                                        snapshot.get("pending_aging"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path, self.tasks_filepath)
+        return written
+
+    def load_id_counter(self) -> int:
+        """Lee el último ID de la cabecera (0 si no hay archivo)."""
+        if not os.path.exists(self.tasks_filepath):
+            return 0
+        with open(self.tasks_filepath, 'rb') as f:
+            self._id_counter = read_header(_Reader(f, COUNTER_OFFSET + COUNTER.size))["id_counter"]
+        return self._id_counter
+
+    def save_id_counter(self, last_id: int) -> None:
+        """Reescribe el último ID en la cabecera (o crea un archivo sin tareas que lo guarde)."""
+        with self._write_lock:
+            self._id_counter = last_id
+            if os.path.exists(self.tasks_filepath):
+                with open(self.tasks_filepath, 'r+b') as f:
+                    f.seek(COUNTER_OFFSET)
+                    f.write(COUNTER.pack(last_id))
+                return
+        self.write_snapshot({"pending_tasks": [], "completed_tasks": []})
+
+    def __repr__(self) -> str:
+        return f"BinaryTaskStorage('{self.tasks_filepath}')"
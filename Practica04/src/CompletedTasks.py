@@ -2,67 +2,224 @@
 """
 Módulo para gestionar la colección de tareas completadas usando una pila.
 """
-# Importar Task refactorizada y Stack refactorizada
-from src.coreClasses.Task import Task
-from src.coreClasses.Stack import Stack # Usar la Stack manual refactorizada
+# Importar Task refactorizada y la pila optimizada con Cython
+import copy
+
+from src.coreClasses.Task import Task, TaskStatus
+from src.coreClasses.stack_cython import CythonStack as Stack
+from src.coreClasses.TaskStore import TaskStore
+from src.coreClasses.TaskArchive import TaskArchive
+from src.coreClasses.TaskIndex import TaskIndex
+from src.coreClasses.PriorityBuckets import PriorityBuckets
 
 class CompletedTasks:
     """
     Gestiona la colección de tareas completadas utilizando una implementación
-    de Pila (Stack) manual.
+    de Pila (Stack) optimizada con Cython, que permite leerla en orden LIFO
+    sin copiarla (ver taskView).
+
+    Opcionalmente puede usar un TaskStore como almacenamiento (ver PendingTasks).
+    Como PendingTasks, mantiene las tareas agrupadas por prioridad para contar y
+    filtrar sin recorrer la pila.
+
+    Con un TaskArchive solo se mantienen en memoria las 'hot_window' tareas
+    más recientes (la ventana caliente): cuando sobran 'segment_size' tareas,
+    las más antiguas se escriben en un segmento del archivo y salen de la
+    pila. Las tareas archivadas son de solo lectura y se leen bajo demanda
+    con loadOlderTasks(). Los conteos, filtros y ediciones solo afectan a la
+    ventana caliente.
     """
-    def __init__(self):
-        """Inicializa el contenedor de tareas completadas con una pila vacía."""
-        self.tasks: Stack[Task] = Stack() # Usar la Stack manual refactorizada
+    def __init__(self, store: TaskStore | None = None, archive: TaskArchive | None = None,
+                 hot_window: int = 1000, segment_size: int = 500, index: TaskIndex | None = None):
+        """
+        Inicializa el contenedor de tareas completadas con una pila vacía.
+
+        Args:
+            store: Almacén columnar opcional (puede compartirse con PendingTasks).
+            archive: Archivo en disco opcional para las tareas antiguas.
+            hot_window: Tareas que se mantienen siempre en memoria.
+            segment_size: Tareas que se archivan juntas en cada segmento.
+            index: Índice global de tareas por ID (compartido con PendingTasks).
+                   Si no se indica se crea uno propio.
+        """
+        if hot_window < 0 or segment_size <= 0:
+            raise ValueError("hot_window no puede ser negativo y segment_size debe ser positivo.")
+        self.tasks: Stack[Task] = Stack() # Usar la CythonStack importada
+        self.store = store
+        self.archive = archive
+        self.hot_window = hot_window
+        self.segment_size = segment_size
+        self._archived_tasks: list[Task] = [] # Archivadas ya leídas, de la más reciente a la más antigua
+        self._loaded_segments = 0 # Segmentos leídos, contando desde el más reciente
+        self.buckets = PriorityBuckets() # Solo la ventana caliente
+        self.index = index if index is not None else TaskIndex()
+        self.index.attach(TaskIndex.COMPLETED, self)
 
     def addTask(self, item: Task) -> None:
         """
         Añade una tarea (presumiblemente ya completada) a la cima de la pila.
         """
         if isinstance(item, Task):
+            if self.store is not None:
+                item = self.store.add(item) # Guardar la vista de la fila
             # Usar el método 'push' estándar de la pila
             self.tasks.push(item)
+            self.buckets.add(item)
+            self.index.register(item, TaskIndex.COMPLETED)
+            self.spillToArchive()
         else:
             print("Error (CompletedTasks.addTask): Se intentó añadir un objeto que no es Task.")
 
+    def addOlderTasks(self, items: list[Task]) -> int:
+        """
+        Añade tareas más antiguas que las que ya hay, debajo de ellas (como al
+        cargar por lotes un archivo que guarda la más reciente primero).
+        'items' va de la más reciente a la más antigua. No archiva nada: quien
+        carga llama a spillToArchive() al terminar.
+
+        Returns:
+            El número de tareas añadidas (los objetos que no son Task se ignoran).
+        """
+        valid_tasks = []
+        for item in items:
+            if isinstance(item, Task):
+                valid_tasks.append(self.store.add(item) if self.store is not None else item)
+            else:
+                print(f"Error (CompletedTasks.addOlderTasks): Se ignoró un objeto de tipo {type(item)} que no es Task.")
+        self.tasks.extend_bottom(valid_tasks)
+        self.buckets.add_many_first(valid_tasks)
+        for task in valid_tasks:
+            self.index.register(task, TaskIndex.COMPLETED)
+        return len(valid_tasks)
+
+    def spillToArchive(self) -> None:
+        """Archiva las tareas más antiguas mientras sobren 'segment_size' fuera de la ventana."""
+        if self.archive is None:
+            return
+        while len(self.tasks) - self.hot_window >= self.segment_size:
+            evicted = self.tasks.pop_bottom(self.segment_size) # De la más antigua a la más reciente
+            self.archive.append(evicted)
+            for task in evicted:
+                self.index.unregister(task.task_id) # Las archivadas son de solo lectura
+                self.buckets.discard(task.task_id)
+            if self.store is not None:
+                # Las vistas dejan de ser válidas al quitar su fila: conservar copias independientes
+                evicted = [copy.copy(task) for task in evicted]
+                for task in evicted:
+                    self.store.remove(task.task_id)
+            if self._loaded_segments:
+                # Si ya se están mostrando tareas archivadas, este segmento va justo
+                # delante de ellas y se da por leído para no dejar un hueco
+                self._archived_tasks[0:0] = evicted[::-1]
+                self._loaded_segments += 1
+
+    def hasArchivedTasks(self) -> bool:
+        """Indica si quedan segmentos archivados por leer."""
+        return self.archive is not None and self._loaded_segments < self.archive.segment_count()
+
+    def loadOlderTasks(self) -> list[Task]:
+        """
+        Lee el siguiente segmento archivado (del más reciente al más antiguo)
+        y devuelve sus tareas de la más reciente a la más antigua.
+        """
+        if not self.hasArchivedTasks():
+            return []
+        index = self.archive.segment_count() - 1 - self._loaded_segments
+        older = self.archive.load_segment(index)[::-1]
+        self._archived_tasks.extend(older)
+        self._loaded_segments += 1
+        return older
+
+    def archivedTaskList(self) -> list[Task]:
+        """
+        Devuelve las tareas archivadas leídas hasta ahora, de la más reciente
+        a la más antigua (van a continuación de taskList()). No modificar.
+        """
+        return self._archived_tasks
+
     def editTask(self, task_id: int, attribute: str, newValue) -> bool:
         """
         Edita un atributo específico de una tarea completada, buscándola por su ID.
-        Esta operación es O(n) porque puede requerir iterar la pila.
+        La búsqueda es O(1) gracias al índice global de tareas.
 
         Args:
             task_id: El ID numérico de la tarea a editar.
-            attribute: El nombre del atributo a cambiar ("title", "description", "priority").
+            attribute: El nombre del atributo a cambiar ("title", "description", "priority", "due_at").
             newValue: El nuevo valor para el atributo.
 
         Returns:
             True si la tarea fue encontrada y editada, False en caso contrario.
         """
-        edited = False
-        # Iteramos directamente sobre la pila
-        # La iteración será desde el fondo hacia la cima
-        for task in self.tasks: # Equivalente a iterar self.tasks.get_items_list()
-            if task.task_id == task_id:
-                try:
-                    match attribute:
-                        case "title":
-                            task.editTitle(str(newValue))
-                            edited = True
-                        case "description":
-                            task.editDescription(str(newValue))
-                            edited = True
-                        case "priority":
-                            # Permitir editar prioridad incluso en completadas según requerimiento
-                            task.editPriority(int(newValue))
-                            edited = True
-                        case _:
-                            print(f"Advertencia (CompletedTasks.editTask): Atributo '{attribute}' no editable.")
-                            return False
-                    break # Salir una vez encontrada y editada
-                except (ValueError, TypeError) as e:
-                     print(f"Error (CompletedTasks.editTask): Valor inválido '{newValue}' para atributo '{attribute}': {e}")
-                     return False
-                
+        task = self.index.get(task_id, TaskIndex.COMPLETED)
+        if task is None:
+            return False
+        try:
+            match attribute:
+                case "title":
+                    task.editTitle(str(newValue))
+                case "description":
+                    task.editDescription(str(newValue))
+                case "priority":
+                    # Permitir editar prioridad incluso en completadas según requerimiento
+                    task.editPriority(int(newValue))
+                    self.buckets.update(task)
+                case "due_at":
+                    # None quita la fecha límite
+                    task.editDueDate(None if newValue is None else float(newValue))
+                case _:
+                    print(f"Advertencia (CompletedTasks.editTask): Atributo '{attribute}' no editable.")
+                    return False
+        except (ValueError, TypeError) as e:
+             print(f"Error (CompletedTasks.editTask): Valor inválido '{newValue}' para atributo '{attribute}': {e}")
+             return False
+        return True
+
+    def countTasks(self, priority: int | None = None) -> int:
+        """Cuenta las tareas completadas, opcionalmente solo las de una prioridad, en O(1)."""
+        return self.buckets.count(priority)
+
+    def count_by_priority(self) -> dict[int, int]:
+        """Devuelve {prioridad: número de tareas completadas} sin recorrer la pila."""
+        return self.buckets.counts()
+
+    def tasks_with_priority(self, priority: int) -> list[Task]:
+        """
+        Devuelve las tareas completadas con la prioridad indicada, la última
+        en llegar a esa prioridad primero (como en taskList() salvo por las
+        tareas cuya prioridad se ha editado), en O(k).
+        """
+        return self.buckets.tasks(priority)[::-1]
+
+    def filterTasks(self, priority: int) -> list[Task]:
+        """Devuelve las tareas completadas con la prioridad indicada (en orden LIFO, como tasks_with_priority)."""
+        return self.tasks_with_priority(priority)
+
+    def bulkEditPriority(self, newPriority: int, currentPriority: int | None = None) -> int:
+        """
+        Cambia la prioridad de todas las tareas completadas (o solo de las que
+        tienen 'currentPriority').
+
+        Returns:
+            El número de tareas modificadas.
+        """
+        if self.store is not None:
+            # La columna se cambia de una pasada, sin Task.editPriority: se avisa al índice
+            # (diario, autoguardado...) de cada tarea editada, como haría editPriority
+            edited_tasks = self.store.select(TaskStatus.COMPLETED, currentPriority) if self.index.has_listeners() else []
+            old_priorities = [task.priority for task in edited_tasks]
+            edited = self.store.set_priority(newPriority, TaskStatus.COMPLETED, currentPriority)
+            for task, old_priority in zip(edited_tasks, old_priorities):
+                self.index.task_edited(task, "priority", old_priority)
+        else:
+            if newPriority not in Task.VALID_PRIORITIES:
+                raise ValueError(f"Prioridad '{newPriority}' no reconocida.")
+            edited = 0
+            for task in self.tasks:
+                if currentPriority is None or task.priority == currentPriority:
+                    task.editPriority(newPriority)
+                    edited += 1
+        if edited:
+            self.buckets.relabel(newPriority, currentPriority)
         return edited
 
     def taskList(self) -> list[Task]:
@@ -70,10 +227,15 @@ class CompletedTasks:
         Devuelve la lista de tareas completadas en orden LIFO (Last-In, First-Out),
         tal como se requiere para la visualización de la pila (la más reciente primero).
         """
-        # Obtener la lista (que está en orden de inserción, fondo->cima)
-        items_fifo = self.tasks.get_items_list()
-        # Invertirla para obtener LIFO (cima->fondo)
-        return items_fifo[::-1]
+        # Una sola copia, recorriendo el array de la cima al fondo
+        return self.tasks.get_items_list(reverse=True)
+
+    def taskView(self):
+        """
+        Devuelve una vista de solo lectura en orden LIFO (la más reciente
+        primero) que no copia las tareas.
+        """
+        return self.tasks.lifo_view()
 
     def __len__(self) -> int:
         return len(self.tasks)
\ No newline at end of file
@@ -1,26 +1,82 @@
 # -*- coding: utf-8 -*-
 """
 Módulo para gestionar la persistencia de datos (tareas y contador de IDs)
-usando archivos JSON.
+usando archivos JSON, una instantánea binaria o una base de datos SQLite.
 """
 import os
 import json # Importar el módulo JSON
+import threading
 from typing import Tuple # Para type hinting de la tupla de retorno
 
-from src.coreClasses.Task import Task
 from src.PendingTasks import PendingTasks
 from src.CompletedTasks import CompletedTasks
+from src.coreClasses.TaskStore import TaskStore
+from src.coreClasses.TaskArchive import TaskArchive
+from src.coreClasses.TaskIndex import TaskIndex
+from src.coreClasses.RecurrenceRule import RecurrenceRule
+from src.coreClasses.RecurrenceScheduler import RecurrenceScheduler
+from src.coreClasses.TaskJournal import TaskJournal
+from src.coreClasses.ChangeTracker import ChangeTracker
+from src.coreClasses.Task import next_modification_seq
+from src.TaskStorage import TaskStorage
+from src.JsonTaskStorage import JsonTaskStorage
+from src.SqliteTaskStorage import SqliteTaskStorage
+from src.BinaryTaskStorage import BinaryTaskStorage
+
+def storage_for_path(tasks_filepath: str, id_counter_filepath: str) -> TaskStorage:
+    """Elige el motor de almacenamiento por la extensión del archivo de tareas."""
+    extension = os.path.splitext(tasks_filepath)[1].lower()
+    if extension in FileManager.SQLITE_EXTENSIONS:
+        return SqliteTaskStorage(tasks_filepath)
+    if extension in FileManager.BINARY_EXTENSIONS:
+        return BinaryTaskStorage(tasks_filepath)
+    return JsonTaskStorage(tasks_filepath, id_counter_filepath)
+
 class FileManager:
     """
-    Gestiona la carga y guardado de tareas y del contador de IDs
-    usando archivos JSON.
+    Gestiona la carga y guardado de tareas y del contador de IDs a través
+    de un motor de almacenamiento (TaskStorage): archivos JSON por defecto,
+    SQLite si el archivo de tareas es .db/.sqlite/.sqlite3, o una
+    instantánea binaria (snapshot_codec) si es .bin/.tqs.
+
+    En modo diario (journal=True) cada cambio se añade al momento a un
+    diario JSONL (TaskJournal) y el contador de IDs viaja en el propio
+    diario. save_all_data solo asegura el diario en disco y, cuando ha
+    crecido lo bastante, compacta: escribe una instantánea nueva del JSON en
+    un hilo en segundo plano. load_all_data lee la instantánea y reproduce
+    el diario escrito después.
+
+    Fuera del modo diario, un ChangeTracker suscrito al índice de los
+    contenedores cargados (o guardados) anota los cambios desde el último
+    guardado: si no hay ninguno, guardar no escribe nada, y si el motor lo
+    admite (SQLite) solo se copian y escriben las tareas que cambiaron.
+    'last_save_written' dice cuántos registros escribió el último guardado.
     """
     DEFAULT_TASKS_FILENAME = "tasks_data.json"
     DEFAULT_ID_FILENAME = "task_id_counter.json"
+    DEFAULT_COMPACT_THRESHOLD = 5000 # Registros del diario tras los que se compacta al guardar
+    SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+    BINARY_EXTENSIONS = (".bin", ".tqs")
+    DEFAULT_LOAD_BATCH = 1000 # Tareas por lote al cargar de forma progresiva
 
-    def __init__(self, tasks_filepath: str = DEFAULT_TASKS_FILENAME, id_counter_filepath: str = DEFAULT_ID_FILENAME):
+    def __init__(self, tasks_filepath: str = DEFAULT_TASKS_FILENAME, id_counter_filepath: str = DEFAULT_ID_FILENAME,
+                 archive_dirpath: str | None = None, completed_hot_window: int = 1000,
+                 journal: bool = False, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                 storage: TaskStorage | None = None):
         """
         Inicializa el FileManager con las rutas a los archivos.
+
+        Con 'archive_dirpath', las tareas completadas que no caben en las
+        'completed_hot_window' más recientes se archivan en segmentos dentro
+        de ese directorio y el JSON solo guarda la ventana caliente.
+
+        Con 'journal', los cambios se guardan en un diario junto al archivo
+        de tareas ("<tasks_filepath>.journal.NNNNNN") y se compacta cada
+        'compact_threshold' registros (solo con el motor JSON).
+
+        'storage' permite indicar el motor de almacenamiento; por defecto se
+        elige por la extensión de 'tasks_filepath' (en SQLite y en el binario
+        el contador de IDs va en el propio archivo de tareas).
         """
         if not isinstance(tasks_filepath, str) or not tasks_filepath:
             raise ValueError("tasks_filepath debe ser una cadena no vacía.")
@@ -29,140 +85,439 @@ class FileManager:
 
         self.tasks_filepath = tasks_filepath
         self.id_counter_filepath = id_counter_filepath
-        print(f"FileManager (JSON) inicializado. Archivo tareas: '{self.tasks_filepath}', Archivo contador: '{self.id_counter_filepath}'")
+        self.storage = storage if storage is not None else storage_for_path(tasks_filepath, id_counter_filepath)
+        if journal and not isinstance(self.storage, JsonTaskStorage):
+            raise ValueError("El modo diario solo está disponible con el almacenamiento JSON.")
+        self.archive_dirpath = archive_dirpath
+        self.completed_hot_window = completed_hot_window
+        self.journal_enabled = journal
+        self.journal_path = tasks_filepath + ".journal"
+        self.compact_threshold = compact_threshold
+        self.last_compaction_error: Exception | None = None
+        self.last_save_error: Exception | None = None
+        self._journal: TaskJournal | None = None
+        self._journal_index: TaskIndex | None = None # Índice al que está suscrito el diario
+        self._journal_id_counter = 0
+        self._compaction: threading.Thread | None = None
+        self._tracker: ChangeTracker | None = None
+        self._tracker_index: TaskIndex | None = None # Índice al que está suscrito el ChangeTracker
+        self._saved_series: list | None = None # Reglas de las series tal como se guardaron
+        self._saved_id_counter: int | None = None
+        # Métricas de guardado
+        self.last_save_written = 0 # Registros (tareas) escritos o borrados en el último guardado
+        self.last_save_skipped = False # El último guardado no escribió nada porque no había cambios
+        self.records_written = 0 # Total de registros escritos
+        self.saves_skipped = 0 # Guardados evitados por no haber cambios
+        print(f"FileManager ({self.storage.FORMAT_NAME}) inicializado. Archivo tareas: '{self.tasks_filepath}', Archivo contador: '{self.id_counter_filepath}'")
 
     # --- Gestión del Contador de IDs ---
 
     def load_id_counter(self) -> int:
-        """Carga el último ID de tarea utilizado desde el archivo JSON."""
-        print(f"FileManager: Intentando cargar contador desde '{self.id_counter_filepath}'")
-        if not os.path.exists(self.id_counter_filepath):
-            print("FileManager: Archivo de contador no encontrado, empezando desde 0.")
-            return 0
+        """
+        Carga el último ID de tarea utilizado del motor de almacenamiento
+        (en modo diario, el que se leyó de la instantánea y el diario al
+        cargar).
+        """
+        if self._journal is not None:
+            return self._journal_id_counter
+        print(f"FileManager: Intentando cargar contador ({self.storage.FORMAT_NAME})")
         try:
-            with open(self.id_counter_filepath, 'r', encoding='utf-8') as f:
-                last_id = json.load(f)
-                if isinstance(last_id, int) and last_id >= 0:
-                    print(f"FileManager: Último ID cargado: {last_id}")
-                    return last_id
-                else:
-                    print(f"Error: Contenido inválido en '{self.id_counter_filepath}'. Empezando desde 0.")
-                    return 0
-        except (IOError, json.JSONDecodeError, ValueError) as e:
-            print(f"Error al cargar el contador de ID desde '{self.id_counter_filepath}': {e}. Empezando desde 0.")
+            last_id = self.storage.load_id_counter()
+        except Exception as e:
+            print(f"Error al cargar el contador de ID ({self.storage.FORMAT_NAME}): {e}. Empezando desde 0.")
             return 0
+        print(f"FileManager: Último ID cargado: {last_id}")
+        self._saved_id_counter = last_id
+        return last_id
 
     def save_id_counter(self, last_id: int) -> bool:
-        """Guarda el último ID de tarea utilizado en el archivo JSON."""
-        print(f"FileManager: Intentando guardar último ID ({last_id}) en '{self.id_counter_filepath}'")
+        """Guarda el último ID de tarea utilizado en el motor de almacenamiento."""
+        print(f"FileManager: Intentando guardar último ID ({last_id}) ({self.storage.FORMAT_NAME})")
         if not isinstance(last_id, int) or last_id < 0:
              print(f"Error: Se intentó guardar un ID inválido ({last_id}).")
              return False
+        if self._journal is not None:
+            # En modo diario el contador es un registro más
+            if last_id != self._journal_id_counter:
+                self._journal.record_counter(last_id)
+                self._journal_id_counter = last_id
+            return True
+        if last_id == self._saved_id_counter:
+            print("FileManager: El contador de ID no ha cambiado.")
+            return True
         try:
-            os.makedirs(os.path.dirname(self.id_counter_filepath) or '.', exist_ok=True)
-            with open(self.id_counter_filepath, 'w', encoding='utf-8') as f:
-                # Guardar como JSON simple
-                json.dump(last_id, f)
+            self.storage.save_id_counter(last_id)
+            self._saved_id_counter = last_id
             print("FileManager: Contador de ID guardado correctamente.")
             return True
-        except (IOError, TypeError) as e:
-            print(f"Error al guardar el contador de ID en '{self.id_counter_filepath}': {e}")
+        except Exception as e: # IOError en JSON, sqlite3.Error en SQLite
+            print(f"Error al guardar el contador de ID ({self.storage.FORMAT_NAME}): {e}")
             return False
 
-    # --- Gestión de Tareas (Usando JSON) ---s
+    # --- Gestión de Tareas ---
 
-    def load_all_data(self) -> Tuple[PendingTasks, CompletedTasks]:
+    def create_containers(self, store: TaskStore | None = None,
+                          scheduling: str = PendingTasks.SCHEDULING_FIFO) -> Tuple[PendingTasks, CompletedTasks]:
+        """
+        Crea unos contenedores vacíos como los de load_all_data (con el
+        archivo de completadas, si se configuró, y un índice compartido),
+        para llenarlos con load_batches.
         """
-        Carga las tareas pendientes y completadas desde el archivo JSON.
+        archive = TaskArchive(self.archive_dirpath) if self.archive_dirpath else None
+        # Ambos contenedores comparten un índice global de tareas por ID
+        index = TaskIndex()
+        return (PendingTasks(store, scheduling, index=index),
+                CompletedTasks(store, archive, self.completed_hot_window, index=index))
 
-        Returns:
-            Una tupla conteniendo (PendingTasks, CompletedTasks) pobladas.
-            Si el archivo no existe o está vacío/corrupto, devuelve contenedores vacíos.
+    def load_batches(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                     recurrence: RecurrenceScheduler | None = None, batch_size: int = DEFAULT_LOAD_BATCH):
         """
-        print(f"FileManager: Intentando cargar tareas desde '{self.tasks_filepath}' (JSON)")
-        pending_tasks = PendingTasks()
-        completed_tasks = CompletedTasks()
+        Generador que carga el estado guardado, lote a lote, en unos
+        contenedores vacíos (ver create_containers). Cada lote se añade antes
+        de generarlo como (clave, tareas), con clave "pending_tasks" o
+        "completed_tasks": las pendientes van al final de la cola y las
+        completadas debajo de las ya cargadas (ambas al final de taskList),
+        así que una vista puede ir añadiendo las filas al final.
 
-        if not os.path.exists(self.tasks_filepath):
-            print("FileManager: Archivo de tareas JSON no encontrado. Devolviendo contenedores vacíos.")
-            return pending_tasks, completed_tasks
+        El motor lee el archivo por partes (JSON: por bloques de texto), así
+        que la memoria de la carga depende de 'batch_size' y no del tamaño
+        del archivo. Al terminar se aplica el resto del estado: dependencias
+        hacia lotes posteriores, completadas que sobran de la ventana
+        caliente, envejecimiento de la cola por prioridad, series recurrentes
+        y diario.
 
-        try:
-            with open(self.tasks_filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f) # Cargar toda la estructura JSON
+        Raises:
+            Los errores de lectura del motor (IOError, ValueError, ...): los
+            contenedores pueden quedar a medias.
+        """
+        print(f"FileManager: Intentando cargar tareas desde '{self.tasks_filepath}' ({self.storage.FORMAT_NAME})")
+        self.close() # El diario anterior (si lo hay) pertenece al estado que se descarta
+        if recurrence is not None:
+            recurrence.clear()
+        items = self.storage.read_batches(batch_size)
+        if items is None:
+            if not self.journal_enabled:
+                print(f"FileManager: No hay tareas guardadas ({self.storage.FORMAT_NAME}). Contenedores vacíos.")
+                self._track(pending_tasks.index, recurrence)
+                return
+            items = () # En modo diario puede haber diario sin instantánea todavía
+
+        data = {} # Claves que no son tareas
+        forward_dependencies = [] # Pendientes con dependencias que aún no se habían cargado
+        for key, value in items:
+            if key == "pending_tasks":
+                # Encolar el lote de una vez (una sola reserva de capacidad en la cola)
+                pending_tasks.addTasks(value)
+                forward_dependencies.extend(task.task_id for task in value
+                                            if any(dependency not in pending_tasks.buckets for dependency in task.depends_on))
+            elif key == "completed_tasks":
+                # Vienen en orden LIFO (taskList): cada lote es más antiguo que los anteriores
+                completed_tasks.addOlderTasks(value)
+            else:
+                if key == "archived_segments" and completed_tasks.archive is not None:
+                    # Descartar los segmentos archivados después del último guardado:
+                    # sus tareas siguen en el archivo de tareas (o eran cambios sin guardar)
+                    completed_tasks.archive.truncate(int(value))
+                data[key] = value
+                continue
+            yield key, value
+
+        if not self.journal_enabled:
+            # Lo cargado es lo que hay guardado; lo que se archive a continuación ya no
+            self._track(pending_tasks.index, None)
+        pending_tasks.recheckDependencies(forward_dependencies)
+        completed_tasks.spillToArchive()
+        # Envejecimiento de la cola por prioridad (antes del diario, que lo sigue avanzando)
+        if "pending_aging" in data:
+            try:
+                pending_tasks.restoreAging(data["pending_aging"])
+            except (ValueError, TypeError, KeyError) as e:
+                print(f"Advertencia: Error al restaurar el envejecimiento de la cola: {e}. Se empieza de cero.")
 
-            # Procesar tareas completadas
-            completed_data = data.get("completed_tasks", []) # Usar .get con default lista vacía
-            print(f"FileManager: Cargando {len(completed_data)} tareas completadas...")
-            for task_dict in completed_data:
+        # Series recurrentes: solo las reglas, sus tareas se generan al vuelo
+        if recurrence is not None:
+            for rule_dict in data.get("recurring_series", []):
                 try:
-                    # Usar el método de clase Task.from_dict (necesita existir en Task)
-                    task = Task.from_dict(task_dict)
-                    completed_tasks.addTask(task)
-                except (ValueError, KeyError, TypeError) as e:
-                    print(f"Advertencia: Error al procesar diccionario de tarea completada: {e} -> {task_dict}. Tarea ignorada.")
-
-            # Procesar tareas pendientes
-            pending_data = data.get("pending_tasks", [])
-            print(f"FileManager: Cargando {len(pending_data)} tareas pendientes...")
-            for task_dict in pending_data:
-                 try:
-                    task = Task.from_dict(task_dict)
-                    pending_tasks.addTask(task)
-                 except (ValueError, KeyError, TypeError) as e:
-                    print(f"Advertencia: Error al procesar diccionario de tarea pendiente: {e} -> {task_dict}. Tarea ignorada.")
+                    recurrence.addRule(RecurrenceRule.from_dict(rule_dict))
+                except (ValueError, TypeError) as e:
+                    print(f"Advertencia: Error al procesar la serie recurrente: {e} -> {rule_dict}. Serie ignorada.")
 
+        if self.journal_enabled:
+            self._open_journal(data, pending_tasks, completed_tasks, recurrence)
+        else:
+            self._saved_series = self._series_of(recurrence)
+        print(f"FileManager: Carga {self.storage.FORMAT_NAME} completada. {len(pending_tasks)} pendientes, {len(completed_tasks)} completadas.")
+
+    def load_all_data(self, store: TaskStore | None = None,
+                      scheduling: str = PendingTasks.SCHEDULING_FIFO,
+                      recurrence: RecurrenceScheduler | None = None) -> Tuple[PendingTasks, CompletedTasks]:
+        """
+        Carga las tareas pendientes y completadas del motor de almacenamiento.
+
+        Args:
+            store: Almacén columnar opcional que compartirán ambos contenedores.
+            scheduling: Modo de planificación de las tareas pendientes.
+            recurrence: Planificador opcional en el que se cargan (tras
+                        vaciarlo) las series de tareas recurrentes.
+
+        Returns:
+            Una tupla conteniendo (PendingTasks, CompletedTasks) pobladas.
+            Si el archivo no existe o está vacío/corrupto, devuelve contenedores vacíos.
+        """
+        pending_tasks, completed_tasks = self.create_containers(store, scheduling)
+        try:
+            for _ in self.load_batches(pending_tasks, completed_tasks, recurrence):
+                pass
         except (IOError, json.JSONDecodeError) as e:
-            print(f"Error al leer o parsear el archivo JSON de tareas '{self.tasks_filepath}': {e}")
+            print(f"Error al leer o parsear el archivo de tareas '{self.tasks_filepath}': {e}")
             # Devolver contenedores vacíos en caso de error grave de lectura/parseo
-            return PendingTasks(), CompletedTasks()
+            return self._empty_containers(store, scheduling, completed_tasks.archive, recurrence)
         except Exception as e: # Captura genérica para otros errores inesperados
-             print(f"Error inesperado durante la carga de tareas desde JSON: {e}")
-             return PendingTasks(), CompletedTasks()
-
-
-        print(f"FileManager: Carga JSON completada. {len(pending_tasks)} pendientes, {len(completed_tasks)} completadas.")
+             print(f"Error inesperado durante la carga de tareas ({self.storage.FORMAT_NAME}): {e}")
+             return self._empty_containers(store, scheduling, completed_tasks.archive, recurrence)
         return pending_tasks, completed_tasks
 
-    def save_all_data(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks) -> bool:
+    def _empty_containers(self, store: TaskStore | None, scheduling: str, archive: TaskArchive | None,
+                          recurrence: RecurrenceScheduler | None) -> Tuple[PendingTasks, CompletedTasks]:
+        """
+        Contenedores vacíos tras un error de carga (con un almacén nuevo si se
+        pidió uno: el recibido puede estar a medias).
+        """
+        if recurrence is not None:
+            recurrence.clear()
+        empty_store = TaskStore() if store is not None else None
+        empty_index = TaskIndex()
+        return (PendingTasks(empty_store, scheduling, index=empty_index),
+                CompletedTasks(empty_store, archive, self.completed_hot_window, index=empty_index))
+
+    def save_all_data(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                      recurrence: RecurrenceScheduler | None = None) -> bool:
         """
-        Guarda las tareas pendientes y completadas en el archivo JSON,
-        sobrescribiendo el contenido anterior.
+        Guarda las tareas pendientes y completadas con el motor de
+        almacenamiento (JSON: reescribe el archivo; SQLite: solo las filas
+        que cambiaron). Si nada cambió desde el último guardado o carga no
+        se escribe nada.
+
+        En modo diario los cambios ya están en el diario: solo se fuerza su
+        escritura en disco y se compacta en segundo plano si ha crecido más
+        de 'compact_threshold' registros.
 
         Args:
             pending_tasks: El contenedor de tareas pendientes.
             completed_tasks: El contenedor de tareas completadas.
+            recurrence: Planificador opcional cuyas series se guardan (una
+                        regla por serie, no sus ocurrencias futuras).
 
         Returns:
             True si se guardó correctamente, False en caso contrario.
         """
-        print(f"FileManager: Intentando guardar tareas en '{self.tasks_filepath}' (JSON)")
+        if self.journal_enabled:
+            return self._save_journal(pending_tasks, completed_tasks, recurrence)
         try:
-            # Crear listas de diccionarios usando el método to_dict de Task
-            # Iterar sobre los contenedores para obtener las tareas en su orden interno
-            pending_list = [task.to_dict() for task in pending_tasks.taskList()]
-            completed_list = [task.to_dict() for task in completed_tasks.taskList()]
-
-            # Crear la estructura de datos a guardar
-            data_to_save = {
-                "pending_tasks": pending_list,
-                "completed_tasks": completed_list
-            }
-
-            # Crear directorios si no existen
-            os.makedirs(os.path.dirname(self.tasks_filepath) or '.', exist_ok=True)
-
-            # Escribir el archivo JSON
-            with open(self.tasks_filepath, 'w', encoding='utf-8') as f:
-                # Usar indent=4 para que el archivo JSON sea legible por humanos
-                json.dump(data_to_save, f, indent=4, ensure_ascii=False)
-
-            print(f"FileManager: Tareas guardadas correctamente en '{self.tasks_filepath}' (JSON).")
-            return True
-        except (IOError, AttributeError, TypeError) as e:
+            snapshot = self.take_snapshot(pending_tasks, completed_tasks, recurrence)
+        except (AttributeError, TypeError) as e:
             # AttributeError/TypeError si los contenedores o tareas no tienen los métodos/atributos esperados (ej. __iter__, to_dict)
-            print(f"Error al guardar el archivo JSON de tareas '{self.tasks_filepath}': {e}")
+            self.last_save_error = e
+            print(f"Error al guardar el archivo de tareas '{self.tasks_filepath}': {e}")
+            return False
+        return self.save_snapshot(snapshot)
+
+    def take_snapshot(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                      recurrence: RecurrenceScheduler | None = None):
+        """
+        Copia el estado a guardar (TaskStorage.snapshot). Es la única parte
+        del guardado que tiene que hacerse en el hilo que modifica los
+        contenedores; save_snapshot puede ir después en otro hilo.
+
+        Devuelve None si nada cambió desde el último guardado o carga (no
+        hay nada que escribir).
+        """
+        series = self._series_of(recurrence)
+        tracker = self._tracker if self._tracker_index is pending_tasks.index else None
+        if (tracker is not None and series == self._saved_series
+                and not tracker.has_changes(pending_tasks, completed_tasks)):
+            return None
+        if tracker is None:
+            # Contenedores que no se cargaron ni guardaron aquí: se guarda todo
+            self._track(pending_tasks.index, recurrence)
+            changes = None
+        else:
+            changes = tracker.checkpoint(next_modification_seq())
+            if changes.saved_seq is None:
+                changes = None
+        try:
+            data = self.storage.snapshot(pending_tasks, completed_tasks, recurrence,
+                                         changes if self.storage.SUPPORTS_DELTA else None)
+        except Exception:
+            self._tracker.saved_seq = None # Los cambios anotados se han perdido: la próxima vez, todo
+            raise
+        return data, series
+
+    def save_snapshot(self, snapshot) -> bool:
+        """
+        Escribe una copia hecha con take_snapshot (se puede llamar desde un
+        hilo de trabajo). Si falla, el error queda en 'last_save_error'.
+
+        Returns:
+            True si se guardó correctamente (o no había cambios), False en caso contrario.
+        """
+        format_name = self.storage.FORMAT_NAME
+        self.last_save_error = None
+        if snapshot is None:
+            self.last_save_written = 0
+            self.last_save_skipped = True
+            self.saves_skipped += 1
+            print(f"FileManager: Sin cambios desde el último guardado en '{self.tasks_filepath}'.")
+            return True
+        data, series = snapshot
+        print(f"FileManager: Intentando guardar tareas en '{self.tasks_filepath}' ({format_name})")
+        try:
+            written = self.storage.write_snapshot(data)
+        except Exception as e: # IOError en JSON, sqlite3.Error en SQLite, entre otros
+            self.last_save_error = e
+            if self._tracker is not None:
+                self._tracker.saved_seq = None # No se sabe qué llegó a escribirse: la próxima vez, todo
+            if isinstance(e, IOError):
+                print(f"Error al guardar el archivo de tareas '{self.tasks_filepath}': {e}")
+            else:
+                print(f"Error inesperado durante el guardado ({format_name}): {e}")
+            return False
+        self._saved_series = series
+        self.last_save_written = written
+        self.last_save_skipped = False
+        self.records_written += written
+        print(f"FileManager: Tareas guardadas correctamente en '{self.tasks_filepath}' ({format_name}, {written} registros).")
+        return True
+
+    # --- Seguimiento de cambios ---
+
+    @staticmethod
+    def _series_of(recurrence: RecurrenceScheduler | None) -> list | None:
+        return [rule.to_dict() for rule in recurrence.ruleList()] if recurrence is not None else None
+
+    def _track(self, index: TaskIndex, recurrence: RecurrenceScheduler | None) -> None:
+        """
+        Suscribe un ChangeTracker nuevo a 'index', tomando su estado actual
+        (y las series de 'recurrence') como el guardado.
+        """
+        self._untrack()
+        self._tracker = ChangeTracker(next_modification_seq())
+        self._tracker_index = index
+        index.add_listener(self._tracker, replay=False)
+        self._saved_series = self._series_of(recurrence)
+
+    def _untrack(self) -> None:
+        if self._tracker is not None:
+            self._tracker_index.remove_listener(self._tracker)
+            self._tracker = None
+            self._tracker_index = None
+
+    # --- Modo diario ---
+
+    def _open_journal(self, data: dict, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                      recurrence: RecurrenceScheduler | None) -> None:
+        """
+        Reproduce el diario posterior a la instantánea 'data' y empieza una
+        generación nueva suscrita al índice de los contenedores.
+        """
+        generation = int(data.get("journal_generation", 0))
+        last_id, replayed = TaskJournal.replay(self.journal_path, generation, pending_tasks, completed_tasks, recurrence)
+        print(f"FileManager: {replayed} registros del diario reproducidos.")
+        # El archivo de contador solo cuenta si la instantánea es anterior al modo diario
+        self._journal_id_counter = max(int(data.get("id_counter", 0)), last_id,
+                                       0 if "id_counter" in data else self.storage.load_id_counter())
+        generations = TaskJournal.generations(self.journal_path)
+        # Nunca se sigue escribiendo en un archivo ya existente (podría acabar a medias)
+        self._journal = TaskJournal(self.journal_path, max(generation, generations[-1] + 1 if generations else 0))
+        self._journal.records_written = replayed # Cuentan para decidir cuándo compactar
+        self._journal_index = pending_tasks.index
+        self._journal_index.add_listener(self._journal, replay=False)
+
+    def _save_journal(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                      recurrence: RecurrenceScheduler | None) -> bool:
+        """save_all_data en modo diario."""
+        try:
+            if self._journal is None or self._journal_index is not pending_tasks.index:
+                # Contenedores que no se cargaron con este diario: hace falta una instantánea
+                self.close()
+                generations = TaskJournal.generations(self.journal_path)
+                self._journal = TaskJournal(self.journal_path, generations[-1] + 1 if generations else 0)
+                self._journal_index = pending_tasks.index
+                self._journal_index.add_listener(self._journal, replay=False)
+                return self.compact(pending_tasks, completed_tasks, recurrence, wait=True)
+            self._journal.flush()
+            if self._journal.records_written >= self.compact_threshold:
+                return self.compact(pending_tasks, completed_tasks, recurrence)
+            return True
+        except (IOError, OSError) as e:
+            print(f"Error al escribir el diario de tareas '{self.journal_path}': {e}")
+            return False
+
+    def record_series(self, recurrence: RecurrenceScheduler) -> None:
+        """Anota en el diario el estado de las series recurrentes (sin diario no hace nada)."""
+        if self._journal is not None:
+            self._journal.record_series(recurrence.ruleList())
+
+    def compact(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                recurrence: RecurrenceScheduler | None = None, wait: bool = False) -> bool:
+        """
+        Escribe una instantánea nueva y descarta el diario que ya recoge.
+
+        El estado se copia en este hilo (to_dict de cada tarea) y el diario
+        pasa a una generación nueva; la serialización y la escritura del JSON
+        se hacen en un hilo en segundo plano. Las generaciones antiguas solo
+        se borran cuando la instantánea ya está en disco, así que una
+        interrupción a medias nunca pierde datos.
+
+        Args:
+            wait: Esperar a que termine la escritura.
+
+        Returns:
+            True si la compactación se puso en marcha (o terminó bien, con 'wait').
+        """
+        if self._journal is None:
+            print("Error (FileManager.compact): No hay un diario abierto.")
             return False
-        except Exception as e: # Captura genérica
-             print(f"Error inesperado durante el guardado JSON: {e}")
-             return False
\ No newline at end of file
+        self.wait_for_compaction() # Una compactación cada vez
+        data = JsonTaskStorage.collect_data(pending_tasks, completed_tasks, recurrence)
+        data["id_counter"] = self._journal_id_counter
+        data["journal_generation"] = self._journal.rotate()
+        self.last_compaction_error = None
+        self._compaction = threading.Thread(target=self._write_snapshot, args=(data,),
+                                            name="TaskJournalCompaction")
+        self._compaction.start()
+        if wait:
+            self.wait_for_compaction()
+            return self.last_compaction_error is None
+        return True
+
+    def _write_snapshot(self, data: dict) -> None:
+        """Escribe la instantánea de forma atómica y borra el diario anterior (hilo de compactación)."""
+        try:
+            self.storage.write_data(data, indent=None, atomic=True)
+            TaskJournal.discard_before(self.journal_path, data["journal_generation"])
+            print(f"FileManager: Instantánea escrita en '{self.tasks_filepath}' "
+                  f"(diario desde la generación {data['journal_generation']}).")
+        except Exception as e:
+            self.last_compaction_error = e
+            print(f"Error al compactar el diario en '{self.tasks_filepath}': {e}")
+
+    def wait_for_compaction(self) -> None:
+        """Espera a que termine la compactación en curso (si la hay)."""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def close(self) -> None:
+        """
+        Espera a la compactación en curso y cierra el diario (si lo hay) y
+        el motor de almacenamiento (que se vuelve a abrir si se sigue usando).
+        """
+        self.wait_for_compaction()
+        self._untrack()
+        if self._journal is not None:
+            self._journal_index.remove_listener(self._journal)
+            self._journal.close()
+            self._journal = None
+            self._journal_index = None
+        self.storage.close()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo que define AutoSaveService, que guarda las tareas en un hilo de
+trabajo tras una pausa en las ediciones.
+"""
+import time
+from functools import partial
+
+from PySide6.QtCore import QCoreApplication, QObject, QThreadPool, QTimer, Qt, Signal, Slot
+
+from src.FileManager import FileManager
+from src.coreClasses.Task import Task
+
+class AutoSaveService(QObject):
+    """
+    Oyente de TaskIndex que guarda automáticamente tras cada ráfaga de
+    cambios.
+
+    Cada cambio (re)arranca un QTimer de un solo disparo de 'interval_ms':
+    una ráfaga de ediciones produce un único guardado, como mucho
+    'max_delay_ms' después del primer cambio sin guardar. Al guardar, el
+    estado se copia en el hilo de la GUI (FileManager.take_snapshot, lo
+    barato) y la serialización y la escritura se hacen en un QThreadPool de
+    un solo hilo. Los cambios que llegan mientras se escribe se guardan en
+    el siguiente guardado, nunca en dos escrituras a la vez.
+
+    En modo diario los cambios ya se anotan al momento: el guardado solo
+    fuerza el diario a disco (y compacta en su propio hilo si toca), así que
+    se hace directamente en el hilo de la GUI.
+
+    Señales:
+        saveStarted(): Empieza un guardado.
+        saveFinished(): El guardado terminó bien.
+        saveFailed(str): El guardado falló (mensaje del error).
+    """
+    saveStarted = Signal()
+    saveFinished = Signal()
+    saveFailed = Signal(str)
+    _writeDone = Signal(bool, str) # Del hilo de trabajo al de la GUI
+
+    DEFAULT_INTERVAL_MS = 2000
+    MAX_DELAY_FACTOR = 5 # Por defecto, max_delay_ms = interval_ms * MAX_DELAY_FACTOR
+
+    def __init__(self, file_manager: FileManager, state, interval_ms: int | None = DEFAULT_INTERVAL_MS,
+                 max_delay_ms: int | None = None, parent: QObject | None = None):
+        """
+        Inicializador del servicio.
+
+        Args:
+            file_manager: El FileManager con el que se guarda.
+            state: Función sin argumentos que devuelve el estado actual:
+                   (pending_tasks, completed_tasks, recurrence, last_id).
+            interval_ms: Pausa sin cambios tras la que se guarda. None
+                         desactiva el autoguardado (solo saveNow).
+            max_delay_ms: Espera máxima desde el primer cambio sin guardar
+                          aunque sigan llegando cambios.
+            parent: El objeto padre Qt (opcional).
+        """
+        super().__init__(parent)
+        if interval_ms is not None and interval_ms < 0:
+            raise ValueError("interval_ms no puede ser negativo.")
+        self.file_manager = file_manager
+        self._state = state
+        self.interval_ms = interval_ms
+        self.max_delay_ms = max_delay_ms
+        self.save_count = 0 # Guardados terminados (bien o mal)
+        self.last_duration = 0.0 # Segundos del último guardado, de la copia a la escritura
+        self._dirty_since: float | None = None # Primer cambio sin guardar (None: nada pendiente)
+        self._saving = False
+        self._save_again = False # saveNow durante un guardado: se repite al terminar
+        self._started_at = 0.0
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1) # Las escrituras nunca se solapan
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+        self._writeDone.connect(self._on_write_done, Qt.ConnectionType.QueuedConnection)
+
+    def isDirty(self) -> bool:
+        """Hay cambios que todavía no se han guardado (o se están guardando)."""
+        return self._dirty_since is not None or self._saving
+
+    def isSaving(self) -> bool:
+        return self._saving
+
+    @Slot()
+    def markDirty(self) -> None:
+        """Anota un cambio y (re)programa el autoguardado."""
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        if not self._saving: # Si se está guardando, se reprograma al terminar
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if self.interval_ms is None or self._dirty_since is None:
+            return
+        delay_ms = self.interval_ms
+        max_delay_ms = self.max_delay_ms if self.max_delay_ms is not None else self.interval_ms * self.MAX_DELAY_FACTOR
+        waited_ms = (time.monotonic() - self._dirty_since) * 1000
+        self._timer.start(int(max(0.0, min(delay_ms, max_delay_ms - waited_ms))))
+
+    @Slot()
+    def saveNow(self) -> None:
+        """Guarda ya (si hay un guardado en curso, en cuanto termine)."""
+        self._timer.stop()
+        if self._saving:
+            self._save_again = True
+            return
+        self._start_save()
+
+    def cancel(self) -> None:
+        """Olvida los cambios pendientes de guardar (no detiene una escritura en curso)."""
+        self._timer.stop()
+        self._dirty_since = None
+        self._save_again = False
+
+    def waitForDone(self) -> None:
+        """Espera a que terminen la escritura en curso (y la repetida por saveNow) y entrega sus señales."""
+        while self._saving:
+            self._pool.waitForDone()
+            QCoreApplication.sendPostedEvents(self) # _on_write_done llega por una conexión en cola
+
+    @Slot()
+    def _on_timeout(self) -> None:
+        if not self._saving:
+            self._start_save()
+
+    def _start_save(self) -> None:
+        self._dirty_since = None
+        self._saving = True
+        self._started_at = time.perf_counter()
+        self.saveStarted.emit()
+        pending_tasks, completed_tasks, recurrence, last_id = self._state()
+        if self.file_manager.journal_enabled:
+            ok = self.file_manager.save_all_data(pending_tasks, completed_tasks, recurrence)
+            ok = self.file_manager.save_id_counter(last_id) and ok
+            self._on_write_done(ok, "" if ok else f"No se pudo escribir el diario '{self.file_manager.journal_path}'.")
+            return
+        try:
+            snapshot = self.file_manager.take_snapshot(pending_tasks, completed_tasks, recurrence)
+        except Exception as e:
+            print(f"Error (AutoSaveService): No se pudo copiar el estado a guardar: {e}")
+            self._on_write_done(False, str(e))
+            return
+        self._pool.start(partial(self._write, snapshot, last_id))
+
+    def _write(self, snapshot, last_id: int) -> None:
+        """Escritura (hilo de trabajo): no toca los contenedores, solo la copia."""
+        ok = self.file_manager.save_snapshot(snapshot)
+        message = "" if ok else str(self.file_manager.last_save_error)
+        if ok and not self.file_manager.save_id_counter(last_id):
+            ok, message = False, f"No se pudo guardar el contador de IDs en '{self.file_manager.id_counter_filepath}'."
+        self._writeDone.emit(ok, message)
+
+    @Slot(bool, str)
+    def _on_write_done(self, ok: bool, message: str) -> None:
+        self._saving = False
+        self.save_count += 1
+        self.last_duration = time.perf_counter() - self._started_at
+        if ok:
+            self.saveFinished.emit()
+        else:
+            # Los cambios siguen sin guardar: se reintenta con el siguiente cambio o saveNow
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            self.saveFailed.emit(message)
+        if self._save_again:
+            self._save_again = False
+            self._start_save()
+        elif ok:
+            self._schedule() # Cambios llegados durante la escritura
+
+    # --- Oyente de TaskIndex ---
+
+    def task_registered(self, task: Task, location: str) -> None:
+        self.markDirty()
+
+    def task_unregistered(self, task: Task) -> None:
+        self.markDirty()
+
+    def task_edited(self, task: Task, attribute: str, old_value) -> None:
+        self.markDirty()
+
+    def index_cleared(self) -> None:
+        pass # Solo al recargar: lo que hay en disco ya es ese estado
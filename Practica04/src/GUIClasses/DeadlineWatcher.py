@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo que define DeadlineWatcher, que avisa con una señal Qt cuando vencen
+las fechas límite de las tareas pendientes.
+"""
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from src.coreClasses.Task import Task
+from src.coreClasses.DeadlineHeap import DeadlineHeap
+
+class DeadlineWatcher(QObject):
+    """
+    Oyente de TaskIndex que mantiene un DeadlineHeap y un único QTimer de un
+    solo disparo programado para la fecha límite más próxima. Nunca recorre
+    las tareas: al dispararse pasa a vencidas las que tocan y se reprograma
+    para la siguiente.
+
+    Señales:
+        tasksOverdue(list): Tareas que acaban de vencer (de la más antigua a
+                            la más reciente).
+    """
+    tasksOverdue = Signal(list)
+
+    # QTimer no admite intervalos mayores de ~24 días: se revisa como mucho una vez al día
+    MAX_INTERVAL_MS = 24 * 60 * 60 * 1000
+
+    def __init__(self, deadlines: DeadlineHeap | None = None, parent: QObject | None = None):
+        """
+        Inicializador del vigilante.
+
+        Args:
+            deadlines: Planificador a usar (por defecto, uno nuevo vacío).
+            parent: El objeto padre Qt (opcional).
+        """
+        super().__init__(parent)
+        self.deadlines = deadlines if deadlines is not None else DeadlineHeap()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+        self._armed_for: float | None = None # Fecha límite para la que está programado el timer
+
+    def _rearm(self) -> None:
+        """Programa el timer para la fecha límite más próxima (o lo para si no hay)."""
+        next_deadline = self.deadlines.next_deadline()
+        self._armed_for = next_deadline
+        if next_deadline is None:
+            self._timer.stop()
+            return
+        delay_ms = max(0.0, (next_deadline - time.time()) * 1000)
+        self._timer.start(int(min(delay_ms, self.MAX_INTERVAL_MS)))
+
+    def _rearm_if_earlier(self, due_at: float | None) -> None:
+        """Adelanta el timer si la nueva fecha límite vence antes que la programada."""
+        if due_at is not None and (self._armed_for is None or due_at < self._armed_for):
+            self._rearm()
+
+    @Slot()
+    def check(self) -> list[Task]:
+        """
+        Pasa a vencidas las tareas cuya fecha ya llegó, emite tasksOverdue si
+        hay alguna y reprograma el timer. Devuelve las que acaban de vencer.
+        """
+        newly_overdue = self.deadlines.advance()
+        self._rearm()
+        if newly_overdue:
+            self.tasksOverdue.emit(newly_overdue)
+        return newly_overdue
+
+    @Slot()
+    def _on_timeout(self) -> None:
+        self.check()
+
+    def overdue(self) -> list[Task]:
+        """Tareas pendientes ya vencidas."""
+        return self.deadlines.overdue()
+
+    def upcoming(self, n: int) -> list[Task]:
+        """Las n próximas tareas en vencer."""
+        return self.deadlines.upcoming(n)
+
+    # --- Oyente de TaskIndex (se reenvía al planificador) ---
+
+    def task_registered(self, task: Task, location: str) -> None:
+        self.deadlines.task_registered(task, location)
+        self._rearm_if_earlier(task.due_at)
+
+    def task_unregistered(self, task: Task) -> None:
+        # Si era la programada, el timer se dispara sin nada que vencer y se reprograma
+        self.deadlines.task_unregistered(task)
+
+    def task_edited(self, task: Task, attribute: str, old_value) -> None:
+        self.deadlines.task_edited(task, attribute, old_value)
+        if attribute == "due_at":
+            self._rearm_if_earlier(task.due_at)
+
+    def index_cleared(self) -> None:
+        self.deadlines.index_cleared()
+        self._rearm()
@@ -17,11 +17,16 @@ class PriorityFilterProxyModel(QSortFilterProxyModel):
 
     Acepta filas si la prioridad de la tarea coincide con el filtro establecido,
     o si el filtro es 0 (mostrar todas).
+
+    Si el modelo fuente sabe filtrar por sí mismo (TaskModel sobre un
+    contenedor con cubos por prioridad), el filtro se le delega y el proxy
+    acepta todas sus filas sin examinarlas.
     """
     def __init__(self, parent: QObject | None = None):
         """Inicializador del proxy model."""
         super().__init__(parent)
         self._filter_priority_id = 0 # Filtro inicial: 0 = Mostrar todas
+        self._filtered_by_source = False # True si el modelo fuente aplica el filtro
 
     @Slot(int)
     def setPriorityFilter(self, priority_id: int) -> None:
@@ -32,6 +37,9 @@ class PriorityFilterProxyModel(QSortFilterProxyModel):
         if self._filter_priority_id != filter_id:
             print(f"ProxyFilter: Estableciendo filtro de prioridad a ID: {filter_id}") # Debug
             self._filter_priority_id = filter_id
+            source_model = self.sourceModel()
+            # El modelo fuente se reinicia con las filas ya filtradas
+            self._filtered_by_source = isinstance(source_model, TaskModel) and source_model.setPriorityFilter(filter_id)
             # Forzar la reevaluación del filtro
             self.invalidateFilter()
 
@@ -40,7 +48,7 @@ class PriorityFilterProxyModel(QSortFilterProxyModel):
         Determina si una fila del modelo fuente debe ser incluida.
         """
         # Si el filtro es "ALL" (ID 0), aceptar siempre
-        if self._filter_priority_id == 0:
+        if self._filter_priority_id == 0 or self._filtered_by_source:
             return True
 
         # Obtener el modelo fuente
@@ -62,7 +70,6 @@ class PriorityFilterProxyModel(QSortFilterProxyModel):
         # Verificar si obtuvimos un objeto Task y comparar su prioridad
         # Usar acceso directo al atributo 'priority' de la Task refactorizada
         if isinstance(task, Task):
-            print(f"ProxyFilter: Row {source_row}, TaskPrio={task.priority}, Filter={self._filter_priority_id}") # Debug detallado
             return task.priority == self._filter_priority_id
         else:
             # No se pudo obtener un objeto Task válido
@@ -4,6 +4,7 @@ Módulo que define el widget TaskDetailWidget para mostrar y editar
 los detalles de una tarea seleccionada.
 """
 import sys
+import time
 from PySide6.QtCore import Qt, Signal, Slot, QObject
 from PySide6.QtWidgets import (QApplication, QWidget, QLabel, QTextEdit, QFrame,
                                QComboBox, QVBoxLayout, QHBoxLayout, QSizePolicy,
@@ -147,7 +148,14 @@ class TaskDetailWidget(QWidget):
 
         self.title_label.setText(task.title)
         self.description_edit.setPlainText(task.description)
-        self.status_label.setText(f"Estado: {task.status}")
+        status_text = f"Estado: {task.status}"
+        if task.due_at is not None:
+            status_text += f" | Vence: {time.strftime('%d/%m/%Y %H:%M', time.localtime(task.due_at))}"
+            if task.isOverdue():
+                status_text += " (vencida)"
+        if task.depends_on:
+            status_text += f" | Depende de: {', '.join(str(dependency_id) for dependency_id in task.depends_on)}"
+        self.status_label.setText(status_text)
 
         # Buscar y seleccionar la prioridad en el ComboBox
         priority_text = self.PRIORITY_MAP_INT_TO_STR.get(task.priority)
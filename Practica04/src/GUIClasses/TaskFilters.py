@@ -1,23 +1,26 @@
 # -*- coding: utf-8 -*-
 """
-Módulo que define el widget TaskFilters para filtrar tareas por prioridad.
+Módulo que define el widget TaskFilters para filtrar tareas por prioridad
+y buscarlas por texto.
 """
 import sys
 from PySide6.QtCore import Signal, Slot, Qt
 from PySide6.QtWidgets import (QApplication, QWidget, QPushButton,
-                               QButtonGroup, QHBoxLayout)
+                               QButtonGroup, QHBoxLayout, QLineEdit)
 
 class TaskFilters(QWidget):
     """
     Widget con botones exclusivos para filtrar tareas por prioridad
-    (Todas, Urgente, Media, Baja).
+    (Todas, Urgente, Media, Baja) y un cuadro de búsqueda de texto.
 
     Señales:
         filterChanged(int): Emitida cuando se selecciona un filtro,
                             enviando el ID de prioridad asociado
                             (0: Todas, 3: Urgente, 2: Media, 1: Baja).
+        searchChanged(str): Emitida al cambiar el texto de búsqueda.
     """
     filterChanged = Signal(int) # Señal renombrada
+    searchChanged = Signal(str)
 
     # IDs para los filtros
     FILTER_ALL_ID = 0
@@ -64,6 +67,14 @@ class TaskFilters(QWidget):
         # Conectar señal del grupo al slot interno (nombre corregido)
         self.button_group.idClicked.connect(self._on_filter_button_clicked)
 
+        # Cuadro de búsqueda (título y descripción, sin distinguir tildes)
+        self.search_edit = QLineEdit()
+        self.search_edit.setObjectName("searchLineEdit")
+        self.search_edit.setPlaceholderText("Buscar...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setToolTip("Buscar en el título y la descripción de las tareas")
+        self.search_edit.textChanged.connect(self.searchChanged)
+
         # Layout
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -73,6 +84,7 @@ class TaskFilters(QWidget):
         layout.addWidget(self.medium_button)
         layout.addWidget(self.low_button)
         layout.addStretch()
+        layout.addWidget(self.search_edit)
 
         # Establecer estado inicial (Todas seleccionado por defecto)
         self.all_button.setChecked(True)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo que define TaskLoader, que recorre una carga por lotes
+(FileManager.load_batches) desde el bucle de eventos de Qt.
+"""
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+class TaskLoader(QObject):
+    """
+    Avanza el generador de lotes un paso en cada vuelta del bucle de eventos
+    (QTimer de intervalo 0): la ventana sigue respondiendo durante la carga
+    y cada lote se puede mostrar en cuanto llega.
+
+    Señales:
+        batchLoaded(str, int): Lote añadido a los contenedores: clave
+                               ("pending_tasks" o "completed_tasks") y
+                               número de tareas.
+        finished(): La carga terminó.
+        failed(str): La carga se interrumpió por un error (mensaje).
+    """
+    batchLoaded = Signal(str, int)
+    finished = Signal()
+    failed = Signal(str)
+
+    def __init__(self, parent: QObject | None = None):
+        """Inicializador del cargador (sin ninguna carga en curso)."""
+        super().__init__(parent)
+        self._batches = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def start(self, batches) -> None:
+        """Empieza a recorrer 'batches' (cancela la carga anterior si la hay)."""
+        self.cancel()
+        self._batches = iter(batches)
+        self._timer.start()
+
+    def isRunning(self) -> bool:
+        return self._batches is not None
+
+    def cancel(self) -> None:
+        """Detiene la carga en curso; los contenedores quedan a medias."""
+        self._timer.stop()
+        if self._batches is not None:
+            close = getattr(self._batches, 'close', None)
+            if callable(close):
+                close()
+            self._batches = None
+
+    @Slot()
+    def _step(self) -> None:
+        try:
+            key, tasks = next(self._batches)
+        except StopIteration:
+            self._timer.stop()
+            self._batches = None
+            self.finished.emit()
+            return
+        except Exception as e:
+            self._timer.stop()
+            self._batches = None
+            print(f"Error (TaskLoader): La carga se interrumpió: {e}")
+            self.failed.emit(str(e))
+            return
+        self.batchLoaded.emit(key, len(tasks))
@@ -4,7 +4,9 @@ Módulo que define el TaskModel, un adaptador Qt para los contenedores
 de tareas (PendingTasks, CompletedTasks).
 """
 import sys
+import time
 from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Slot, QObject
+from PySide6.QtGui import QBrush, QColor
 # Para el ejemplo __main__
 from PySide6.QtWidgets import QApplication, QListView, QVBoxLayout, QWidget, QPushButton, QLabel
 
@@ -22,13 +24,29 @@ class TaskModel(QAbstractListModel):
     Lee la lista de tareas del contenedor asociado a través de 'taskList()'
     y la almacena en una caché interna para uso de la vista.
     Notifica a las vistas para que se actualicen mediante 'refresh()'.
+
+    En modo sin copia (zero_copy=True), si el contenedor ofrece 'taskView()',
+    las filas se leen directamente de esa vista y nunca se construye una
+    lista: refresh() solo guarda el número de filas.
+
+    Si el contenedor tiene tareas archivadas (CompletedTasks con TaskArchive),
+    se muestran a continuación y se leen por segmentos a medida que la vista
+    se desplaza (canFetchMore/fetchMore).
+
+    Con setPriorityFilter() el modelo muestra solo las tareas de una
+    prioridad pidiéndoselas al contenedor (tasks_with_priority, O(k)), en
+    lugar de que el proxy recorra y descarte todas las filas.
     """
 
     # Rol estándar de Qt para almacenar datos personalizados (el objeto Task completo).
     # Usar Qt.UserRole es común y evita definir constantes propias si no hay más roles.
     TaskObjectRole = Qt.ItemDataRole.UserRole
 
-    def __init__(self, task_container: object | None = None, parent: QObject | None = None):
+    # Color del texto de las tareas pendientes cuya fecha límite ya pasó
+    OVERDUE_BRUSH = QBrush(QColor(200, 40, 40))
+
+    def __init__(self, task_container: object | None = None, parent: QObject | None = None,
+                 zero_copy: bool = False):
         """
         Inicializador del modelo.
 
@@ -36,10 +54,16 @@ class TaskModel(QAbstractListModel):
             task_container: La instancia de PendingTasks o CompletedTasks
                             que este modelo representará.
             parent: El objeto padre Qt (opcional).
+            zero_copy: Leer las filas de 'taskView()' en lugar de copiar 'taskList()'.
         """
         super().__init__(parent)
         self._task_container = task_container
-        self._tasks_cache: list[Task] = []
+        self._zero_copy = zero_copy
+        self._tasks_cache: list[Task] = [] # Lista o vista de solo lectura
+        self._hot_count = 0 # Filas de _tasks_cache anunciadas a las vistas
+        self._archived_cache: list[Task] = [] # Tareas archivadas ya leídas (tras las anteriores)
+        self._row_count = 0 # Filas anunciadas a las vistas en el último refresh
+        self._priority_filter = 0 # 0 = todas las prioridades
         print(f"TaskModel creado para contenedor: {type(self._task_container).__name__ if self._task_container else 'None'}")
 
     def set_task_container(self, container: object) -> None:
@@ -48,6 +72,21 @@ class TaskModel(QAbstractListModel):
         self._task_container = container
         # Es responsabilidad del código externo llamar a refresh() después.
 
+    def setPriorityFilter(self, priority_id: int) -> bool:
+        """
+        Muestra solo las tareas con esa prioridad (0 = todas).
+
+        Returns:
+            False si el contenedor no agrupa sus tareas por prioridad; en ese
+            caso el filtro no se aplica aquí y debe hacerlo el proxy.
+        """
+        if not callable(getattr(self._task_container, 'tasks_with_priority', None)):
+            return False
+        if self._priority_filter != priority_id:
+            self._priority_filter = priority_id
+            self.refresh()
+        return True
+
     @Slot()
     def refresh(self) -> None:
         """
@@ -57,6 +96,29 @@ class TaskModel(QAbstractListModel):
         Debe ser llamado externamente cuando los datos en el contenedor cambien.
         """
         print(f"TaskModel: Iniciando refresh desde {type(self._task_container).__name__ if self._task_container else 'None'}")
+        if self._priority_filter and callable(getattr(self._task_container, 'tasks_with_priority', None)):
+            # Solo las tareas de la prioridad filtrada, sin recorrer el resto
+            self.beginResetModel()
+            self._tasks_cache = self._task_container.tasks_with_priority(self._priority_filter)
+            self._hot_count = len(self._tasks_cache)
+            self._refreshArchived()
+            self.endResetModel()
+            print(f"TaskModel: Refresh completo (prioridad {self._priority_filter}). Filas: {self._row_count}")
+            return
+
+        view = None
+        if self._zero_copy and self._task_container is not None and hasattr(self._task_container, 'taskView'):
+            view = self._task_container.taskView()
+        if view is not None:
+            # Sin copia: la vista refleja el contenedor; solo fijamos el número de filas
+            self.beginResetModel()
+            self._tasks_cache = view
+            self._hot_count = len(view)
+            self._refreshArchived()
+            self.endResetModel()
+            print(f"TaskModel: Refresh completo (vista sin copia). Filas: {self._row_count}")
+            return
+
         tasks = []
         if self._task_container and hasattr(self._task_container, 'taskList') and callable(self._task_container.taskList):
             try:
@@ -75,16 +137,79 @@ class TaskModel(QAbstractListModel):
         self.beginResetModel()
         # Actualizar la caché interna
         self._tasks_cache = list(tasks) # Asegurar que es una lista
+        self._hot_count = len(self._tasks_cache)
+        self._refreshArchived()
         # Notificar a las vistas DESPUÉS de cambiar los datos
         self.endResetModel()
         print(f"TaskModel: Refresh completo. Tamaño de caché: {len(self._tasks_cache)}")
 
+    def tasksAppended(self) -> None:
+        """
+        Avisa de que el contenedor tiene tareas nuevas al final de su
+        taskList() (carga progresiva). Con una vista sin copia solo se
+        insertan las filas nuevas; en cualquier otro caso se hace un refresh.
+        """
+        view = None
+        if self._zero_copy and not self._priority_filter and hasattr(self._task_container, 'taskView'):
+            view = self._task_container.taskView()
+        if view is None or isinstance(self._tasks_cache, list):
+            self.refresh() # La caché era una copia: hay que rehacerla
+            return
+        added = len(view) - self._hot_count
+        if added <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._hot_count, self._hot_count + added - 1)
+        self._tasks_cache = view
+        self._hot_count = len(view)
+        self._row_count += added
+        self.endInsertRows()
+
+    def _refreshArchived(self) -> None:
+        """Toma las tareas archivadas ya leídas del contenedor (si las tiene) y recalcula las filas."""
+        archived = getattr(self._task_container, 'archivedTaskList', None)
+        self._archived_cache = archived() if callable(archived) else []
+        if self._priority_filter and self._archived_cache:
+            # Las archivadas no están en los cubos: se filtran las ya leídas
+            self._archived_cache = [task for task in self._archived_cache if task.priority == self._priority_filter]
+        self._row_count = self._hot_count + len(self._archived_cache)
+
+    # --- Carga incremental de tareas archivadas ---
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Qt lo consulta al llegar al final de la lista: ¿quedan segmentos archivados?"""
+        if parent.isValid() or self._task_container is None:
+            return False
+        has_archived = getattr(self._task_container, 'hasArchivedTasks', None)
+        return bool(callable(has_archived) and has_archived())
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """Lee el siguiente segmento archivado y añade sus filas al final."""
+        if not self.canFetchMore(parent):
+            return
+        older = self._task_container.loadOlderTasks()
+        if self._priority_filter:
+            older = [task for task in older if task.priority == self._priority_filter]
+        if not older:
+            return
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + len(older) - 1)
+        self._refreshArchived()
+        self.endInsertRows()
+        print(f"TaskModel: {len(older)} tareas archivadas cargadas. Filas: {self._row_count}")
+
+    def _taskAt(self, row: int) -> Task:
+        """Tarea de la fila: primero las de la caché, luego las archivadas."""
+        if row < self._hot_count:
+            return self._tasks_cache[row]
+        return self._archived_cache[row - self._hot_count]
+
     # --- Métodos Obligatorios Reimplementados (usan la caché) ---
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        """Devuelve el número de filas basado en la caché interna."""
+        """Devuelve el número de filas anunciado en el último refresh."""
         # Para modelos de lista, parent siempre es inválido.
-        return len(self._tasks_cache) if not parent.isValid() else 0
+        # (Con una vista, el contenedor puede cambiar antes del próximo refresh:
+        # las vistas de Qt solo deben ver el número de filas tras el reset)
+        return self._row_count if not parent.isValid() else 0
 
     def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> object | None:
         """Devuelve los datos para un índice y rol específicos desde la caché."""
@@ -92,7 +217,7 @@ class TaskModel(QAbstractListModel):
             return None # Índice inválido o fuera de rango
 
         try:
-            task = self._tasks_cache[index.row()] # Obtener de la caché
+            task = self._taskAt(index.row()) # Obtener de la caché
         except IndexError:
              # Esto no debería ocurrir si rowCount y el índice son correctos, pero por si acaso
              print(f"TaskModel: Error INTERNO de índice en data() - Fila: {index.row()}, Tamaño caché: {len(self._tasks_cache)}")
@@ -103,8 +228,15 @@ class TaskModel(QAbstractListModel):
             # Usar el Task refactorizado con acceso directo a atributos
             prio_map = {3: "Urgente", 2: "Medio", 1: "Bajo"}
             prio_text = prio_map.get(task.priority, "N/A")
+            if task.due_at is not None:
+                due_text = time.strftime("%d/%m/%Y %H:%M", time.localtime(task.due_at))
+                return f"{task.title} ({prio_text}) - vence {due_text}"
             return f"{task.title} ({prio_text})"
 
+        # Resaltar las tareas vencidas
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.OVERDUE_BRUSH if task.isOverdue() else None
+
         # Rol para obtener el objeto Task completo (usando el rol estándar UserRole)
         if role == self.TaskObjectRole: # O Qt.UserRole
             return task
@@ -120,7 +252,7 @@ class TaskModel(QAbstractListModel):
         """Obtiene el objeto Task en la fila especificada (desde la caché)."""
         if 0 <= row < self.rowCount():
              try:
-                return self._tasks_cache[row]
+                return self._taskAt(row)
              except IndexError:
                  # Podría ocurrir si el modelo se modifica entre llamadas, aunque refresh debería evitarlo
                  print(f"TaskModel: Error INTERNO de índice en getTaskFromRow() - Fila: {row}, Tamaño caché: {len(self._tasks_cache)}")
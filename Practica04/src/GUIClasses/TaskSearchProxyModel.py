@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo que define un proxy que combina la búsqueda de texto con el filtro
+de prioridad.
+"""
+from PySide6.QtCore import QModelIndex, Slot, QObject
+
+from src.GUIClasses.TaskModel import TaskModel
+from src.GUIClasses.PriorityFilterProxyModel import PriorityFilterProxyModel
+from src.coreClasses.Task import Task
+from src.coreClasses.TextSearchIndex import TextSearchIndex
+
+class TaskSearchProxyModel(PriorityFilterProxyModel):
+    """
+    Proxy que acepta una fila si pasa el filtro de prioridad y, si hay texto
+    de búsqueda, si la tarea contiene todas sus palabras (como prefijos).
+
+    La búsqueda se resuelve una sola vez con el TextSearchIndex (conjunto
+    de IDs) y después cada fila solo comprueba si su ID está en el conjunto.
+    Las tareas no indexadas (las archivadas) se comprueban directamente.
+    """
+    def __init__(self, search_index: TextSearchIndex | None = None, parent: QObject | None = None):
+        """Inicializador del proxy model."""
+        super().__init__(parent)
+        self._search_index = search_index
+        self._search_text = ""
+        self._matching_ids: set[int] | None = None # None = sin búsqueda activa
+
+    def setSearchIndex(self, search_index: TextSearchIndex) -> None:
+        """Cambia el índice de búsqueda (p. ej. tras cargar otro archivo)."""
+        self._search_index = search_index
+        self._updateMatches()
+        self.invalidateFilter()
+
+    def setSourceModel(self, source_model) -> None:
+        """
+        Asigna el modelo fuente y repite la búsqueda cada vez que se reinicia
+        o se le añaden filas (carga progresiva: TaskModel.tasksAppended).
+        """
+        old_model = self.sourceModel()
+        if old_model is not None:
+            old_model.modelAboutToBeReset.disconnect(self._updateMatches)
+            old_model.rowsAboutToBeInserted.disconnect(self._onRowsAboutToBeInserted)
+        super().setSourceModel(source_model)
+        if source_model is not None:
+            # Antes de que el proxy vuelva a filtrar, el índice ya refleja los cambios
+            source_model.modelAboutToBeReset.connect(self._updateMatches)
+            source_model.rowsAboutToBeInserted.connect(self._onRowsAboutToBeInserted)
+
+    @Slot(str)
+    def setSearchText(self, text: str) -> None:
+        """Establece el texto a buscar (vacío para no filtrar por texto)."""
+        text = text.strip()
+        if text != self._search_text:
+            self._search_text = text
+            self._updateMatches()
+            self.invalidateFilter()
+
+    @Slot()
+    def _updateMatches(self) -> None:
+        """Vuelve a resolver la búsqueda con el índice."""
+        if self._search_text and self._search_index is not None:
+            self._matching_ids = self._search_index.search(self._search_text)
+        else:
+            self._matching_ids = None
+
+    @Slot(QModelIndex, int, int)
+    def _onRowsAboutToBeInserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        """Las filas nuevas ya están en el índice: hay que incluirlas en la búsqueda."""
+        self._updateMatches()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        """Acepta la fila si pasa el filtro de prioridad y la búsqueda de texto."""
+        if not super().filterAcceptsRow(source_row, source_parent):
+            return False
+        if self._matching_ids is None:
+            return True
+
+        source_model = self.sourceModel()
+        task = source_model.data(source_model.index(source_row, 0, source_parent), TaskModel.TaskObjectRole)
+        if not isinstance(task, Task):
+            return False
+        if task.task_id in self._matching_ids:
+            return True
+        # Las archivadas no están en el índice: se comprueban una a una
+        return task.task_id not in self._search_index and TextSearchIndex.matches(task, self._search_text)
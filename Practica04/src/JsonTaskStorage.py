@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de almacenamiento en archivos JSON (el formato original de la
+aplicación): un archivo con todas las tareas y otro con el contador de IDs.
+"""
+import os
+import json
+import threading
+
+from src.coreClasses.Task import Task
+from src.coreClasses.json_stream import iter_object
+from src.TaskStorage import TaskStorage
+from src.PendingTasks import PendingTasks
+from src.CompletedTasks import CompletedTasks
+from src.coreClasses.RecurrenceScheduler import RecurrenceScheduler
+from src.coreClasses.ChangeTracker import ChangeTracker
+
+class JsonTaskStorage(TaskStorage):
+    """
+    Guarda el estado completo en un archivo JSON, que se reescribe entero en
+    cada guardado, y el último ID usado en un segundo archivo JSON.
+    """
+    FORMAT_NAME = "JSON"
+    TASK_KEYS = ("pending_tasks", "completed_tasks")
+
+    def __init__(self, tasks_filepath: str, id_counter_filepath: str):
+        """Inicializa el motor con las rutas de los dos archivos."""
+        self.tasks_filepath = tasks_filepath
+        self.id_counter_filepath = id_counter_filepath
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def collect_data(pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                     recurrence: RecurrenceScheduler | None) -> dict:
+        """Copia el estado a guardar en diccionarios (estructura del archivo JSON)."""
+        # Crear listas de diccionarios usando el método to_dict de Task
+        # Iterar sobre los contenedores para obtener las tareas en su orden interno
+        data = {}
+        # Las completadas archivadas ya están en disco: solo se anota cuántos segmentos hay
+        # (antes que las tareas, para que la carga por lotes lo lea primero)
+        if completed_tasks.archive is not None:
+            data["archived_segments"] = completed_tasks.archive.segment_count()
+        data["pending_tasks"] = [task.to_dict() for task in pending_tasks.taskList()]
+        data["completed_tasks"] = [task.to_dict() for task in completed_tasks.taskList()]
+        if recurrence is not None:
+            data["recurring_series"] = [rule.to_dict() for rule in recurrence.ruleList()]
+        aging = pending_tasks.agingState()
+        if aging is not None:
+            data["pending_aging"] = aging
+        return data
+
+    @staticmethod
+    def _tasks_from_dicts(task_dicts: list, kind: str) -> list[Task]:
+        tasks = []
+        for task_dict in task_dicts:
+            try:
+                # Usar el método de clase Task.from_dict (necesita existir en Task)
+                tasks.append(Task.from_dict(task_dict))
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Advertencia: Error al procesar diccionario de tarea {kind}: {e} -> {task_dict}. Tarea ignorada.")
+        return tasks
+
+    def read(self) -> dict | None:
+        """Lee el archivo JSON completo y convierte las tareas a Task."""
+        if not os.path.exists(self.tasks_filepath):
+            return None
+        with open(self.tasks_filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f) # Cargar toda la estructura JSON
+        data["completed_tasks"] = self._tasks_from_dicts(data.get("completed_tasks", []), "completada")
+        data["pending_tasks"] = self._tasks_from_dicts(data.get("pending_tasks", []), "pendiente")
+        return data
+
+    def read_batches(self, batch_size: int):
+        """
+        Recorre el archivo JSON por bloques (ver json_stream.iter_object):
+        las listas de tareas se decodifican elemento a elemento y se entregan
+        en lotes de hasta 'batch_size' tareas, sin tener nunca el archivo
+        entero en memoria.
+        """
+        if not os.path.exists(self.tasks_filepath):
+            return None
+        return self._stream(batch_size)
+
+    def _stream(self, batch_size: int):
+        with open(self.tasks_filepath, 'r', encoding='utf-8') as f:
+            batch_key, batch = None, []
+            for key, value in iter_object(f, self.TASK_KEYS):
+                if batch and (key != batch_key or len(batch) >= batch_size):
+                    yield batch_key, batch
+                    batch = []
+                if key not in self.TASK_KEYS:
+                    yield key, value
+                    continue
+                batch_key = key
+                try:
+                    batch.append(Task.from_dict(value))
+                except (ValueError, KeyError, TypeError) as e:
+                    kind = "pendiente" if key == "pending_tasks" else "completada"
+                    print(f"Advertencia: Error al procesar diccionario de tarea {kind}: {e} -> {value}. Tarea ignorada.")
+            if batch:
+                yield batch_key, batch
+
+    def snapshot(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                 recurrence: RecurrenceScheduler | None = None, changes: ChangeTracker | None = None) -> dict:
+        """
+        Copia el estado con la estructura del archivo JSON, pero con cada
+        tarea como tupla (Task.to_tuple); los diccionarios se crean al escribir.
+        El archivo se reescribe entero: 'changes' no se usa.
+        """
+        return self.copy_state(pending_tasks, completed_tasks, recurrence)
+
+    def write_snapshot(self, snapshot: dict) -> int:
+        """Reescribe el archivo JSON (de forma atómica: puede ir en segundo plano)."""
+        data = dict(snapshot)
+        for key in self.TASK_KEYS:
+            data[key] = [Task.dict_from_tuple(values) for values in snapshot[key]]
+        # Usar indent=4 para que el archivo JSON sea legible por humanos
+        self.write_data(data, indent=4, atomic=True)
+        return sum(len(data[key]) for key in self.TASK_KEYS)
+
+    def write_data(self, data: dict, indent: int | None = 4, atomic: bool = False) -> None:
+        """
+        Escribe 'data' en el archivo de tareas.
+
+        Args:
+            indent: Sangría del JSON (None: sin sangría, json usa entonces su
+                    codificador en C).
+            atomic: Escribir en un archivo temporal, forzarlo a disco y
+                    renombrarlo, para no dejar nunca el archivo a medias.
+        """
+        # Crear directorios si no existen
+        os.makedirs(os.path.dirname(self.tasks_filepath) or '.', exist_ok=True)
+        path = self.tasks_filepath + ".tmp" if atomic else self.tasks_filepath
+        with self._write_lock: # Un guardado en segundo plano y otro en primer plano no se mezclan
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=indent, ensure_ascii=False)
+                if atomic:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if atomic:
+                os.replace(path, self.tasks_filepath)
+
+    def load_id_counter(self) -> int:
+        """Lee el último ID del archivo de contador (0 si no existe o no es válido)."""
+        if not os.path.exists(self.id_counter_filepath):
+            print("FileManager: Archivo de contador no encontrado, empezando desde 0.")
+            return 0
+        try:
+            with open(self.id_counter_filepath, 'r', encoding='utf-8') as f:
+                last_id = json.load(f)
+                if isinstance(last_id, int) and last_id >= 0:
+                    return last_id
+                else:
+                    print(f"Error: Contenido inválido en '{self.id_counter_filepath}'. Empezando desde 0.")
+                    return 0
+        except (IOError, json.JSONDecodeError, ValueError) as e:
+            print(f"Error al cargar el contador de ID desde '{self.id_counter_filepath}': {e}. Empezando desde 0.")
+            return 0
+
+    def save_id_counter(self, last_id: int) -> None:
+        os.makedirs(os.path.dirname(self.id_counter_filepath) or '.', exist_ok=True)
+        with self._write_lock, open(self.id_counter_filepath, 'w', encoding='utf-8') as f:
+            # Guardar como JSON simple
+            json.dump(last_id, f)
+
+    def __repr__(self) -> str:
+        return f"JsonTaskStorage('{self.tasks_filepath}', '{self.id_counter_filepath}')"
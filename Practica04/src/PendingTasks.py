@@ -3,37 +3,189 @@
 Módulo para gestionar la colección de tareas pendientes usando una cola.
 """
 # Importar Task refactorizada y CythonQueue renombrada como Queue
+from operator import attrgetter
 
-from src.coreClasses.Task import Task
-# Importar la cola optimizada con Cython
-from src.coreClasses.queue_cython import CythonQueue as Queue
+from src.coreClasses.Task import Task, TaskStatus
+from src.coreClasses.TaskStore import TaskStore
+from src.coreClasses.PriorityLanes import PriorityLanes
+from src.coreClasses.TaskIndex import TaskIndex
+from src.coreClasses.PriorityBuckets import PriorityBuckets
+from src.coreClasses.DependencyGraph import DependencyGraph
+# Importar la cola optimizada con Cython (variante indexada por task_id)
+from src.coreClasses.queue_cython import IndexedCythonQueue as Queue
 
 class PendingTasks:
     """
     Gestiona la colección de tareas pendientes utilizando una implementación
     de Cola (Queue) optimizada con Cython.
+
+    La cola está indexada por task_id, así que eliminar o editar una tarea
+    por su ID es O(1) amortizado en lugar de recorrer toda la cola.
+
+    Hay dos modos de planificación:
+        * SCHEDULING_FIFO (por defecto): completeTask sirve estrictamente por
+          orden de llegada.
+        * SCHEDULING_PRIORITY: un carril FIFO por prioridad (PriorityLanes);
+          se sirve primero la tarea más prioritaria y las que esperan suben
+          de nivel cada 'aging_interval' tareas servidas.
+
+    Opcionalmente puede usar un TaskStore como almacenamiento: la cola guarda
+    entonces vistas TaskRow y las ediciones masivas de prioridad se
+    resuelven con pasadas vectorizadas sobre las columnas.
+
+    Además mantiene las tareas agrupadas por prioridad (PriorityBuckets), así
+    que countTasks/count_by_priority son O(1) y filterTasks/tasks_with_priority
+    son O(k) sin recorrer la cola.
+
+    Las dependencias entre tareas (Task.depends_on) se guardan en un
+    DependencyGraph: la cola solo contiene las tareas listas, y las que
+    esperan a otra tarea pendiente aguardan fuera de ella (en '_blocked').
+    completeTask sirve siempre una tarea lista, y al completar o eliminar
+    una tarea solo se revisan sus dependientes directos, que entran al
+    final de la cola cuando no les queda ninguna dependencia pendiente.
     """
-    def __init__(self):
-        """Inicializa el contenedor de tareas pendientes con una cola vacía."""
-        self.tasks: Queue[Task] = Queue() # Usar la CythonQueue importada
+    SCHEDULING_FIFO = "fifo"
+    SCHEDULING_PRIORITY = "priority"
+
+    def __init__(self, store: TaskStore | None = None, scheduling: str = SCHEDULING_FIFO,
+                 aging_interval: int = 10, index: TaskIndex | None = None):
+        """
+        Inicializa el contenedor de tareas pendientes con una cola vacía.
+
+        Args:
+            store: Almacén columnar opcional (puede compartirse con CompletedTasks).
+            scheduling: Modo de planificación (SCHEDULING_FIFO o SCHEDULING_PRIORITY).
+            aging_interval: Tareas servidas tras las que una tarea en espera sube
+                            un nivel de prioridad (solo en SCHEDULING_PRIORITY).
+            index: Índice global de tareas por ID (compartido con CompletedTasks).
+                   Si no se indica se crea uno propio.
+        """
+        if scheduling == self.SCHEDULING_FIFO:
+            self.tasks: Queue[Task] = Queue(key=attrgetter("task_id")) # Cola indexada por ID
+        elif scheduling == self.SCHEDULING_PRIORITY:
+            self.tasks = PriorityLanes(aging_interval=aging_interval)
+        else:
+            raise ValueError(f"Modo de planificación '{scheduling}' no reconocido.")
+        self.scheduling = scheduling
+        self.store = store
+        self.buckets = PriorityBuckets()
+        self.dependencies = DependencyGraph()
+        self._blocked: dict[int, Task] = {} # Tareas con dependencias pendientes (fuera de la cola)
+        self.index = index if index is not None else TaskIndex()
+        self.index.attach(TaskIndex.PENDING, self)
+
+    def _schedule(self, task: Task) -> bool:
+        """
+        Registra las dependencias aún pendientes de una tarea y, si le falta
+        alguna, la aparta entre las bloqueadas. Devuelve True si la tarea está
+        lista (quien llama la encola).
+        """
+        unmet = [prerequisite for prerequisite in task.depends_on if prerequisite in self.buckets]
+        try:
+            ready = self.dependencies.set_prerequisites(task.task_id, unmet)
+        except ValueError as e:
+            print(f"Error (PendingTasks): {e} Se ignoran sus dependencias.")
+            ready = self.dependencies.set_prerequisites(task.task_id, ())
+        if not ready:
+            self._blocked[task.task_id] = task
+        return ready
+
+    def _unblockDependents(self, task_id: int) -> None:
+        """Encola los dependientes de una tarea que sale de pendientes y quedan listos."""
+        for ready_id in self.dependencies.resolve(task_id):
+            self.tasks.enqueue(self._blocked.pop(ready_id))
+
+    def _get(self, task_id: int) -> Task | None:
+        """Busca una tarea pendiente (lista o bloqueada) por su ID, en O(1)."""
+        task = self.tasks.get(task_id)
+        return task if task is not None else self._blocked.get(task_id)
 
     def addTask(self, item: Task) -> None:
-        """Añade una nueva tarea pendiente a la cola."""
+        """
+        Añade una nueva tarea pendiente: al final de la cola si está lista, o
+        entre las bloqueadas si depende de alguna tarea todavía pendiente.
+        """
         task=Task(101,'Title','desc','Pendiente',1)
         if isinstance(item, Task):
-            self.tasks.enqueue(item)
+            if item.task_id in self.buckets:
+                print(f"Error (PendingTasks.addTask): Ya hay una tarea pendiente con ID {item.task_id}.")
+                return
+            if self.store is not None:
+                item = self.store.add(item) # Guardar la vista de la fila
+            if self._schedule(item):
+                self.tasks.enqueue(item)
+            self.buckets.add(item)
+            self.index.register(item, TaskIndex.PENDING)
         else:
             print(f"Error (PendingTasks.addTask): Se intentó añadir un objeto que no es Task. El objeto es de tipo {type(item)} y se esperaba uno de tipo {type(task)}")
 
+    def addTasks(self, items) -> int:
+        """
+        Añade varias tareas pendientes de una vez, en orden.
+        La cola reserva capacidad una sola vez y copia todas las listas en un
+        bucle C. Una tarea puede depender de otra que aparece más adelante en
+        el mismo lote (como al cargar un archivo).
+
+        Returns:
+            El número de tareas añadidas (los objetos que no son Task y los
+            IDs repetidos se ignoran).
+        """
+        valid_tasks = []
+        seen_ids = set()
+        for item in items:
+            if isinstance(item, Task):
+                if item.task_id in seen_ids or item.task_id in self.buckets:
+                    print(f"Error (PendingTasks.addTasks): Se ignoró la tarea con ID repetido {item.task_id}.")
+                    continue
+                seen_ids.add(item.task_id)
+                valid_tasks.append(self.store.add(item) if self.store is not None else item)
+            else:
+                print(f"Error (PendingTasks.addTasks): Se ignoró un objeto de tipo {type(item)} que no es Task.")
+        # Contar primero todo el lote, para que las dependencias hacia delante cuenten como pendientes
+        self.buckets.add_many(valid_tasks)
+        ready_tasks = [task for task in valid_tasks if not task.depends_on or self._schedule(task)]
+        self.tasks.extend_from_list(ready_tasks)
+        for task in valid_tasks:
+            self.index.register(task, TaskIndex.PENDING)
+        return len(valid_tasks)
+
+    def recheckDependencies(self, task_ids) -> None:
+        """
+        Vuelve a calcular las dependencias pendientes de tareas ya añadidas.
+        Al cargar por lotes, una tarea puede depender de otra que llega en un
+        lote posterior: addTasks la dio por lista y aquí se aparta entre las
+        bloqueadas (sin cambiar el orden del resto de la cola).
+        """
+        for task_id in task_ids:
+            task = self._get(task_id)
+            if task is None:
+                continue
+            unmet = [prerequisite for prerequisite in task.depends_on if prerequisite in self.buckets]
+            try:
+                ready = self.dependencies.set_prerequisites(task_id, unmet)
+            except ValueError as e:
+                print(f"Error (PendingTasks): {e} Se ignoran sus dependencias.")
+                ready = self.dependencies.set_prerequisites(task_id, ())
+            if ready and task_id in self._blocked:
+                self.tasks.enqueue(self._blocked.pop(task_id))
+            elif not ready and task_id not in self._blocked:
+                self.tasks.remove(task_id)
+                self._blocked[task_id] = task
+
     def completeTask(self) -> Task | None:
         """
-        Extrae la siguiente tarea pendiente de la cola (FIFO),
-        marca su estado como completado y la devuelve.
-        Devuelve None si la cola está vacía.
+        Extrae la siguiente tarea lista de la cola (según el modo de
+        planificación), marca su estado como completado y la devuelve.
+        Las tareas que solo esperaban a ella pasan al final de la cola.
+        Devuelve None si no hay ninguna tarea lista.
         """
         if not self.tasks.isEmpty():
             try:
                 completedTask = self.tasks.dequeue()
+                # Sale del índice hasta que CompletedTasks la registre
+                self.index.unregister(completedTask.task_id)
+                self.buckets.discard(completedTask.task_id)
+                self._unblockDependents(completedTask.task_id)
                 # Usar la constante definida en Task (si existe)
                 completedTask.changeStatus(Task.STATUS_COMPLETED)
                 return completedTask
@@ -43,10 +195,46 @@ class PendingTasks:
                 return None
         return None # La cola está vacía
 
+    def completeTasks(self, count: int) -> list[Task]:
+        """
+        Extrae hasta 'count' tareas listas de una vez (según el modo de
+        planificación), las marca como completadas y las devuelve en orden.
+        Las tareas que se desbloquean por el camino también pueden salir.
+        """
+        completedTasks = []
+        while len(completedTasks) < count and not self.tasks.isEmpty():
+            batch = self.tasks.dequeue_many(count - len(completedTasks))
+            for task in batch:
+                self.index.unregister(task.task_id)
+                self.buckets.discard(task.task_id)
+                if self._blocked:
+                    self._unblockDependents(task.task_id)
+                task.changeStatus(Task.STATUS_COMPLETED)
+            completedTasks.extend(batch)
+        return completedTasks
+
+    def completeTaskById(self, task_id: int) -> Task | None:
+        """
+        Completa una tarea pendiente concreta aunque no sea la siguiente de
+        la cola (ni esté lista). La usa la reproducción del diario de cambios.
+        Devuelve la tarea completada, o None si no estaba pendiente.
+        """
+        task = self._get(task_id)
+        if task is None:
+            return None
+        if self._blocked.pop(task_id, None) is None:
+            self.tasks.remove(task_id)
+        self.index.unregister(task_id)
+        self.buckets.discard(task_id)
+        self._unblockDependents(task_id)
+        task.changeStatus(Task.STATUS_COMPLETED)
+        return task
+
     def removeTask(self, task_to_remove: Task) -> bool:
         """
         Elimina una tarea específica de la cola.
-        Esta operación es O(n) porque requiere reconstruir la cola interna.
+        Es O(1) amortizado: la cola deja una lápida en su lugar y se compacta
+        sola cuando acumula demasiadas.
 
         Args:
             task_to_remove: La instancia de la tarea a eliminar (se usa su task_id).
@@ -57,72 +245,191 @@ class PendingTasks:
         if not isinstance(task_to_remove, Task):
             return False
 
-        found = False
-        # Obtener todos los items actuales
-        current_items = self.tasks.get_items_list()
-        # Crear una nueva cola temporal (o limpiar la actual y re-llenar)
-        new_queue = Queue()
-        for task in current_items:
-            # Comparar por ID (asumiendo que Task implementa __eq__ basado en task_id)
-            if task == task_to_remove: # O usar task.task_id == task_to_remove.task_id
-                found = True
-            else:
-                # Añadir solo las tareas que NO son la que queremos eliminar
-                new_queue.enqueue(task)
-
-        # Reemplazar la cola antigua con la nueva
-        self.tasks = new_queue
-        return found
+        task_id = task_to_remove.task_id
+        if task_id not in self.buckets:
+            return False
+        if self._blocked.pop(task_id, None) is None:
+            self.tasks.remove(task_id)
+        self.index.unregister(task_id)
+        self.buckets.discard(task_id)
+        if self.store is not None:
+            self.store.remove(task_id)
+        # Eliminada deja de bloquear, igual que si se hubiera completado
+        self._unblockDependents(task_id)
+        return True
 
     def editTask(self, task_id: int, attribute: str, newValue) -> bool:
         """
         Edita un atributo específico de una tarea pendiente, buscándola por su ID.
-        Esta operación es O(n) porque puede requerir iterar la cola.
+        La búsqueda es O(1) gracias al índice de la cola.
 
         Args:
             task_id: El ID numérico de la tarea a editar.
-            attribute: El nombre del atributo a cambiar ("title", "description", "priority").
+            attribute: El nombre del atributo a cambiar ("title", "description",
+                       "priority", "due_at", "depends_on").
             newValue: El nuevo valor para el atributo.
 
         Returns:
-            True si la tarea fue encontrada y editada, False en caso contrario.
-        """
-        edited = False
-
-        # Iteramos directamente sobre la cola (asumiendo que CythonQueue soporta __iter__)
-        for task in self.tasks:
-            if task.task_id == task_id:
-                try:
-                    match attribute:
-                        case "title":
-                            task.editTitle(str(newValue)) # Asegurar tipo
-                            edited = True
-                        case "description":
-                            task.editDescription(str(newValue)) # Asegurar tipo
-                            edited = True
-                        case "priority":
-                            task.editPriority(int(newValue)) # Asegurar tipo
-                            edited = True
-                        case _:
-                            print(f"Advertencia (PendingTasks.editTask): Atributo '{attribute}' no editable.")
-                            return False # Atributo no válido
-                    # Si encontramos y editamos, podemos salir del bucle
-                    break
-                except (ValueError, TypeError) as e:
-                     print(f"Error (PendingTasks.editTask): Valor inválido '{newValue}' para atributo '{attribute}': {e}")
-                     return False # Error en la conversión de tipo o valor
+            True si la tarea fue encontrada y editada, False en caso contrario
+            (también si las nuevas dependencias crearían un ciclo).
+        """
+        task = self._get(task_id)
+        if task is None:
+            return False
+        try:
+            match attribute:
+                case "title":
+                    task.editTitle(str(newValue)) # Asegurar tipo
+                case "description":
+                    task.editDescription(str(newValue)) # Asegurar tipo
+                case "priority":
+                    task.editPriority(int(newValue)) # Asegurar tipo
+                    self.buckets.update(task) # Cambiar de cubo
+                    if self.scheduling == self.SCHEDULING_PRIORITY and task_id not in self._blocked:
+                        self.tasks.reprioritize(task_id) # Cambiar de carril
+                case "due_at":
+                    # None quita la fecha límite
+                    task.editDueDate(None if newValue is None else float(newValue))
+                case "depends_on":
+                    self._editDependencies(task, newValue)
+                case _:
+                    print(f"Advertencia (PendingTasks.editTask): Atributo '{attribute}' no editable.")
+                    return False # Atributo no válido
+        except (ValueError, TypeError) as e:
+             print(f"Error (PendingTasks.editTask): Valor inválido '{newValue}' para atributo '{attribute}': {e}")
+             return False # Error en la conversión de tipo o valor
+        return True
+
+    def _editDependencies(self, task: Task, newDependsOn) -> None:
+        """
+        Cambia las dependencias de una tarea pendiente y la mueve entre la
+        cola y las bloqueadas si hace falta.
+
+        Raises:
+            ValueError: Si algún ID no es válido o se crearía un ciclo (la
+                        tarea no se modifica).
+        """
+        task_id = task.task_id
+        newDependsOn = Task._check_dependencies(task_id, [int(dependency_id) for dependency_id in newDependsOn])
+        unmet = [prerequisite for prerequisite in newDependsOn if prerequisite in self.buckets]
+        ready = self.dependencies.set_prerequisites(task_id, unmet) # Comprueba ciclos antes de cambiar nada
+        task.editDependencies(newDependsOn)
+        if ready and task_id in self._blocked:
+            self.tasks.enqueue(self._blocked.pop(task_id)) # Queda lista: al final de la cola
+        elif not ready and task_id not in self._blocked:
+            self.tasks.remove(task_id)
+            self._blocked[task_id] = task
+
+    def isBlocked(self, task_id: int) -> bool:
+        """Indica si la tarea pendiente espera a que se complete otra."""
+        return task_id in self._blocked
+
+    def blockedBy(self, task_id: int) -> frozenset[int]:
+        """IDs de las tareas pendientes a las que espera la tarea."""
+        return self.dependencies.blocked_by(task_id)
+
+    def blockedTasks(self) -> list[Task]:
+        """Tareas pendientes que esperan a otra, en el orden en que se bloquearon."""
+        return list(self._blocked.values())
+
+    def readyCount(self) -> int:
+        """Número de tareas listas para completarse (las de la cola)."""
+        return self.tasks.size()
+
+    def countTasks(self, priority: int | None = None) -> int:
+        """Cuenta las tareas pendientes, opcionalmente solo las de una prioridad, en O(1)."""
+        return self.buckets.count(priority)
+
+    def count_by_priority(self) -> dict[int, int]:
+        """Devuelve {prioridad: número de tareas pendientes} sin recorrer la cola."""
+        return self.buckets.counts()
+
+    def tasks_with_priority(self, priority: int) -> list[Task]:
+        """
+        Devuelve las tareas pendientes con la prioridad indicada, en O(k), en
+        el orden en que llegaron a esa prioridad.
+        """
+        return self.buckets.tasks(priority)
 
+    def filterTasks(self, priority: int) -> list[Task]:
+        """Devuelve las tareas pendientes con la prioridad indicada."""
+        return self.tasks_with_priority(priority)
+
+    def bulkEditPriority(self, newPriority: int, currentPriority: int | None = None) -> int:
+        """
+        Cambia la prioridad de todas las tareas pendientes (o solo de las que
+        tienen 'currentPriority').
+
+        Returns:
+            El número de tareas modificadas.
+        """
+        if self.store is not None:
+            # La columna se cambia de una pasada, sin Task.editPriority: se avisa al índice
+            # (diario, autoguardado...) de cada tarea editada, como haría editPriority
+            edited_tasks = self.store.select(TaskStatus.PENDING, currentPriority) if self.index.has_listeners() else []
+            old_priorities = [task.priority for task in edited_tasks]
+            edited = self.store.set_priority(newPriority, TaskStatus.PENDING, currentPriority)
+            for task, old_priority in zip(edited_tasks, old_priorities):
+                self.index.task_edited(task, "priority", old_priority)
+        else:
+            if newPriority not in Task.VALID_PRIORITIES:
+                raise ValueError(f"Prioridad '{newPriority}' no reconocida.")
+            edited = 0
+            for task in self.taskList():
+                if currentPriority is None or task.priority == currentPriority:
+                    task.editPriority(newPriority)
+                    edited += 1
+        if edited:
+            self.buckets.relabel(newPriority, currentPriority)
+        if edited and self.scheduling == self.SCHEDULING_PRIORITY:
+            self.tasks.rebalance() # Recolocar las tareas en su nuevo carril
         return edited
 
+    def agingState(self) -> dict | None:
+        """
+        Devuelve el estado del envejecimiento de la cola para guardarlo (ver
+        PriorityLanes.aging_state), o None en SCHEDULING_FIFO (no tiene).
+        """
+        if self.scheduling == self.SCHEDULING_PRIORITY:
+            return self.tasks.aging_state()
+        return None
+
+    def restoreAging(self, state: dict) -> None:
+        """
+        Restaura el envejecimiento guardado con agingState tras cargar las
+        tareas, para que se sigan sirviendo en el mismo orden. En
+        SCHEDULING_FIFO no hace nada.
+
+        Raises:
+            ValueError, TypeError, KeyError: Si 'state' no tiene el formato esperado.
+        """
+        if self.scheduling == self.SCHEDULING_PRIORITY:
+            self.tasks.restore_aging(state)
+
     def taskList(self) -> list[Task]:
         """
-        Devuelve la lista de tareas pendientes en su orden actual FIFO (First-In, First-Out).
+        Devuelve la lista de tareas pendientes en el orden en que se servirían
+        (FIFO, o por prioridad y antigüedad en SCHEDULING_PRIORITY).
         La ordenación para visualización (ej. por prioridad) debe hacerse
         en la capa de Modelo/Vista (ej. usando QSortFilterProxyModel).
         """
         # Devuelve una copia de la lista interna de la cola
+        if self._blocked:
+            # Las bloqueadas van detrás: no se servirán hasta que queden listas
+            return self.tasks.get_items_list() + list(self._blocked.values())
         return self.tasks.get_items_list()
 
+    def taskView(self):
+        """
+        Devuelve una vista de solo lectura de la cola (mismo orden que
+        taskList) que no copia las tareas, o None si el modo de planificación
+        no permite acceso por posición (SCHEDULING_PRIORITY) o si hay tareas
+        bloqueadas (no están en la cola).
+        """
+        if self.scheduling == self.SCHEDULING_FIFO and not self._blocked:
+            return self.tasks.view()
+        return None
+
     def __len__(self) -> int:
-        return self.tasks.size()
+        return self.tasks.size() + len(self._blocked)
 
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de almacenamiento en una base de datos SQLite local.
+
+Cada tarea es una fila de la tabla 'tasks' (con índices por estado y
+prioridad; task_id es la clave primaria) y los demás datos (contador de
+IDs, segmentos archivados, series recurrentes, envejecimiento de la cola por
+prioridad) van en la tabla 'meta'.
+
+Al guardar solo se escriben las filas que cambiaron desde la última lectura
+o escritura, en una transacción con executemany. La base de datos usa el
+modo WAL, así que una escritura no bloquea las lecturas.
+"""
+import os
+import json
+import sqlite3
+import threading
+
+from src.coreClasses.Task import Task, TaskStatus
+from src.TaskStorage import TaskStorage
+from src.PendingTasks import PendingTasks
+from src.CompletedTasks import CompletedTasks
+from src.coreClasses.RecurrenceScheduler import RecurrenceScheduler
+from src.coreClasses.TaskIndex import TaskIndex
+from src.coreClasses.ChangeTracker import ChangeTracker
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id     INTEGER PRIMARY KEY,
+    status      INTEGER NOT NULL,
+    seq         INTEGER NOT NULL,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority    INTEGER NOT NULL,
+    created_at  REAL,
+    due_at      REAL,
+    depends_on  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_seq ON tasks (status, seq);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_COLUMNS = "task_id, status, seq, title, description, priority, created_at, due_at, depends_on"
+_UPSERT_TASK = f"INSERT OR REPLACE INTO tasks ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_DELETE_TASK = "DELETE FROM tasks WHERE task_id = ?"
+_SELECT_ALL_TASKS = f"SELECT {_COLUMNS} FROM tasks"
+_SELECT_TASKS = f"SELECT {_COLUMNS} FROM tasks WHERE status = ? ORDER BY seq" # Usa idx_tasks_status_seq (+ ASC/DESC)
+_UPSERT_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+class SqliteTaskStorage(TaskStorage):
+    """
+    Motor SQLite con escritura de solo las filas modificadas.
+
+    Guarda en memoria la última fila escrita (o leída) de cada tarea; al
+    guardar compara con las filas actuales y solo inserta/reemplaza las que
+    difieren y borra las que ya no existen. Con los cambios anotados desde
+    el último guardado (ChangeTracker) ni siquiera se copian las tareas que
+    no cambiaron: se parte de su fila en memoria.
+
+    El orden de la cola y de la pila se guarda en 'seq' (creciente en el
+    orden de la cola y en el de apilado). Se reutiliza el seq anterior de
+    cada tarea mientras el orden siga siendo creciente, de modo que
+    completar la primera tarea o añadir una al final no renumera las demás.
+    """
+    FORMAT_NAME = "SQLite"
+    SUPPORTS_DELTA = True
+
+    def __init__(self, db_path: str):
+        """Prepara el motor; la base de datos se abre (o crea) al usarla por primera vez."""
+        self.db_path = db_path
+        self._connection: sqlite3.Connection | None = None
+        # La conexión puede usarse desde un hilo de guardado: se serializa con un cerrojo
+        self._lock = threading.Lock()
+        self._rows: dict[int, tuple] | None = None # task_id -> última fila escrita (None: sin leer)
+        self._meta: dict[str, str] = {}
+        self._last_seq = 0
+        self.last_write_count = 0 # Filas escritas o borradas en el último guardado
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Conexión abierta (la abre si hace falta). Usar con el cerrojo tomado."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL") # Seguro con WAL: solo se arriesga el último commit
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    # --- Filas ---
+
+    @staticmethod
+    def _row(values: tuple, seq: int) -> tuple:
+        """Fila a partir de una tupla de Task.to_tuple y su seq."""
+        task_id, title, description, status_code, priority, created_at, due_at, depends_on = values
+        return (task_id, int(status_code), seq, title, description, int(priority),
+                created_at, due_at, json.dumps(depends_on) if depends_on else None)
+
+    @staticmethod
+    def _task(row: tuple) -> Task:
+        task_id, status, _, title, description, priority, created_at, due_at, depends_on = row
+        return Task(task_id, title, description, TaskStatus(status), priority, created_at, due_at,
+                    json.loads(depends_on) if depends_on else ())
+
+    def _load_rows(self) -> None:
+        """Lee en memoria las filas y los metadatos guardados."""
+        rows = {row[0]: row for row in self.connection.execute(_SELECT_ALL_TASKS)}
+        self._rows = rows
+        self._last_seq = max((row[2] for row in rows.values()), default=0)
+        self._meta = dict(self.connection.execute("SELECT key, value FROM meta"))
+
+    # --- TaskStorage ---
+
+    def read(self) -> dict | None:
+        """Lee las tareas de cada estado en orden."""
+        with self._lock:
+            self._load_rows()
+            if not self._rows and not self._meta:
+                return None
+            data = {"pending_tasks": [], "completed_tasks": []}
+            for key, status in (("pending_tasks", TaskStatus.PENDING), ("completed_tasks", TaskStatus.COMPLETED)):
+                for row in self.connection.execute(f"{_SELECT_TASKS} ASC", (int(status),)):
+                    try:
+                        data[key].append(self._task(row))
+                    except (ValueError, TypeError) as e:
+                        print(f"Advertencia: Fila de tarea no válida: {e} -> {row}. Tarea ignorada.")
+        data["completed_tasks"].reverse() # seq crece al apilar: la más reciente va primero
+        if "archived_segments" in self._meta:
+            data["archived_segments"] = int(self._meta["archived_segments"])
+        if "recurring_series" in self._meta:
+            data["recurring_series"] = json.loads(self._meta["recurring_series"])
+        aging = json.loads(self._meta.get("pending_aging", "null"))
+        if aging is not None:
+            data["pending_aging"] = aging
+        return data
+
+    def read_batches(self, batch_size: int):
+        """
+        Lee las tareas de cada estado por lotes de 'batch_size' filas
+        (fetchmany sobre el índice por estado y seq).
+        """
+        with self._lock:
+            self._meta = dict(self.connection.execute("SELECT key, value FROM meta"))
+            empty = self.connection.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+        if empty and not self._meta:
+            return None
+        return self._stream(batch_size)
+
+    def _stream(self, batch_size: int):
+        if "archived_segments" in self._meta:
+            yield "archived_segments", int(self._meta["archived_segments"])
+        self._rows = None # Si se guarda a mitad de la lectura, se releen todas las filas
+        rows = {}
+        for key, status, order in (("pending_tasks", TaskStatus.PENDING, "ASC"),
+                                   ("completed_tasks", TaskStatus.COMPLETED, "DESC")):
+            # Completadas de la más reciente a la más antigua, como en read()
+            with self._lock:
+                cursor = self.connection.execute(f"{_SELECT_TASKS} {order}", (int(status),))
+            while True:
+                with self._lock:
+                    fetched = cursor.fetchmany(batch_size)
+                if not fetched:
+                    break
+                batch = []
+                for row in fetched:
+                    rows[row[0]] = row
+                    try:
+                        batch.append(self._task(row))
+                    except (ValueError, TypeError) as e:
+                        print(f"Advertencia: Fila de tarea no válida: {e} -> {row}. Tarea ignorada.")
+                yield key, batch
+        with self._lock:
+            if self._rows is None:
+                self._rows = rows
+                self._last_seq = max((row[2] for row in rows.values()), default=0)
+        if "recurring_series" in self._meta:
+            yield "recurring_series", json.loads(self._meta["recurring_series"])
+        aging = json.loads(self._meta.get("pending_aging", "null"))
+        if aging is not None:
+            yield "pending_aging", aging
+
+    def _ordered_rows(self, tasks, rows: dict, new_rows: dict) -> None:
+        """
+        Calcula las filas de 'tasks' (en orden) reutilizando su seq anterior
+        si se puede. Cada elemento es una tupla de Task.to_tuple, o solo el
+        task_id si la tarea no cambió (se parte de su fila anterior).
+        """
+        previous_seq = -1
+        for values in tasks:
+            if type(values) is int:
+                old = rows.get(values)
+                if old is None:
+                    raise ValueError(f"No hay fila guardada para la tarea {values} sin cambios.")
+                task_id = values
+            else:
+                task_id = values[0]
+                old = rows.get(task_id)
+            if old is not None and old[2] > previous_seq:
+                seq = old[2]
+            else:
+                self._last_seq += 1
+                seq = self._last_seq
+            if type(values) is int:
+                new_rows[task_id] = old if old[2] == seq else old[:2] + (seq,) + old[3:]
+            else:
+                new_rows[task_id] = self._row(values, seq)
+            previous_seq = seq
+
+    def snapshot(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                 recurrence: RecurrenceScheduler | None = None, changes: ChangeTracker | None = None) -> tuple:
+        """
+        Copia cada tarea en una tupla (Task.to_tuple; la pila, en orden de
+        apilado) y los metadatos. Con 'changes', de las tareas que no
+        cambiaron solo se copia el task_id (hace falta para el orden).
+        """
+        meta = {}
+        if completed_tasks.archive is not None:
+            meta["archived_segments"] = str(completed_tasks.archive.segment_count())
+        if recurrence is not None:
+            meta["recurring_series"] = json.dumps([rule.to_dict() for rule in recurrence.ruleList()],
+                                                  ensure_ascii=False)
+        # También sin planificación por prioridad ("null"), para no dejar uno anterior
+        meta["pending_aging"] = json.dumps(pending_tasks.agingState())
+        if changes is None:
+            return ([task.to_tuple() for task in pending_tasks.taskList()],
+                    [task.to_tuple() for task in reversed(completed_tasks.taskList())],
+                    meta, None)
+        is_dirty = changes.is_dirty
+        return ([task.to_tuple() if is_dirty(task, TaskIndex.PENDING) else task.task_id
+                 for task in pending_tasks.taskList()],
+                [task.to_tuple() if is_dirty(task, TaskIndex.COMPLETED) else task.task_id
+                 for task in reversed(completed_tasks.taskList())],
+                meta, list(changes.removed))
+
+    def write_snapshot(self, snapshot: tuple) -> int:
+        """
+        Escribe en una transacción solo las filas y metadatos que cambiaron.
+        Si la copia solo trae las tareas cambiadas, las bajas son las de
+        'changes.removed' en lugar de compararlo todo con lo guardado.
+        """
+        pending, completed, meta, removed = snapshot
+        with self._lock:
+            if self._rows is None:
+                self._load_rows() # Para saber qué hay ya en la base de datos
+            rows = self._rows
+            new_rows: dict[int, tuple] = {}
+            self._ordered_rows(pending, rows, new_rows)
+            self._ordered_rows(completed, rows, new_rows)
+
+            changed = [row for task_id, row in new_rows.items() if rows.get(task_id) != row]
+            if removed is None:
+                deleted = [(task_id,) for task_id in rows.keys() - new_rows.keys()]
+            else:
+                deleted = [(task_id,) for task_id in removed if task_id in rows and task_id not in new_rows]
+            meta_changed = [(key, value) for key, value in meta.items() if self._meta.get(key) != value]
+
+            with self.connection: # Transacción: commit al salir, rollback si hay error
+                if deleted:
+                    self.connection.executemany(_DELETE_TASK, deleted)
+                if changed:
+                    self.connection.executemany(_UPSERT_TASK, changed)
+                if meta_changed:
+                    self.connection.executemany(_UPSERT_META, meta_changed)
+            self._rows = new_rows
+            self._meta.update(meta_changed)
+            self.last_write_count = len(changed) + len(deleted)
+            return self.last_write_count
+
+    def load_id_counter(self) -> int:
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'id_counter'").fetchone()
+        return int(row[0]) if row else 0
+
+    def save_id_counter(self, last_id: int) -> None:
+        with self._lock, self.connection:
+            self.connection.execute(_UPSERT_META, ("id_counter", str(last_id)))
+        self._meta["id_counter"] = str(last_id)
+
+    def close(self) -> None:
+        """Cierra la conexión (se vuelve a abrir si se sigue usando el motor)."""
+        with self._lock:
+            if self._connection is not None:
+                self.connection.close()
+                self._connection = None
+                self._rows = None # Otro proceso puede cambiar la base de datos mientras tanto
+
+    def __repr__(self) -> str:
+        return f"SqliteTaskStorage('{self.db_path}')"
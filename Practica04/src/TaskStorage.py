@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Interfaz de los motores de almacenamiento que usa FileManager.
+"""
+from src.PendingTasks import PendingTasks
+from src.CompletedTasks import CompletedTasks
+from src.coreClasses.RecurrenceScheduler import RecurrenceScheduler
+from src.coreClasses.ChangeTracker import ChangeTracker
+
+class TaskStorage:
+    """
+    Motor de almacenamiento de tareas. FileManager construye los
+    contenedores y les pasa lo que lee el motor; cada motor decide cómo lo
+    guarda en disco.
+
+    read() devuelve None si no hay nada guardado, o un diccionario con:
+        "pending_tasks": list[Task] en el orden de la cola.
+        "completed_tasks": list[Task] de la más reciente a la más antigua.
+        "archived_segments": int (opcional) segmentos de TaskArchive válidos.
+        "recurring_series": list[dict] (opcional) reglas de RecurrenceRule.
+        "pending_aging": dict (opcional) envejecimiento de la cola por
+                         prioridad (PendingTasks.agingState).
+    (un motor puede añadir claves propias).
+
+    Los errores de lectura o escritura se propagan como excepciones;
+    FileManager los informa y mantiene su contrato (contenedores vacíos al
+    cargar, False al guardar).
+    """
+    FORMAT_NAME = "?" # Nombre del formato para los mensajes
+    SUPPORTS_DELTA = False # Puede escribir solo las tareas que cambiaron (ver snapshot)
+
+    def read(self) -> dict | None:
+        """Lee todo el estado guardado."""
+        raise NotImplementedError
+
+    def read_batches(self, batch_size: int):
+        """
+        Lee el estado guardado por partes, para cargarlo de forma progresiva.
+
+        Returns:
+            None si no hay nada guardado, o un iterador de pares (clave, valor)
+            con las mismas claves que read(): "pending_tasks" y
+            "completed_tasks" se repiten con lotes de hasta 'batch_size'
+            tareas (en el mismo orden que read()) y el resto de claves
+            aparecen una vez con su valor completo.
+        """
+        # Por defecto se lee todo y se trocea (los motores pueden hacerlo mejor)
+        data = self.read()
+        if data is None:
+            return None
+        return self._batches_of(data, batch_size)
+
+    @staticmethod
+    def _batches_of(data: dict, batch_size: int):
+        for key, value in data.items():
+            if key in ("pending_tasks", "completed_tasks"):
+                for start in range(0, len(value), batch_size):
+                    yield key, value[start:start + batch_size]
+            else:
+                yield key, value
+
+    def write(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+              recurrence: RecurrenceScheduler | None = None) -> int:
+        """Guarda el estado de los contenedores (y las series, si se indican)."""
+        return self.write_snapshot(self.snapshot(pending_tasks, completed_tasks, recurrence))
+
+    def snapshot(self, pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                 recurrence: RecurrenceScheduler | None = None, changes: ChangeTracker | None = None):
+        """
+        Copia lo que hay que guardar en objetos que no comparte con los
+        contenedores (diccionarios, tuplas), para escribirlo después con
+        write_snapshot desde otro hilo mientras la GUI sigue editando.
+
+        Con 'changes' (cambios desde el último guardado con este motor), un
+        motor con SUPPORTS_DELTA solo copia y escribe las tareas que
+        cambiaron; el resto lo ignora y lo copia todo.
+        """
+        raise NotImplementedError
+
+    def write_snapshot(self, snapshot) -> int:
+        """
+        Escribe una copia hecha con snapshot(). Se puede llamar desde un hilo
+        de trabajo. Devuelve cuántos registros (tareas) escribió o borró.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def copy_state(pending_tasks: PendingTasks, completed_tasks: CompletedTasks,
+                   recurrence: RecurrenceScheduler | None) -> dict:
+        """
+        Copia el estado con las claves de read(), pero con cada tarea como
+        tupla (Task.to_tuple): la snapshot() de los motores que reescriben
+        el archivo entero.
+        """
+        data = {}
+        # Las completadas archivadas ya están en disco: solo se anota cuántos segmentos hay
+        # (antes que las tareas, para que la carga por lotes lo lea primero)
+        if completed_tasks.archive is not None:
+            data["archived_segments"] = completed_tasks.archive.segment_count()
+        data["pending_tasks"] = [task.to_tuple() for task in pending_tasks.taskList()]
+        data["completed_tasks"] = [task.to_tuple() for task in completed_tasks.taskList()]
+        if recurrence is not None:
+            data["recurring_series"] = [rule.to_dict() for rule in recurrence.ruleList()]
+        aging = pending_tasks.agingState()
+        if aging is not None:
+            data["pending_aging"] = aging
+        return data
+
+    def load_id_counter(self) -> int:
+        """Devuelve el último ID de tarea usado (0 si no hay ninguno guardado)."""
+        raise NotImplementedError
+
+    def save_id_counter(self, last_id: int) -> None:
+        """Guarda el último ID de tarea usado."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libera los recursos del motor (conexiones, archivos abiertos)."""
+        pass
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Seguimiento de los cambios de las tareas desde el último guardado.
+"""
+from .Task import Task
+from .TaskIndex import TaskIndex
+
+class ChangeTracker:
+    """
+    Oyente de TaskIndex con los cambios de pertenencia de cada contenedor
+    desde el último guardado: los IDs que entraron en cada ubicación
+    (PENDING, COMPLETED) y los que salieron del índice.
+
+    Las ediciones no se anotan aquí: cada tarea lleva su número de
+    modificación (Task.mod_seq), y una tarea cambió si es mayor que
+    'saved_seq', el número tomado al copiar el estado guardado. Con
+    'saved_seq' a None no hay una base guardada y todo cuenta como cambiado.
+    """
+    def __init__(self, saved_seq: int | None = None):
+        """Empieza sin cambios de pertenencia respecto al estado de 'saved_seq'."""
+        self.saved_seq = saved_seq
+        self.added: dict[str, set[int]] = {TaskIndex.PENDING: set(), TaskIndex.COMPLETED: set()}
+        self.removed: set[int] = set()
+
+    def is_dirty(self, task: Task, location: str) -> bool:
+        """Indica si hay que volver a escribir la tarea (de la ubicación 'location')."""
+        return (self.saved_seq is None or task.mod_seq > self.saved_seq
+                or task.task_id in self.added[location])
+
+    def has_changes(self, pending_tasks, completed_tasks) -> bool:
+        """
+        Indica si algo cambió desde el guardado: altas o bajas (O(1)) o
+        alguna tarea modificada (una comparación de enteros por tarea).
+        """
+        if self.saved_seq is None or self.removed or any(self.added.values()):
+            return True
+        saved_seq = self.saved_seq
+        return any(task.mod_seq > saved_seq
+                   for container in (pending_tasks, completed_tasks) for task in container.taskList())
+
+    def checkpoint(self, saved_seq: int) -> 'ChangeTracker':
+        """
+        Devuelve los cambios anotados hasta ahora (para el guardado que se
+        va a hacer) y empieza a anotar desde cero respecto a 'saved_seq'.
+        """
+        changes = ChangeTracker(self.saved_seq)
+        changes.added, changes.removed = self.added, self.removed
+        self.saved_seq = saved_seq
+        self.added = {location: set() for location in changes.added}
+        self.removed = set()
+        return changes
+
+    # --- Oyente de TaskIndex ---
+
+    def task_registered(self, task: Task, location: str) -> None:
+        for ids in self.added.values():
+            ids.discard(task.task_id) # Al completarse cambia de ubicación
+        self.added[location].add(task.task_id)
+        self.removed.discard(task.task_id)
+
+    def task_unregistered(self, task: Task) -> None:
+        self.removed.add(task.task_id)
+
+    def task_edited(self, task: Task, attribute: str, old_value) -> None:
+        pass # Queda en task.mod_seq
+
+    def index_cleared(self) -> None:
+        self.saved_seq = None # Ya no se sabe qué hay guardado
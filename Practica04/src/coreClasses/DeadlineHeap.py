@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Planificador de fechas límite basado en un montículo mínimo (heapq).
+
+Guarda las tareas pendientes con fecha límite ordenadas por vencimiento:
+    * next_deadline(): la fecha límite más próxima, O(1) amortizado.
+    * upcoming(n): las n próximas en vencer, O(n log n) sin recorrer el resto.
+    * advance(now): pasa a vencidas las que ya vencieron, O(k log n).
+    * overdue(): las vencidas, O(k).
+
+Cambiar o quitar una fecha no busca la entrada en el montículo: la entrada
+antigua se queda como "lápida" (su número de orden ya no es el vigente)
+y se descarta al llegar a la cima. Si las lápidas superan a las entradas
+válidas, el montículo se reconstruye.
+"""
+import heapq
+import itertools
+import time
+
+from .Task import Task, TaskStatus
+from .TaskIndex import TaskIndex
+
+class DeadlineHeap:
+    """
+    Montículo de (due_at, orden, task_id) más un diccionario task_id ->
+    (orden, tarea) con la entrada vigente de cada tarea programada.
+
+    Puede mantenerse solo como oyente de un TaskIndex (add_listener): solo
+    programa las tareas pendientes, así que completar o eliminar una tarea
+    cancela su fecha límite.
+    """
+    def __init__(self):
+        """Inicializa un planificador vacío."""
+        self._heap: list[tuple[float, int, int]] = []
+        self._scheduled: dict[int, tuple[int, Task]] = {} # En el montículo, aún no vencidas
+        self._overdue: dict[int, Task] = {} # Ya vencidas (en orden de vencimiento)
+        self._counter = itertools.count() # Desempate estable entre fechas iguales
+
+    # --- Mantenimiento ---
+
+    def schedule(self, task: Task) -> None:
+        """Programa (o reprograma) la fecha límite de la tarea. Sin fecha, la cancela."""
+        self.cancel(task.task_id)
+        if task.due_at is None:
+            return
+        order = next(self._counter)
+        self._scheduled[task.task_id] = (order, task)
+        heapq.heappush(self._heap, (task.due_at, order, task.task_id))
+
+    def cancel(self, task_id: int) -> bool:
+        """Quita la tarea del planificador (su entrada del montículo queda como lápida)."""
+        if self._scheduled.pop(task_id, None) is not None:
+            self._compact_if_needed()
+            return True
+        return self._overdue.pop(task_id, None) is not None
+
+    def _is_live(self, entry: tuple[float, int, int]) -> bool:
+        current = self._scheduled.get(entry[2])
+        return current is not None and current[0] == entry[1]
+
+    def _drop_stale_top(self) -> None:
+        """Descarta las lápidas de la cima."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+
+    def _compact_if_needed(self) -> None:
+        """Reconstruye el montículo si la mitad o más son lápidas."""
+        if len(self._heap) > 32 and len(self._heap) >= 2 * len(self._scheduled):
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._scheduled.clear()
+        self._overdue.clear()
+
+    # --- Consultas ---
+
+    def next_deadline(self) -> float | None:
+        """Fecha límite más próxima de las aún no vencidas, o None."""
+        self._drop_stale_top()
+        return self._heap[0][0] if self._heap else None
+
+    def advance(self, now: float | None = None) -> list[Task]:
+        """
+        Mueve a vencidas las tareas cuya fecha límite es <= now (por defecto,
+        ahora) y las devuelve, de la que venció antes a la última.
+        """
+        if now is None:
+            now = time.time()
+        heap = self._heap
+        newly_overdue = []
+        while heap and heap[0][0] <= now:
+            _, order, task_id = heapq.heappop(heap)
+            current = self._scheduled.get(task_id)
+            if current is None or current[0] != order:
+                continue # Lápida
+            del self._scheduled[task_id]
+            self._overdue[task_id] = current[1]
+            newly_overdue.append(current[1])
+        return newly_overdue
+
+    def upcoming(self, n: int) -> list[Task]:
+        """
+        Las n próximas tareas en vencer (aún no vencidas), en orden.
+        Recorre el montículo en anchura por prioridad con un segundo
+        montículo de candidatos, así que solo visita O(n) entradas
+        (más las lápidas que encuentre).
+        """
+        heap = self._heap
+        result = []
+        candidates = [(heap[0], 0)] if heap else []
+        while candidates and len(result) < n:
+            entry, position = heapq.heappop(candidates)
+            if self._is_live(entry):
+                result.append(self._scheduled[entry[2]][1])
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(candidates, (heap[child], child))
+        return result
+
+    def overdue(self) -> list[Task]:
+        """Tareas vencidas (pendientes y con la fecha límite ya pasada)."""
+        return list(self._overdue.values())
+
+    def __len__(self) -> int:
+        """Número de tareas con fecha límite (vencidas o no)."""
+        return len(self._scheduled) + len(self._overdue)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._scheduled or task_id in self._overdue
+
+    # --- Oyente de TaskIndex ---
+
+    def task_registered(self, task: Task, location: str) -> None:
+        if location == TaskIndex.PENDING:
+            self.schedule(task)
+        else:
+            self.cancel(task.task_id)
+
+    def task_unregistered(self, task: Task) -> None:
+        self.cancel(task.task_id)
+
+    def task_edited(self, task: Task, attribute: str, old_value) -> None:
+        if attribute == "due_at" and task.status_code == TaskStatus.PENDING:
+            self.schedule(task)
+
+    def index_cleared(self) -> None:
+        self.clear()
+
+    def __repr__(self) -> str:
+        return f"DeadlineHeap(programadas={len(self._scheduled)}, vencidas={len(self._overdue)})"
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    now = time.time()
+    deadlines = DeadlineHeap()
+    for i in range(1, 6):
+        deadlines.schedule(Task(i, f"Tarea {i}", "", due_at=now + 60 * (6 - i)))
+    print("Próximas 3:", [t.task_id for t in deadlines.upcoming(3)])
+    print("Vencidas dentro de 2,5 minutos:", [t.task_id for t in deadlines.advance(now + 150)])
+    print(deadlines, "siguiente en", round(deadlines.next_deadline() - now), "s")
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Grafo dirigido acíclico (DAG) de dependencias entre tareas pendientes.
+
+Solo guarda las aristas todavía activas: "B depende de A" mientras A siga
+pendiente. El grado de entrada de una tarea es el número de dependencias
+que le faltan; cuando llega a 0 la tarea está lista. Al completar (o
+eliminar) A solo se visitan sus dependientes directos, O(grado de salida),
+sin ordenar topológicamente todo el grafo.
+"""
+
+class DependencyGraph:
+    """
+    Dos diccionarios de conjuntos, uno por sentido de las aristas:
+        _prerequisites[B] = {A, ...}  dependencias aún pendientes de B
+        _dependents[A] = {B, ...}     tareas que esperan a A
+
+    Las tareas sin dependencias pendientes no aparecen en el grafo.
+    """
+    def __init__(self):
+        """Inicializa un grafo vacío."""
+        self._prerequisites: dict[int, set[int]] = {}
+        self._dependents: dict[int, set[int]] = {}
+
+    def _reaches(self, starts, target: int) -> bool:
+        """¿Alguna de 'starts' depende (directa o indirectamente) de 'target'?"""
+        stack = list(starts)
+        seen = set(stack)
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            for prerequisite in self._prerequisites.get(node, ()):
+                if prerequisite not in seen:
+                    seen.add(prerequisite)
+                    stack.append(prerequisite)
+        return False
+
+    def set_prerequisites(self, task_id: int, prerequisites) -> bool:
+        """
+        Reemplaza las dependencias pendientes de una tarea.
+
+        Solo hace falta buscar ciclos si alguna tarea espera ya a 'task_id'
+        (una tarea nueva no puede cerrar un ciclo).
+
+        Returns:
+            True si la tarea queda lista (sin dependencias pendientes).
+
+        Raises:
+            ValueError: Si las nuevas dependencias crearían un ciclo. El
+                        grafo no se modifica.
+        """
+        prerequisites = set(prerequisites)
+        if task_id in prerequisites:
+            raise ValueError(f"La tarea {task_id} no puede depender de sí misma.")
+        if prerequisites and self._dependents.get(task_id) and self._reaches(prerequisites, task_id):
+            raise ValueError(f"Las dependencias de la tarea {task_id} crearían un ciclo.")
+        self._drop_prerequisites(task_id)
+        if not prerequisites:
+            return True
+        self._prerequisites[task_id] = prerequisites
+        for prerequisite in prerequisites:
+            self._dependents.setdefault(prerequisite, set()).add(task_id)
+        return False
+
+    def _drop_prerequisites(self, task_id: int) -> None:
+        """Quita las aristas que entran en la tarea."""
+        for prerequisite in self._prerequisites.pop(task_id, ()):
+            dependents = self._dependents[prerequisite]
+            dependents.discard(task_id)
+            if not dependents:
+                del self._dependents[prerequisite]
+
+    def resolve(self, task_id: int) -> list[int]:
+        """
+        Marca la tarea como terminada (completada o eliminada): deja de
+        bloquear a sus dependientes y se olvidan sus propias dependencias.
+
+        Returns:
+            Los IDs de las tareas que acaban de quedar listas.
+        """
+        self._drop_prerequisites(task_id)
+        ready = []
+        for dependent in self._dependents.pop(task_id, ()):
+            prerequisites = self._prerequisites[dependent]
+            prerequisites.discard(task_id)
+            if not prerequisites:
+                del self._prerequisites[dependent]
+                ready.append(dependent)
+        ready.sort() # Orden determinista: por ID (el de creación)
+        return ready
+
+    def in_degree(self, task_id: int) -> int:
+        """Número de dependencias pendientes de la tarea."""
+        return len(self._prerequisites.get(task_id, ()))
+
+    def blocked_by(self, task_id: int) -> frozenset[int]:
+        """IDs de las dependencias pendientes de la tarea."""
+        return frozenset(self._prerequisites.get(task_id, ()))
+
+    def is_blocked(self, task_id: int) -> bool:
+        return task_id in self._prerequisites
+
+    def clear(self) -> None:
+        self._prerequisites.clear()
+        self._dependents.clear()
+
+    def __len__(self) -> int:
+        """Número de tareas bloqueadas."""
+        return len(self._prerequisites)
+
+    def __repr__(self) -> str:
+        edges = sum(len(prerequisites) for prerequisites in self._prerequisites.values())
+        return f"DependencyGraph(bloqueadas={len(self._prerequisites)}, aristas={edges})"
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    graph = DependencyGraph()
+    graph.set_prerequisites(3, [1, 2]) # 3 espera a 1 y 2
+    graph.set_prerequisites(4, [3])    # 4 espera a 3
+    print(graph)
+    try:
+        graph.set_prerequisites(1, [4])
+    except ValueError as e:
+        print("Rechazado:", e)
+    print("Tras completar 1:", graph.resolve(1))
+    print("Tras completar 2:", graph.resolve(2))
+    print("Tras completar 3:", graph.resolve(3))
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Conjuntos de tareas por prioridad mantenidos de forma incremental.
+
+PendingTasks y CompletedTasks actualizan los cubos en cada alta, baja y
+cambio de prioridad, de modo que contar las tareas de una prioridad es O(1)
+y obtenerlas es O(k) (k = tareas de esa prioridad), sin recorrer el resto.
+"""
+from .Task import Task, TaskPriority
+
+class PriorityBuckets:
+    """
+    Un diccionario task_id -> tarea por cada prioridad (conserva el orden de
+    llegada al cubo), más la prioridad con la que se registró cada tarea
+    para poder moverla cuando se edita.
+    """
+    def __init__(self, priorities=tuple(TaskPriority)):
+        """Inicializa un cubo vacío por cada prioridad admitida."""
+        self._buckets: dict[int, dict[int, Task]] = {int(p): {} for p in priorities}
+        self._priority_of: dict[int, int] = {} # task_id -> cubo en el que está
+
+    def add(self, task: Task) -> None:
+        """Añade la tarea al cubo de su prioridad (o la mueve si ya estaba)."""
+        self.discard(task.task_id)
+        self._buckets[task.priority][task.task_id] = task
+        self._priority_of[task.task_id] = task.priority
+
+    def add_many(self, tasks) -> None:
+        """Añade varias tareas en orden."""
+        for task in tasks:
+            self.add(task)
+
+    def add_many_first(self, tasks) -> None:
+        """
+        Añade varias tareas (que no estaban) como si hubieran llegado antes
+        que las que ya hay: 'tasks' va de la más reciente a la más antigua.
+        Coste O(tareas de los cubos afectados).
+        """
+        older: dict[int, dict[int, Task]] = {}
+        for task in reversed(tasks):
+            older.setdefault(task.priority, {})[task.task_id] = task
+            self._priority_of[task.task_id] = task.priority
+        for priority, bucket in older.items():
+            bucket.update(self._buckets[priority])
+            self._buckets[priority] = bucket
+
+    def discard(self, task_id: int) -> bool:
+        """Quita la tarea de su cubo. Devuelve True si estaba."""
+        priority = self._priority_of.pop(task_id, None)
+        if priority is None:
+            return False
+        del self._buckets[priority][task_id]
+        return True
+
+    def update(self, task: Task) -> None:
+        """Mueve la tarea al cubo de su prioridad actual si ha cambiado."""
+        if self._priority_of.get(task.task_id) != task.priority:
+            self.add(task)
+
+    def relabel(self, new_priority: int, old_priority: int | None = None) -> None:
+        """
+        Pasa al cubo 'new_priority' todas las tareas del cubo 'old_priority'
+        (o de todos los cubos si es None), tras una edición masiva.
+        Coste O(tareas movidas).
+        """
+        sources = [old_priority] if old_priority is not None else list(self._buckets)
+        target = self._buckets[new_priority]
+        for priority in sources:
+            if priority == new_priority:
+                continue
+            bucket = self._buckets[priority]
+            for task_id in bucket:
+                self._priority_of[task_id] = new_priority
+            target.update(bucket)
+            bucket.clear()
+
+    def count(self, priority: int | None = None) -> int:
+        """Número de tareas de esa prioridad (o de todas con None), en O(1)."""
+        if priority is None:
+            return len(self._priority_of)
+        bucket = self._buckets.get(priority)
+        return len(bucket) if bucket is not None else 0
+
+    def counts(self) -> dict[int, int]:
+        """Devuelve {prioridad: número de tareas}."""
+        return {priority: len(bucket) for priority, bucket in sorted(self._buckets.items())}
+
+    def tasks(self, priority: int) -> list[Task]:
+        """Tareas de esa prioridad en orden de llegada al cubo, en O(k)."""
+        bucket = self._buckets.get(priority)
+        return list(bucket.values()) if bucket is not None else []
+
+    def clear(self) -> None:
+        for bucket in self._buckets.values():
+            bucket.clear()
+        self._priority_of.clear()
+
+    def __len__(self) -> int:
+        return len(self._priority_of)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._priority_of
+
+    def __repr__(self) -> str:
+        return f"PriorityBuckets({self.counts()})"
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    buckets = PriorityBuckets()
+    buckets.add_many(Task(i, f"Tarea {i}", "", priority=(i % 3) + 1) for i in range(1, 8))
+    print(buckets)
+    print("Urgentes:", [t.task_id for t in buckets.tasks(Task.PRIORITY_URGENT)])
+    buckets.relabel(Task.PRIORITY_MEDIUM, Task.PRIORITY_LOW)
+    print("Tras subir las bajas:", buckets)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Planificador de tareas por prioridad con carriles FIFO y envejecimiento.
+
+Cada nivel de prioridad tiene su propia cola FIFO (un "carril"). La siguiente
+tarea se elige comparando solo las cabezas de los carriles, así que la
+selección es O(1) independientemente del número de tareas.
+
+Para que las tareas de baja prioridad no esperen indefinidamente, su
+prioridad efectiva sube un nivel por cada 'aging_interval' tareas servidas
+desde que entraron en la cola (envejecimiento).
+"""
+from operator import attrgetter
+
+from .Task import TaskPriority
+from .queue_cython import IndexedCythonQueue
+
+class PriorityLanes:
+    """
+    Cola de tareas con un carril FIFO por prioridad.
+
+    Tiene la misma interfaz que IndexedCythonQueue (enqueue, dequeue,
+    dequeue_many, extend_from_list, remove, get, peek...), por lo que
+    PendingTasks puede usar cualquiera de las dos.
+
+    Prioridad efectiva de la cabeza de un carril:
+        prioridad + (servidas_ahora - servidas_al_encolar) // aging_interval
+    Gana la mayor; en caso de empate, la que lleva más tiempo en la cola.
+    Dentro de un carril la cabeza es siempre la más antigua, así que basta
+    con mirar las cabezas.
+    """
+    def __init__(self, key=attrgetter("task_id"), priority=attrgetter("priority"),
+                 aging_interval: int = 10, priorities=tuple(TaskPriority)):
+        """
+        Inicializa los carriles vacíos.
+
+        Args:
+            key: Función que devuelve la clave única de una tarea.
+            priority: Función que devuelve la prioridad de una tarea.
+            aging_interval: Tareas servidas tras las que una tarea en espera
+                            sube un nivel de prioridad (0 = sin envejecimiento).
+            priorities: Niveles de prioridad admitidos.
+        """
+        if aging_interval < 0:
+            raise ValueError("aging_interval no puede ser negativo")
+        self.key_func = key
+        self.priority_func = priority
+        self.aging_interval = aging_interval
+        # De mayor a menor prioridad: en empate total gana el carril más prioritario
+        self._priorities = sorted((int(p) for p in priorities), reverse=True)
+        self._lanes = {p: IndexedCythonQueue(key=key) for p in self._priorities}
+        self._enqueued_at: dict = {} # clave -> (tareas servidas al encolar, orden de llegada)
+        self._served = 0 # Reloj lógico: tareas desencoladas hasta ahora
+        self._arrivals = 0
+
+    # --- Selección ---
+
+    def _rank(self, lane_priority: int, key, served: int) -> tuple:
+        """Clave de comparación de una cabeza de carril (mayor = se sirve antes)."""
+        enqueued_at, arrival = self._enqueued_at[key]
+        effective = lane_priority
+        if self.aging_interval:
+            effective += (served - enqueued_at) // self.aging_interval
+        return (effective, -arrival)
+
+    def _select_lane(self) -> IndexedCythonQueue | None:
+        """Devuelve el carril cuya cabeza debe servirse a continuación (O(1))."""
+        best_lane, best_rank = None, None
+        for p in self._priorities:
+            lane = self._lanes[p]
+            if lane.isEmpty():
+                continue
+            rank = self._rank(p, self.key_func(lane.peek()), self._served)
+            if best_rank is None or rank > best_rank:
+                best_lane, best_rank = lane, rank
+        return best_lane
+
+    def _priority_of(self, item) -> int:
+        """Prioridad actual de la tarea (ValueError si no tiene carril)."""
+        priority = int(self.priority_func(item))
+        if priority not in self._lanes:
+            raise ValueError(f"Prioridad '{priority}' no reconocida.")
+        return priority
+
+    def _lane_of(self, item) -> IndexedCythonQueue:
+        """Carril que corresponde a la prioridad actual de la tarea."""
+        return self._lanes[self._priority_of(item)]
+
+    # --- Interfaz de cola ---
+
+    def enqueue(self, item) -> None:
+        """Añade la tarea al final del carril de su prioridad."""
+        key = self.key_func(item)
+        if key in self._enqueued_at:
+            raise ValueError(f"La clave {key!r} ya está en la cola")
+        self._lane_of(item).enqueue(item)
+        self._enqueued_at[key] = (self._served, self._arrivals)
+        self._arrivals += 1
+
+    def extend_from_list(self, items: list) -> None:
+        """Añade varias tareas en orden, agrupándolas por carril."""
+        keys = [self.key_func(item) for item in items]
+        if len(set(keys)) != len(keys) or any(key in self._enqueued_at for key in keys):
+            raise ValueError("La lista contiene claves repetidas o ya encoladas")
+        groups = {p: [] for p in self._priorities}
+        for item in items:
+            groups[self._priority_of(item)].append(item)
+        for p, group in groups.items():
+            if group:
+                self._lanes[p].extend_from_list(group)
+        for key in keys:
+            self._enqueued_at[key] = (self._served, self._arrivals)
+            self._arrivals += 1
+
+    def enqueue_many(self, iterable) -> None:
+        """Añade las tareas de cualquier iterable."""
+        self.extend_from_list(list(iterable))
+
+    def peek(self):
+        """Devuelve la siguiente tarea a servir sin extraerla."""
+        lane = self._select_lane()
+        if lane is None:
+            raise IndexError("peek from empty queue")
+        return lane.peek()
+
+    def dequeue(self):
+        """Extrae y devuelve la siguiente tarea según prioridad y envejecimiento."""
+        lane = self._select_lane()
+        if lane is None:
+            raise IndexError("dequeue from empty queue")
+        item = lane.dequeue()
+        del self._enqueued_at[self.key_func(item)]
+        self._served += 1
+        return item
+
+    def dequeue_many(self, n: int) -> list:
+        """Extrae hasta 'n' tareas en orden de servicio."""
+        if n < 0:
+            raise ValueError("n no puede ser negativo")
+        result = []
+        while len(result) < n and not self.isEmpty():
+            result.append(self.dequeue())
+        return result
+
+    def remove(self, key):
+        """Elimina la tarea con esa clave (O(1) amortizado). KeyError si no está."""
+        self._enqueued_at.pop(key)
+        for lane in self._lanes.values():
+            if key in lane:
+                return lane.remove(key)
+
+    def get(self, key, default=None):
+        """Devuelve la tarea con esa clave, o 'default' si no está."""
+        if key not in self._enqueued_at:
+            return default
+        for lane in self._lanes.values():
+            item = lane.get(key)
+            if item is not None:
+                return item
+        return default
+
+    def reprioritize(self, key) -> None:
+        """
+        Mueve una tarea al carril de su prioridad actual (tras editarla).
+        Entra al final del nuevo carril con el envejecimiento reiniciado.
+        """
+        item = self.remove(key)
+        self.enqueue(item)
+
+    def rebalance(self) -> None:
+        """
+        Recoloca en su carril todas las tareas cuya prioridad cambió sin pasar
+        por reprioritize (p. ej. ediciones masivas en TaskStore). Es O(n).
+        """
+        for p, lane in self._lanes.items():
+            moved = [item for item in lane if int(self.priority_func(item)) != p]
+            for item in moved:
+                key = self.key_func(item)
+                lane.remove(key)
+                self._lane_of(item).enqueue(item)
+                # Mantiene su antigüedad, pero pasa al final del nuevo carril
+                self._enqueued_at[key] = (self._served, self._enqueued_at[key][1])
+
+    # --- Persistencia del envejecimiento ---
+
+    def aging_state(self) -> dict:
+        """
+        Devuelve el estado del envejecimiento para guardarlo junto a las
+        tareas: el reloj de servicio, el contador de llegadas y, por tarea,
+        [clave, servidas al encolar, orden de llegada].
+        """
+        return {"served": self._served, "arrivals": self._arrivals,
+                "tasks": [[key, enqueued_at, arrival] for key, (enqueued_at, arrival) in self._enqueued_at.items()]}
+
+    def restore_aging(self, state: dict) -> None:
+        """
+        Restaura un estado de aging_state después de volver a encolar las
+        tareas en el orden guardado (el de servicio, que conserva el de cada
+        carril). Las tareas encoladas que no aparecen en él cuentan como
+        recién llegadas.
+
+        Raises:
+            ValueError, TypeError, KeyError: Si 'state' no tiene el formato
+                                             esperado (no se cambia nada).
+        """
+        served, arrivals = int(state["served"]), int(state["arrivals"])
+        saved = {key: (int(enqueued_at), int(arrival)) for key, enqueued_at, arrival in state["tasks"]}
+        if served < 0 or any(not 0 <= enqueued_at <= served or not 0 <= arrival < arrivals
+                             for enqueued_at, arrival in saved.values()):
+            raise ValueError("Estado de envejecimiento no válido.")
+        self._served = served
+        self._arrivals = arrivals
+        for key in self._enqueued_at:
+            if key in saved:
+                self._enqueued_at[key] = saved[key]
+            else:
+                self._enqueued_at[key] = (served, self._arrivals)
+                self._arrivals += 1
+
+    def clear(self) -> None:
+        """Vacía todos los carriles."""
+        for lane in self._lanes.values():
+            lane.clear()
+        self._enqueued_at.clear()
+
+    def lane_sizes(self) -> dict[int, int]:
+        """Devuelve {prioridad: tareas en espera}."""
+        return {p: lane.size() for p, lane in self._lanes.items()}
+
+    def size(self) -> int:
+        return len(self._enqueued_at)
+
+    def isEmpty(self) -> bool:
+        return not self._enqueued_at
+
+    def __len__(self) -> int:
+        return len(self._enqueued_at)
+
+    def __contains__(self, key) -> bool:
+        return key in self._enqueued_at
+
+    def __iter__(self):
+        """
+        Recorre las tareas en el orden en que se servirían si no llegara
+        ninguna nueva (mezcla de los carriles simulando el reloj de servicio).
+        """
+        iterators = {p: iter(self._lanes[p]) for p in self._priorities}
+        heads = {p: next(it, None) for p, it in iterators.items()}
+        served = self._served
+        while True:
+            best_p, best_rank = None, None
+            for p in self._priorities:
+                if heads[p] is None:
+                    continue
+                rank = self._rank(p, self.key_func(heads[p]), served)
+                if best_rank is None or rank > best_rank:
+                    best_p, best_rank = p, rank
+            if best_p is None:
+                return
+            yield heads[best_p]
+            heads[best_p] = next(iterators[best_p], None)
+            served += 1
+
+    def get_items_list(self) -> list:
+        """Devuelve las tareas en orden de servicio."""
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"PriorityLanes({self.lane_sizes()}, aging_interval={self.aging_interval})"
+
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo que define RecurrenceRule, la regla de una serie de tareas
+recurrentes (cada día, cada semana, cada N días, con o sin límite).
+
+La regla se guarda una sola vez por serie: las tareas concretas se generan
+de forma perezosa, una a una, solo cuando hacen falta.
+"""
+from datetime import datetime, timedelta
+
+from .Task import Task, timestamp_to_iso, iso_to_timestamp
+
+class RecurrenceRule:
+    """
+    Serie de tareas que se repiten cada 'interval_days' días a partir de
+    'start_at', como mucho 'count' veces (None = sin límite).
+
+    Las fechas se calculan sobre la hora local, así que una tarea diaria a
+    las 9:00 sigue a las 9:00 tras un cambio de horario.
+
+    Atributos:
+        rule_id (int): Identificador único de la serie.
+        title (str): Título de las tareas generadas.
+        description (str): Descripción de las tareas generadas.
+        priority (int): Prioridad de las tareas generadas.
+        start_at (float): Fecha de la primera ocurrencia (segundos desde la época).
+        interval_days (int): Días entre dos ocurrencias.
+        count (int | None): Número máximo de ocurrencias o None.
+        next_index (int): Número de ocurrencias ya generadas.
+    """
+    __slots__ = ("rule_id", "title", "description", "priority", "start_at",
+                 "interval_days", "count", "next_index")
+
+    DAILY = 1
+    WEEKLY = 7
+
+    def __init__(self, rule_id: int, title: str, description: str, start_at: float,
+                 interval_days: int = DAILY, count: int | None = None,
+                 priority: int = Task.PRIORITY_LOW, next_index: int = 0):
+        """
+        Inicializa una regla de recurrencia.
+
+        Raises:
+            ValueError: Si algún valor no es válido.
+        """
+        if not isinstance(rule_id, int) or rule_id <= 0:
+            raise ValueError("El ID de la serie debe ser un entero positivo.")
+        if not isinstance(interval_days, int) or interval_days <= 0:
+            raise ValueError("El intervalo debe ser un número entero de días mayor que 0.")
+        if count is not None and (not isinstance(count, int) or count <= 0):
+            raise ValueError("El número de repeticiones debe ser un entero positivo o None.")
+        if priority not in Task.VALID_PRIORITIES:
+            raise ValueError(f"Prioridad '{priority}' no reconocida.")
+        if not isinstance(start_at, (int, float)):
+            raise ValueError("start_at debe ser un instante en segundos.")
+        if not isinstance(next_index, int) or next_index < 0:
+            raise ValueError("next_index debe ser un entero no negativo.")
+
+        self.rule_id: int = rule_id
+        self.title: str = title
+        self.description: str = description
+        self.priority: int = priority
+        self.start_at: float = float(start_at)
+        self.interval_days: int = interval_days
+        self.count: int | None = count
+        self.next_index: int = next_index
+
+    @classmethod
+    def daily(cls, rule_id: int, title: str, description: str, start_at: float, **kwargs) -> 'RecurrenceRule':
+        """Serie que se repite cada día."""
+        return cls(rule_id, title, description, start_at, cls.DAILY, **kwargs)
+
+    @classmethod
+    def weekly(cls, rule_id: int, title: str, description: str, start_at: float, **kwargs) -> 'RecurrenceRule':
+        """Serie que se repite cada semana."""
+        return cls(rule_id, title, description, start_at, cls.WEEKLY, **kwargs)
+
+    def occurrences(self, start_index: int = 0):
+        """
+        Generador de las fechas de las ocurrencias a partir de 'start_index'.
+        Es infinito si la serie no tiene límite: hay que cortarlo al consumirlo.
+        """
+        start = datetime.fromtimestamp(self.start_at)
+        step = timedelta(days=self.interval_days)
+        index = start_index
+        while self.count is None or index < self.count:
+            yield (start + index * step).timestamp()
+            index += 1
+
+    def next_occurrence(self) -> float | None:
+        """Fecha de la siguiente ocurrencia aún no generada, o None si la serie terminó."""
+        return next(self.occurrences(self.next_index), None)
+
+    def is_finished(self) -> bool:
+        return self.count is not None and self.next_index >= self.count
+
+    def take_next(self, task_id: int) -> Task:
+        """
+        Genera la tarea de la siguiente ocurrencia (con esa fecha como fecha
+        límite) y avanza la serie.
+
+        Raises:
+            ValueError: Si la serie ya terminó.
+        """
+        due_at = self.next_occurrence()
+        if due_at is None:
+            raise ValueError(f"La serie {self.rule_id} no tiene más ocurrencias.")
+        self.next_index += 1
+        return Task(task_id, self.title, self.description, priority=self.priority, due_at=due_at)
+
+    def to_dict(self) -> dict:
+        """Convierte la regla a un diccionario serializable (JSON)."""
+        return {
+            "rule_id": self.rule_id,
+            "title": self.title,
+            "description": self.description,
+            "priority": int(self.priority),
+            "start_at": timestamp_to_iso(self.start_at),
+            "interval_days": self.interval_days,
+            "count": self.count,
+            "next_index": self.next_index,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RecurrenceRule':
+        """
+        Crea una regla a partir de un diccionario (ej. cargado desde JSON).
+
+        Raises:
+            ValueError: Si falta alguna clave o algún valor no es válido.
+        """
+        try:
+            return cls(
+                rule_id=int(data['rule_id']),
+                title=data['title'],
+                description=data.get('description', ""),
+                start_at=iso_to_timestamp(data['start_at']),
+                interval_days=int(data['interval_days']),
+                count=None if data.get('count') is None else int(data['count']),
+                priority=int(data.get('priority', Task.PRIORITY_LOW)),
+                next_index=int(data.get('next_index', 0))
+            )
+        except KeyError as e:
+            raise ValueError(f"Falta la clave requerida en los datos de la serie: {e}")
+
+    def __repr__(self) -> str:
+        limit = "sin límite" if self.count is None else f"{self.next_index}/{self.count}"
+        return (f"RecurrenceRule(id={self.rule_id}, title='{self.title}', "
+                f"cada {self.interval_days} días, {limit})")
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Planificador de series de tareas recurrentes.
+
+Guarda solo las reglas (RecurrenceRule) y genera las tareas concretas de
+forma perezosa: materialize() crea únicamente las ocurrencias que caen
+dentro de la ventana activa (de ahora a 'window' segundos vista), así que
+una serie diaria sin límite no llena la cola ni el JSON de tareas futuras.
+
+Las reglas se ordenan en un montículo por su siguiente ocurrencia, de modo
+que materialize() solo visita las series que tienen algo que generar:
+O(k log n) para k tareas nuevas entre n series.
+"""
+import heapq
+import time
+from typing import Callable
+
+from .Task import Task
+from .RecurrenceRule import RecurrenceRule
+
+class RecurrenceScheduler:
+    """
+    Colección de reglas de recurrencia con un montículo de
+    (siguiente ocurrencia, rule_id) y la ocurrencia vigente de cada regla.
+    Quitar una regla deja su entrada como lápida, que se descarta al llegar
+    a la cima.
+    """
+    DEFAULT_WINDOW = 7 * 24 * 60 * 60 # Una semana vista
+
+    def __init__(self, window: float = DEFAULT_WINDOW):
+        """
+        Inicializa un planificador vacío.
+
+        Args:
+            window: Segundos por delante de ahora en los que se generan las
+                    ocurrencias.
+        """
+        if window < 0:
+            raise ValueError("La ventana activa no puede ser negativa.")
+        self.window = window
+        self._rules: dict[int, RecurrenceRule] = {}
+        self._heap: list[tuple[float, int]] = []
+        self._next_at: dict[int, float] = {} # rule_id -> ocurrencia en el montículo
+
+    def _push(self, rule: RecurrenceRule) -> None:
+        next_at = rule.next_occurrence()
+        if next_at is None:
+            self._next_at.pop(rule.rule_id, None) # Serie terminada
+            return
+        self._next_at[rule.rule_id] = next_at
+        heapq.heappush(self._heap, (next_at, rule.rule_id))
+
+    def _is_live(self, entry: tuple[float, int]) -> bool:
+        return self._next_at.get(entry[1]) == entry[0]
+
+    def addRule(self, rule: RecurrenceRule) -> bool:
+        """Añade una serie. Devuelve False si ya había una con el mismo ID."""
+        if not isinstance(rule, RecurrenceRule):
+            print(f"Error (RecurrenceScheduler.addRule): Se esperaba una RecurrenceRule y se recibió {type(rule)}.")
+            return False
+        if rule.rule_id in self._rules:
+            print(f"Error (RecurrenceScheduler.addRule): Ya hay una serie con ID {rule.rule_id}.")
+            return False
+        self._rules[rule.rule_id] = rule
+        self._push(rule)
+        return True
+
+    def removeRule(self, rule_id: int) -> bool:
+        """
+        Quita una serie (deja de generar tareas). Las tareas ya generadas
+        siguen pendientes. Devuelve True si existía.
+        """
+        if self._rules.pop(rule_id, None) is None:
+            return False
+        self._next_at.pop(rule_id, None)
+        if len(self._heap) > 32 and len(self._heap) >= 2 * len(self._next_at):
+            # Demasiadas lápidas: reconstruir con las entradas vigentes
+            self._heap = [(next_at, rule_id) for rule_id, next_at in self._next_at.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def get(self, rule_id: int) -> RecurrenceRule | None:
+        return self._rules.get(rule_id)
+
+    def ruleList(self) -> list[RecurrenceRule]:
+        """Devuelve las series en el orden en que se añadieron."""
+        return list(self._rules.values())
+
+    def next_occurrence(self) -> float | None:
+        """Fecha de la próxima ocurrencia aún no generada de cualquier serie, o None."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap) # Lápida
+        return heap[0][0] if heap else None
+
+    def materialize(self, next_task_id: Callable[[], int], now: float | None = None) -> list[Task]:
+        """
+        Genera las tareas de todas las ocurrencias que caen dentro de la
+        ventana activa y que aún no se habían generado (también las ya
+        pasadas, si la aplicación estuvo cerrada).
+
+        Args:
+            next_task_id: Función que devuelve un ID nuevo para cada tarea.
+            now: Instante de referencia (por defecto, ahora).
+
+        Returns:
+            Las tareas nuevas ordenadas por fecha límite.
+        """
+        if now is None:
+            now = time.time()
+        until = now + self.window
+        heap = self._heap
+        new_tasks = []
+        while heap and heap[0][0] <= until:
+            entry = heapq.heappop(heap)
+            if not self._is_live(entry):
+                continue # Lápida
+            rule = self._rules[entry[1]]
+            new_tasks.append(rule.take_next(next_task_id()))
+            self._push(rule) # Siguiente ocurrencia de la misma serie
+        return new_tasks
+
+    def clear(self) -> None:
+        self._rules.clear()
+        self._heap.clear()
+        self._next_at.clear()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, rule_id: int) -> bool:
+        return rule_id in self._rules
+
+    def __repr__(self) -> str:
+        return f"RecurrenceScheduler(series={len(self._rules)}, ventana={self.window / 86400:g} días)"
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    import itertools
+    ids = itertools.count(1)
+    now = time.time()
+    scheduler = RecurrenceScheduler()
+    scheduler.addRule(RecurrenceRule.daily(1000, "Regar las plantas", "", now))
+    scheduler.addRule(RecurrenceRule.weekly(1001, "Sacar la basura", "", now, count=3))
+    print(scheduler)
+    print("Esta semana:", [(t.task_id, t.title) for t in scheduler.materialize(lambda: next(ids), now)])
+    print("Dentro de un mes:", len(scheduler.materialize(lambda: next(ids), now + 30 * 86400)), "tareas nuevas")
+    print(scheduler.ruleList())
@@ -1,25 +1,95 @@
 # -*- coding: utf-8 -*-
+import time
+import itertools
+from datetime import datetime, timezone
+from enum import IntEnum
+
+class TaskStatus(IntEnum):
+    """Códigos compactos para el estado de una tarea."""
+    PENDING = 1
+    COMPLETED = 2
+
+class TaskPriority(IntEnum):
+    """Códigos de prioridad (3: Urgente, 2: Medio, 1: Bajo)."""
+    LOW = 1
+    MEDIUM = 2
+    URGENT = 3
+
+def timestamp_to_iso(timestamp: float | None) -> str | None:
+    """Convierte un instante (segundos desde la época) a ISO 8601 con zona UTC."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+def iso_to_timestamp(text: str | None) -> float | None:
+    """Convierte una fecha ISO 8601 a segundos desde la época (sin zona = hora local)."""
+    if text is None:
+        return None
+    return datetime.fromisoformat(text).timestamp()
+
+# Números de modificación (Task.mod_seq): cada creación o edición toma el siguiente
+_modification_seq = itertools.count(1)
+
+def next_modification_seq() -> int:
+    """Siguiente número de modificación: mayor que todos los repartidos hasta ahora."""
+    return next(_modification_seq)
+
+def _check_timestamp(value, name: str) -> None:
+    """Valida que 'value' sea None o un número de segundos desde la época."""
+    if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+        raise ValueError(f"{name} debe ser un número de segundos desde la época o None.")
+
 class Task:
     """
     Representa una tarea individual con sus atributos.
 
+    Usa __slots__ para no reservar un __dict__ por instancia, y guarda el
+    estado y la prioridad como enteros pequeños (ver TaskStatus y
+    TaskPriority). La propiedad 'status' sigue devolviendo
+    el texto ("Pendiente"/"Completada") para mantener la compatibilidad
+    con la GUI y con el JSON existente.
+
+    Mientras está en un TaskIndex, la tarea le avisa de cada edición
+    (editTitle, editDescription, editPriority) a través de '_listener', para
+    que los índices derivados (p. ej. la búsqueda de texto) se mantengan al día.
+
+    'mod_seq' es el número de modificación (next_modification_seq) de la
+    última creación, edición o cambio de estado: comparándolo con el número
+    tomado al guardar se sabe si la tarea cambió desde entonces.
+
     Atributos:
         task_id (int): Identificador numérico único e inmutable.
         title (str): Título de la tarea.
         description (str): Descripción detallada de la tarea.
         status (str): Estado actual ("Pendiente" o "Completada").
+        status_code (int): Estado actual como código compacto (TaskStatus).
         priority (int): Nivel de prioridad (3: Urgente, 2: Medio, 1: Bajo).
-        # created_at (datetime): Ejemplo de atributo adicional
+        created_at (float | None): Instante de creación (segundos desde la época).
+        due_at (float | None): Fecha límite (segundos desde la época) o None.
+        depends_on (tuple[int, ...]): IDs de las tareas que deben completarse antes.
+        mod_seq (int): Número de la última modificación.
     """
+    __slots__ = ("task_id", "title", "description", "status_code", "priority",
+                 "created_at", "due_at", "depends_on", "mod_seq", "_listener")
+
     # Definir constantes para estados y prioridades puede ser útil
     STATUS_PENDING = "Pendiente"
     STATUS_COMPLETED = "Completada"
-    PRIORITY_URGENT = 3
-    PRIORITY_MEDIUM = 2
-    PRIORITY_LOW = 1
+    PRIORITY_URGENT = TaskPriority.URGENT
+    PRIORITY_MEDIUM = TaskPriority.MEDIUM
+    PRIORITY_LOW = TaskPriority.LOW
+
+    # Tablas precalculadas para traducir y validar estados y prioridades
+    # (se guardan enteros simples: comparar con un int es más rápido que con un miembro de IntEnum)
+    STATUS_CODE_BY_NAME = {STATUS_PENDING: int(TaskStatus.PENDING), STATUS_COMPLETED: int(TaskStatus.COMPLETED)}
+    STATUS_NAME_BY_CODE = {code: name for name, code in STATUS_CODE_BY_NAME.items()}
+    VALID_STATUSES = frozenset(STATUS_CODE_BY_NAME) | frozenset(TaskStatus)
+    VALID_PRIORITIES = frozenset(TaskPriority)
 
     def __init__(self, task_id: int, title: str, description: str,
-                 status: str = STATUS_PENDING, priority: int = PRIORITY_LOW):
+                 status: str | TaskStatus = STATUS_PENDING, priority: int = PRIORITY_LOW,
+                 created_at: float | None = None, due_at: float | None = None,
+                 depends_on=()):
         """
         Inicializa una nueva tarea.
 
@@ -27,63 +97,149 @@ class Task:
             task_id: El ID numérico único asignado a esta tarea.
             title: El título de la tarea.
             description: La descripción de la tarea.
-            status: El estado inicial (por defecto "Pendiente").
+            status: El estado inicial, como texto o TaskStatus (por defecto "Pendiente").
             priority: La prioridad inicial (por defecto 1 - Bajo).
+            created_at: Instante de creación (por defecto, ahora).
+            due_at: Fecha límite opcional.
+            depends_on: IDs de las tareas de las que depende (por defecto, ninguna).
         """
         if not isinstance(task_id, int) or task_id <= 0:
             # Validar que el ID sea un entero positivo
             raise ValueError("task_id debe ser un entero positivo.")
         if not title:
              raise ValueError("El título no puede estar vacío.")
+        if status not in self.VALID_STATUSES:
+            raise ValueError(f"Estado '{status}' no reconocido.")
+        if priority not in self.VALID_PRIORITIES:
+            raise ValueError(f"Prioridad '{priority}' no reconocida.")
+        _check_timestamp(created_at, "created_at")
+        _check_timestamp(due_at, "due_at")
+        depends_on = self._check_dependencies(task_id, depends_on)
 
         self.task_id: int = task_id
         self.title: str = title
         self.description: str = description
-        self.status: str = status
+        # Los textos se traducen a su código; los códigos se guardan tal cual
+        self.status_code: int = self.STATUS_CODE_BY_NAME.get(status, status)
         self.priority: int = priority
+        self.created_at: float | None = time.time() if created_at is None else created_at
+        self.due_at: float | None = due_at
+        self.depends_on: tuple[int, ...] = depends_on
+        self.mod_seq: int = next_modification_seq()
+        self._listener = None # Lo asigna TaskIndex al registrar la tarea
+
+    @property
+    def status(self) -> str:
+        """Estado actual como texto ("Pendiente" o "Completada")."""
+        return self.STATUS_NAME_BY_CODE[self.status_code]
 
-    def changeStatus(self, newStatus: str) -> None:
-        """Actualiza el estado de la tarea."""
-        # Podrías añadir validación para asegurar que newStatus es válido
-        if newStatus in [self.STATUS_PENDING, self.STATUS_COMPLETED]:
-            self.status = newStatus
+    def changeStatus(self, newStatus: str | TaskStatus) -> None:
+        """Actualiza el estado de la tarea (acepta el texto o el código)."""
+        if newStatus in self.VALID_STATUSES:
+            self.status_code = self.STATUS_CODE_BY_NAME.get(newStatus, newStatus)
+            self.mod_seq = next_modification_seq()
         else:
             print(f"Advertencia: Estado '{newStatus}' no reconocido.")
 
+    def _notifyEdit(self, attribute: str, oldValue) -> None:
+        """Anota la modificación y avisa al índice que tiene registrada la tarea (si lo hay)."""
+        self.mod_seq = next_modification_seq()
+        # Las tareas creadas sin __init__ (task_codec, TaskRow) pueden no tener el atributo
+        listener = getattr(self, "_listener", None)
+        if listener is not None:
+            listener.task_edited(self, attribute, oldValue)
+
     def editTitle(self, newTitle: str) -> None:
         """Actualiza el título de la tarea."""
         if newTitle: # Evitar títulos vacíos
+             oldTitle = self.title
              self.title = newTitle
+             self._notifyEdit("title", oldTitle)
         else:
              print("Advertencia: El título no puede estar vacío.")
 
 
     def editDescription(self, newDescription: str = "") -> None:
         """Actualiza la descripción de la tarea."""
+        oldDescription = self.description
         self.description = newDescription
+        self._notifyEdit("description", oldDescription)
 
     def editPriority(self, newPriority: int) -> None:
         """Actualiza la prioridad de la tarea."""
-        # Podrías añadir validación para asegurar que la prioridad es válida
-        if newPriority in [self.PRIORITY_URGENT, self.PRIORITY_MEDIUM, self.PRIORITY_LOW]:
+        if newPriority in self.VALID_PRIORITIES:
+            oldPriority = self.priority
             self.priority = newPriority
+            self._notifyEdit("priority", oldPriority)
         else:
             print(f"Advertencia: Prioridad '{newPriority}' no reconocida.")
 
+    def editDueDate(self, newDueAt: float | None) -> None:
+        """Cambia la fecha límite (segundos desde la época) o la quita con None."""
+        _check_timestamp(newDueAt, "due_at")
+        oldDueAt = self.due_at
+        self.due_at = newDueAt
+        self._notifyEdit("due_at", oldDueAt)
+
+    @staticmethod
+    def _check_dependencies(task_id: int, depends_on) -> tuple[int, ...]:
+        """Valida los IDs de dependencias y los devuelve como tupla sin repetidos."""
+        ids = tuple(dict.fromkeys(depends_on))
+        for dependency_id in ids:
+            if isinstance(dependency_id, bool) or not isinstance(dependency_id, int) or dependency_id <= 0:
+                raise ValueError(f"Dependencia '{dependency_id}' no válida: debe ser un ID positivo.")
+            if dependency_id == task_id:
+                raise ValueError("Una tarea no puede depender de sí misma.")
+        return ids
+
+    def editDependencies(self, newDependsOn) -> None:
+        """Reemplaza los IDs de las tareas de las que depende esta tarea."""
+        newDependsOn = self._check_dependencies(self.task_id, newDependsOn)
+        oldDependsOn = self.depends_on
+        self.depends_on = newDependsOn
+        self._notifyEdit("depends_on", oldDependsOn)
+
+    def isOverdue(self, now: float | None = None) -> bool:
+        """Indica si la tarea está pendiente y su fecha límite ya pasó."""
+        if self.due_at is None or self.status_code != TaskStatus.PENDING:
+            return False
+        return self.due_at <= (time.time() if now is None else now)
+
     def to_dict(self) -> dict:
         """Convierte la tarea a un diccionario para serialización."""
+        return self.dict_from_tuple(self.to_tuple())
+
+    def to_tuple(self) -> tuple:
+        """
+        Copia los atributos en una tupla (todos inmutables): mucho más barata
+        que to_dict, para copiar el estado en el hilo de la GUI y convertirlo
+        después en otro hilo con dict_from_tuple.
+        """
+        return (self.task_id, self.title, self.description, self.status_code, self.priority,
+                self.created_at, self.due_at, self.depends_on)
+
+    @classmethod
+    def dict_from_tuple(cls, values: tuple) -> dict:
+        """Diccionario de to_dict a partir de una tupla de to_tuple."""
+        task_id, title, description, status_code, priority, created_at, due_at, depends_on = values
         return {
-            "task_id": self.task_id,
-            "title": self.title,
-            "description": self.description,
-            "status": self.status,
-            "priority": self.priority,
-            # "created_at": self.created_at.isoformat() # Ejemplo
+            "task_id": task_id,
+            "title": title,
+            "description": description,
+            "status": cls.STATUS_NAME_BY_CODE[status_code],
+            "priority": int(priority),
+            "created_at": timestamp_to_iso(created_at),
+            "due_at": timestamp_to_iso(due_at),
+            "depends_on": list(depends_on),
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
-        """Crea una instancia de Task desde un diccionario."""
+        """
+        Crea una instancia de Task desde un diccionario.
+        Las fechas son opcionales (los archivos antiguos no las tienen; si
+        falta created_at se toma la hora de carga).
+        """
         # Añadir validación de datos del diccionario si es necesario
         try:
             return cls(
@@ -91,8 +247,10 @@ class Task:
                 title=data['title'],
                 description=data['description'],
                 status=data['status'],
-                priority=int(data['priority']) # Asegurar que la prioridad es int
-                # created_at=datetime.datetime.fromisoformat(data['created_at']) # Ejemplo
+                priority=int(data['priority']), # Asegurar que la prioridad es int
+                created_at=iso_to_timestamp(data.get('created_at')),
+                due_at=iso_to_timestamp(data.get('due_at')),
+                depends_on=tuple(int(dependency_id) for dependency_id in data.get('depends_on', ()))
             )
         except KeyError as e:
             raise ValueError(f"Falta la clave requerida en los datos del diccionario: {e}")
@@ -100,6 +258,14 @@ class Task:
              raise ValueError(f"Error al convertir datos del diccionario: {e}")
 
 
+    def __reduce__(self):
+        """
+        Pickle compacto: solo los valores de la tarea. Las vistas TaskRow
+        se serializan así como Task independientes, sin arrastrar su almacén.
+        """
+        return (Task, (self.task_id, self.title, self.description, self.status_code,
+                       int(self.priority), self.created_at, self.due_at, self.depends_on))
+
     def __repr__(self) -> str:
         """Representación útil para depuración."""
         return (f"Task(id={self.task_id}, title='{self.title}', "
@@ -113,4 +279,4 @@ class Task:
 
     def __hash__(self) -> int:
          """Permite usar tareas en sets o como claves de diccionario."""
-         return hash(self.task_id)
\ No newline at end of file
+         return hash(self.task_id)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Archivo en disco de tareas completadas antiguas.
+
+Las tareas se guardan en segmentos inmutables (un archivo por segmento con
+el formato binario de task_codec) que solo se añaden, nunca se reescriben.
+Así CompletedTasks puede sacar de memoria las tareas más antiguas y la
+interfaz puede leerlas segmento a segmento cuando el usuario las pide.
+"""
+import os
+import re
+
+from .Task import Task
+from .task_codec import HEADER_SIZE, decode_tasks, encode_tasks, read_task_count
+
+class TaskArchive:
+    """
+    Colección ordenada de segmentos de tareas en un directorio.
+
+    El segmento 0 es el más antiguo. Dentro de cada segmento las tareas van
+    de la más antigua a la más reciente (el mismo orden que en la pila).
+    """
+    SEGMENT_PATTERN = re.compile(r"^segment_(\d{6})\.tqs$")
+
+    def __init__(self, directory: str):
+        """
+        Abre (o crea) el archivo en 'directory' y lee cuántas tareas tiene
+        cada segmento (solo las cabeceras, no las tareas).
+        """
+        if not isinstance(directory, str) or not directory:
+            raise ValueError("directory debe ser una cadena no vacía.")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._segments: list[tuple[str, int]] = [] # (ruta, número de tareas)
+        numbers = sorted(int(match.group(1)) for match in map(self.SEGMENT_PATTERN.match, os.listdir(directory)) if match)
+        for number in numbers:
+            path = self._segment_path(number)
+            self._segments.append((path, self._read_count(path)))
+        self._next_number = numbers[-1] + 1 if numbers else 0
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"segment_{number:06d}.tqs")
+
+    @staticmethod
+    def _read_count(path: str) -> int:
+        """Lee el número de tareas de la cabecera de un segmento."""
+        with open(path, 'rb') as f:
+            return read_task_count(f.read(HEADER_SIZE))
+
+    def append(self, tasks: list[Task]) -> int:
+        """
+        Escribe las tareas (de la más antigua a la más reciente) en un
+        segmento nuevo. Se escribe en un archivo temporal y se renombra, de
+        modo que un segmento nunca queda a medias.
+
+        Returns:
+            El índice del segmento creado.
+        """
+        index = len(self._segments)
+        path = self._segment_path(self._next_number)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(encode_tasks(tasks))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        self._segments.append((path, len(tasks)))
+        self._next_number += 1
+        return index
+
+    def load_segment(self, index: int) -> list[Task]:
+        """Lee las tareas de un segmento (0 = el más antiguo)."""
+        path, _ = self._segments[index]
+        with open(path, 'rb') as f:
+            return decode_tasks(f.read())
+
+    def segment_size(self, index: int) -> int:
+        """Número de tareas del segmento, sin leerlo."""
+        return self._segments[index][1]
+
+    def truncate(self, segment_count: int) -> None:
+        """
+        Borra los segmentos a partir de 'segment_count'. Se usa al cargar
+        para descartar segmentos escritos después del último guardado.
+        """
+        while len(self._segments) > max(segment_count, 0):
+            path, _ = self._segments.pop()
+            os.remove(path)
+            self._next_number -= 1
+
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    def __len__(self) -> int:
+        """Número total de tareas archivadas."""
+        return sum(count for _, count in self._segments)
+
+    def __repr__(self) -> str:
+        return f"TaskArchive('{self.directory}', segmentos={len(self._segments)}, tareas={len(self)})"
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Índice global de tareas por ID, compartido por PendingTasks y CompletedTasks.
+"""
+from .Task import Task
+
+class TaskIndex:
+    """
+    Diccionario task_id -> (tarea, ubicación) que los contenedores mantienen
+    sincronizado al añadir, completar, eliminar y cargar tareas.
+
+    Permite encontrar y editar cualquier tarea por su ID en O(1) sin saber
+    en qué contenedor está. Las tareas archivadas en disco no se indexan
+    (son de solo lectura).
+
+    Otros índices (p. ej. TextSearchIndex) pueden suscribirse con
+    add_listener(); reciben las llamadas:
+        task_registered(task, location)
+        task_unregistered(task)
+        task_edited(task, attribute, old_value)
+        index_cleared()
+    Las tareas registradas avisan al índice de sus ediciones (Task._listener).
+    """
+    PENDING = "pending"
+    COMPLETED = "completed"
+
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._entries: dict[int, tuple[Task, str]] = {}
+        self._containers: dict[str, object] = {} # ubicación -> contenedor
+        self._listeners: list = []
+
+    def attach(self, location: str, container: object) -> None:
+        """Asocia el contenedor que gestiona las tareas de una ubicación."""
+        self._containers[location] = container
+
+    def add_listener(self, listener, replay: bool = True) -> None:
+        """
+        Suscribe un oyente a los cambios del índice. Con 'replay' recibe
+        primero un task_registered por cada tarea ya indexada.
+        """
+        self._listeners.append(listener)
+        if replay:
+            for task, location in self._entries.values():
+                listener.task_registered(task, location)
+
+    def remove_listener(self, listener) -> None:
+        """Cancela la suscripción de un oyente."""
+        self._listeners.remove(listener)
+
+    def has_listeners(self) -> bool:
+        """Indica si algún oyente recibe los cambios del índice."""
+        return bool(self._listeners)
+
+    def register(self, task: Task, location: str) -> None:
+        """Añade la tarea al índice o actualiza su ubicación."""
+        self._entries[task.task_id] = (task, location)
+        task._listener = self
+        for listener in self._listeners:
+            listener.task_registered(task, location)
+
+    def unregister(self, task_id: int) -> bool:
+        """Quita la tarea del índice. Devuelve True si estaba."""
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return False
+        task = entry[0]
+        task._listener = None
+        for listener in self._listeners:
+            listener.task_unregistered(task)
+        return True
+
+    def task_edited(self, task: Task, attribute: str, old_value) -> None:
+        """Lo llama una tarea registrada tras editarse; se reenvía a los oyentes."""
+        for listener in self._listeners:
+            listener.task_edited(task, attribute, old_value)
+
+    def lookup(self, task_id: int) -> tuple[Task, str] | None:
+        """Devuelve (tarea, ubicación), o None si el ID no está indexado."""
+        return self._entries.get(task_id)
+
+    def get(self, task_id: int, location: str | None = None) -> Task | None:
+        """Devuelve la tarea con ese ID (opcionalmente solo si está en 'location')."""
+        entry = self._entries.get(task_id)
+        if entry is None or (location is not None and entry[1] != location):
+            return None
+        return entry[0]
+
+    def locate(self, task_id: int) -> str | None:
+        """Devuelve la ubicación de la tarea (PENDING o COMPLETED) o None."""
+        entry = self._entries.get(task_id)
+        return entry[1] if entry is not None else None
+
+    def editTask(self, task_id: int, attribute: str, newValue) -> str | None:
+        """
+        Edita la tarea a través del contenedor que la tiene.
+
+        Returns:
+            La ubicación de la tarea editada, o None si no se encontró o
+            el valor no era válido.
+        """
+        location = self.locate(task_id)
+        container = self._containers.get(location)
+        if container is None:
+            return None
+        return location if container.editTask(task_id, attribute, newValue) else None
+
+    def clear(self) -> None:
+        for task, _ in self._entries.values():
+            task._listener = None
+        self._entries.clear()
+        for listener in self._listeners:
+            listener.index_cleared()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._entries
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Diario de cambios (write-ahead journal) de las tareas en formato JSONL.
+
+Cada alta, edición, compleción o eliminación se añade como una línea JSON
+al final del diario, en lugar de reescribir todo el archivo de tareas. El
+estado se reconstruye con la última instantánea más la reproducción del
+diario escrito después de ella.
+
+El diario se divide en generaciones (un archivo por generación, p. ej.
+"tasks_data.json.journal.000003"). Al compactar se abre una generación
+nueva y la instantánea anota desde qué generación hay que reproducir, así
+que las anteriores se pueden borrar en cuanto la instantánea está escrita.
+
+Tipos de registro ("op"):
+    add      {"task": {...}}                 Tarea pendiente nueva.
+    edit     {"id", "attr", "value"}         Edición de un atributo.
+    remove   {"id"}                          Tarea pendiente eliminada.
+    complete {"id", "task": {...}}           Tarea pendiente completada.
+    counter  {"value"}                       Último ID de tarea usado.
+    series   {"rules": [{...}, ...]}         Estado de las series recurrentes.
+"""
+import json
+import os
+import re
+
+from .Task import Task, TaskStatus
+from .TaskIndex import TaskIndex
+from .RecurrenceRule import RecurrenceRule
+
+class TaskJournal:
+    """
+    Oyente de TaskIndex que escribe un registro por cada cambio, en cuanto
+    ocurre.
+
+    Completar una tarea llega como task_unregistered (sale de pendientes)
+    seguido de task_registered en COMPLETED, y se escribe como "remove" más
+    "complete". Al reproducir, un "remove" seguido del "complete" de la
+    misma tarea se aplica como una sola compleción. Las bajas de tareas ya
+    completadas son tareas que pasan al archivo de completadas y no se
+    anotan: al reproducir el diario CompletedTasks las vuelve a archivar.
+    """
+    def __init__(self, path_prefix: str, generation: int):
+        """
+        Abre (para añadir) el archivo de la generación indicada.
+
+        Args:
+            path_prefix: Ruta base de los archivos del diario.
+            generation: Número de la generación en la que se escribe.
+        """
+        self.path_prefix = path_prefix
+        self.generation = generation
+        self.records_written = 0 # Registros desde la última instantánea
+        self._file = open(self.generation_path(path_prefix, generation), 'a', encoding='utf-8')
+
+    # --- Archivos ---
+
+    @staticmethod
+    def generation_path(path_prefix: str, generation: int) -> str:
+        return f"{path_prefix}.{generation:06d}"
+
+    @staticmethod
+    def generations(path_prefix: str) -> list[int]:
+        """Números de las generaciones que hay en disco, en orden."""
+        directory, base = os.path.split(path_prefix)
+        pattern = re.compile(rf"^{re.escape(base)}\.(\d{{6}})$")
+        return sorted(int(match.group(1)) for match in map(pattern.match, os.listdir(directory or '.')) if match)
+
+    @staticmethod
+    def read(path: str):
+        """
+        Generador de los registros de un archivo del diario. Una última línea
+        incompleta (escritura interrumpida) se ignora.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    print(f"Advertencia (TaskJournal): Registro incompleto al final de '{path}'. Se ignora.")
+                    break
+                yield json.loads(line)
+
+    def rotate(self) -> int:
+        """Cierra la generación actual y empieza la siguiente. Devuelve su número."""
+        self._file.close()
+        self.generation += 1
+        self.records_written = 0
+        self._file = open(self.generation_path(self.path_prefix, self.generation), 'a', encoding='utf-8')
+        return self.generation
+
+    @classmethod
+    def discard_before(cls, path_prefix: str, generation: int) -> None:
+        """Borra los archivos de las generaciones anteriores a 'generation'."""
+        for old in cls.generations(path_prefix):
+            if old < generation:
+                os.remove(cls.generation_path(path_prefix, old))
+
+    def flush(self, sync: bool = True) -> None:
+        """Vacía el búfer; con 'sync' también fuerza la escritura en disco."""
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    # --- Escritura ---
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush() # Al sistema operativo en cada registro; fsync solo en flush()
+        self.records_written += 1
+
+    def record_counter(self, last_id: int) -> None:
+        self._write({"op": "counter", "value": last_id})
+
+    def record_series(self, rules: list[RecurrenceRule]) -> None:
+        self._write({"op": "series", "rules": [rule.to_dict() for rule in rules]})
+
+    # --- Oyente de TaskIndex ---
+
+    def task_registered(self, task: Task, location: str) -> None:
+        if location == TaskIndex.PENDING:
+            self._write({"op": "add", "task": task.to_dict()})
+        else:
+            self._write({"op": "complete", "id": task.task_id, "task": task.to_dict()})
+
+    def task_unregistered(self, task: Task) -> None:
+        # Las completadas que salen del índice pasan al archivo: no se anotan
+        if task.status_code != TaskStatus.COMPLETED:
+            self._write({"op": "remove", "id": task.task_id})
+
+    def task_edited(self, task: Task, attribute: str, old_value) -> None:
+        value = getattr(task, attribute)
+        if isinstance(value, tuple):
+            value = list(value)
+        self._write({"op": "edit", "id": task.task_id, "attr": attribute, "value": value})
+
+    def index_cleared(self) -> None:
+        pass # Al cargar otro estado se abre un diario nuevo
+
+    # --- Reproducción ---
+
+    @classmethod
+    def replay(cls, path_prefix: str, from_generation: int, pending_tasks, completed_tasks,
+               recurrence=None) -> tuple[int, int]:
+        """
+        Aplica a los contenedores los registros de las generaciones
+        >= 'from_generation', en orden.
+
+        Returns:
+            (último ID visto en el diario, número de registros leídos).
+        """
+        index = pending_tasks.index
+        last_id = 0
+        count = 0
+        held_remove = None # "remove" que puede ser la primera mitad de una compleción
+
+        def apply(record: dict) -> None:
+            nonlocal last_id
+            try:
+                last_id = max(last_id, cls._apply(record, index, pending_tasks, completed_tasks, recurrence))
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Advertencia (TaskJournal.replay): Registro no válido: {e} -> {record}. Se ignora.")
+
+        for generation in cls.generations(path_prefix):
+            if generation < from_generation:
+                continue
+            for record in cls.read(cls.generation_path(path_prefix, generation)):
+                count += 1
+                if held_remove is not None:
+                    if not (record.get("op") == "complete" and record.get("id") == held_remove.get("id")):
+                        apply(held_remove) # Era una eliminación
+                    held_remove = None
+                if record.get("op") == "remove":
+                    held_remove = record
+                else:
+                    apply(record)
+        if held_remove is not None:
+            apply(held_remove)
+        return last_id, count
+
+    @staticmethod
+    def _apply(record: dict, index: TaskIndex, pending_tasks, completed_tasks, recurrence) -> int:
+        """Aplica un registro y devuelve el mayor ID que aparece en él (0 si ninguno)."""
+        match record["op"]:
+            case "add":
+                task = Task.from_dict(record["task"])
+                pending_tasks.addTask(task)
+                return task.task_id
+            case "edit":
+                index.editTask(int(record["id"]), record["attr"], record["value"])
+            case "remove":
+                task = index.get(int(record["id"]), TaskIndex.PENDING)
+                if task is not None:
+                    pending_tasks.removeTask(task)
+            case "complete":
+                task_id = int(record["id"])
+                queue = pending_tasks.tasks
+                if not queue.isEmpty() and queue.peek().task_id == task_id:
+                    task = pending_tasks.completeTask() # Como la primera vez (cuenta para el envejecimiento)
+                else:
+                    task = pending_tasks.completeTaskById(task_id)
+                    if task is None:
+                        task = Task.from_dict(record["task"])
+                completed_tasks.addTask(task)
+                return task_id
+            case "counter":
+                return int(record["value"])
+            case "series":
+                rules = [RecurrenceRule.from_dict(rule) for rule in record["rules"]]
+                if recurrence is not None:
+                    recurrence.clear()
+                    for rule in rules:
+                        recurrence.addRule(rule)
+                return max((rule.rule_id for rule in rules), default=0)
+            case op:
+                raise ValueError(f"Operación '{op}' desconocida")
+        return 0
+
+    def __repr__(self) -> str:
+        return f"TaskJournal('{self.path_prefix}', generación={self.generation}, registros={self.records_written})"
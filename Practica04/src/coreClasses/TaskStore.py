@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Almacén columnar de tareas.
+
+Guarda las tareas en columnas paralelas (id, prioridad, estado) y los textos
+en una tabla de cadenas compartida. Las consultas agregadas ("cuántas tareas
+urgentes pendientes hay") y las ediciones masivas de prioridad se resuelven
+con operaciones sobre bytes completos (count, translate, operaciones de bits
+sobre enteros grandes) que se ejecutan en C, sin recorrer objetos Python.
+"""
+import math
+import sys
+from array import array
+
+from .Task import Task, TaskStatus, next_modification_seq
+
+# Código de estado de las filas eliminadas (ningún estado válido usa el 0)
+DELETED = 0
+
+def _match_table(code: int) -> bytes:
+    """Tabla para bytes.translate: 0xFF donde el byte vale 'code', 0x00 en el resto."""
+    table = bytearray(256)
+    table[code] = 0xFF
+    return bytes(table)
+
+# Tablas precalculadas para los códigos de estado y prioridad (todos < 256)
+_MATCH_TABLES = [_match_table(code) for code in range(256)]
+
+# Las columnas de fechas guardan NaN para "sin fecha"
+_NO_TIME = float("nan")
+
+def _time_or_none(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+class TaskRow(Task):
+    """
+    Vista ligera de una fila de TaskStore con la misma interfaz que Task.
+
+    No guarda datos propios: cada atributo lee o escribe la columna
+    correspondiente del almacén, así que los métodos heredados de Task
+    (editTitle, editPriority, changeStatus, to_dict...) funcionan sin cambios.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: 'TaskStore', row: int):
+        """No llama a Task.__init__: los datos ya están validados en el almacén."""
+        self._store = store
+        self._row = row
+
+    @property
+    def task_id(self) -> int:
+        return self._store._ids[self._row]
+
+    @property
+    def title(self) -> str:
+        return self._store._strings[self._store._titles[self._row]]
+
+    @title.setter
+    def title(self, value: str) -> None:
+        self._store._titles[self._row] = self._store._intern(value)
+
+    @property
+    def description(self) -> str:
+        return self._store._strings[self._store._descriptions[self._row]]
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._store._descriptions[self._row] = self._store._intern(value)
+
+    @property
+    def status_code(self) -> int:
+        return self._store._statuses[self._row]
+
+    @status_code.setter
+    def status_code(self, value: int) -> None:
+        self._store._statuses[self._row] = value
+
+    @property
+    def priority(self) -> int:
+        return self._store._priorities[self._row]
+
+    @priority.setter
+    def priority(self, value: int) -> None:
+        self._store._priorities[self._row] = value
+
+    @property
+    def created_at(self) -> float | None:
+        return _time_or_none(self._store._created[self._row])
+
+    @created_at.setter
+    def created_at(self, value: float | None) -> None:
+        self._store._created[self._row] = _NO_TIME if value is None else value
+
+    @property
+    def depends_on(self) -> tuple[int, ...]:
+        return self._store._depends_on.get(self._row, ())
+
+    @depends_on.setter
+    def depends_on(self, value: tuple[int, ...]) -> None:
+        if value:
+            self._store._depends_on[self._row] = value
+        else:
+            self._store._depends_on.pop(self._row, None)
+
+    @property
+    def due_at(self) -> float | None:
+        return _time_or_none(self._store._due[self._row])
+
+    @due_at.setter
+    def due_at(self, value: float | None) -> None:
+        self._store._due[self._row] = _NO_TIME if value is None else value
+
+    @property
+    def mod_seq(self) -> int:
+        return self._store._mod_seqs[self._row]
+
+    @mod_seq.setter
+    def mod_seq(self, value: int) -> None:
+        self._store._mod_seqs[self._row] = value
+
+class TaskStore:
+    """
+    Almacén columnar de tareas.
+
+    Cada tarea ocupa una fila: un entero de 64 bits para el id, un byte para
+    la prioridad, un byte para el estado, dos índices a la tabla de cadenas
+    (título y descripción), dos float64 para las fechas (NaN = sin fecha) y el número de modificación (Task.mod_seq). Los textos repetidos se guardan una sola vez.
+    Las filas eliminadas se marcan con estado y prioridad 0 y no se reutilizan,
+    así que las vistas TaskRow siguen apuntando a su fila.
+    """
+    def __init__(self):
+        """Inicializa un almacén vacío."""
+        self._ids = array('q')
+        self._priorities = bytearray()
+        self._statuses = bytearray()
+        self._titles = array('I')
+        self._descriptions = array('I')
+        self._created = array('d')
+        self._due = array('d')
+        self._mod_seqs = array('Q')
+        self._depends_on: dict[int, tuple[int, ...]] = {} # fila -> dependencias (solo las que tienen)
+        self._strings: list[str] = []
+        self._string_refs: dict[str, int] = {}
+        self._rows: dict[int, int] = {} # task_id -> fila
+        self._views: dict[int, TaskRow] = {} # task_id -> vista (una por tarea)
+
+    def _intern(self, text: str) -> int:
+        """Devuelve el índice del texto en la tabla de cadenas, añadiéndolo si es nuevo."""
+        ref = self._string_refs.get(text)
+        if ref is None:
+            ref = len(self._strings)
+            self._strings.append(text)
+            self._string_refs[text] = ref
+        return ref
+
+    def add(self, task: Task) -> TaskRow:
+        """
+        Copia una tarea al almacén y devuelve su vista.
+        Si la tarea ya está en el almacén devuelve la vista existente.
+        """
+        view = self._views.get(task.task_id)
+        if view is not None:
+            return view
+        row = len(self._ids)
+        self._ids.append(task.task_id)
+        self._priorities.append(task.priority)
+        self._statuses.append(task.status_code)
+        self._titles.append(self._intern(task.title))
+        self._descriptions.append(self._intern(task.description))
+        self._created.append(_NO_TIME if task.created_at is None else task.created_at)
+        self._due.append(_NO_TIME if task.due_at is None else task.due_at)
+        self._mod_seqs.append(task.mod_seq)
+        if task.depends_on:
+            self._depends_on[row] = task.depends_on
+        self._rows[task.task_id] = row
+        view = TaskRow(self, row)
+        self._views[task.task_id] = view
+        return view
+
+    def get(self, task_id: int) -> TaskRow | None:
+        """Devuelve la vista de la tarea con ese id, o None si no está."""
+        return self._views.get(task_id)
+
+    def remove(self, task_id: int) -> bool:
+        """
+        Marca la fila de la tarea como eliminada.
+
+        Returns:
+            True si la tarea estaba en el almacén.
+        """
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return False
+        del self._views[task_id]
+        self._statuses[row] = DELETED
+        self._priorities[row] = DELETED
+        self._depends_on.pop(row, None)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._rows
+
+    # --- Operaciones vectorizadas ---
+
+    def _mask(self, status: int | None, priority: int | None) -> int | None:
+        """
+        Máscara de las filas que cumplen los filtros: un entero grande con un
+        byte 0xFF por fila que coincide. None si no hay ningún filtro.
+        """
+        mask = None
+        if status is not None:
+            mask = int.from_bytes(self._statuses.translate(_MATCH_TABLES[status]), 'big')
+        if priority is not None:
+            priority_mask = int.from_bytes(self._priorities.translate(_MATCH_TABLES[priority]), 'big')
+            mask = priority_mask if mask is None else mask & priority_mask
+        return mask
+
+    def count(self, status: int | None = None, priority: int | None = None) -> int:
+        """Cuenta las tareas con ese estado y/o prioridad (None = cualquiera)."""
+        if status is None and priority is None:
+            return len(self)
+        # Con un único filtro basta con bytearray.count
+        if priority is None:
+            return self._statuses.count(status)
+        if status is None:
+            return self._priorities.count(priority)
+        return self._mask(status, priority).bit_count() // 8
+
+    def select(self, status: int | None = None, priority: int | None = None) -> list[TaskRow]:
+        """Devuelve, en orden de inserción, las vistas de las tareas que cumplen los filtros."""
+        n = len(self._ids)
+        mask = self._mask(status, priority)
+        if mask is None:
+            return list(self._views.values())
+        mask_bytes = mask.to_bytes(n, 'big')
+        ids, views = self._ids, self._views
+        result = []
+        # bytes.find salta en C por las filas que no coinciden
+        row = mask_bytes.find(0xFF)
+        while row != -1:
+            result.append(views[ids[row]])
+            row = mask_bytes.find(0xFF, row + 1)
+        return result
+
+    def set_priority(self, new_priority: int, status: int | None = None, priority: int | None = None) -> int:
+        """
+        Cambia a 'new_priority' la prioridad de todas las tareas que cumplen los
+        filtros, en una sola pasada sobre la columna.
+
+        Returns:
+            El número de tareas modificadas.
+        """
+        if new_priority not in Task.VALID_PRIORITIES:
+            raise ValueError(f"Prioridad '{new_priority}' no reconocida.")
+        n = len(self._ids)
+        # Las filas eliminadas nunca se modifican
+        mask = self._mask(status, priority)
+        alive = int.from_bytes(self._statuses.translate(_MATCH_TABLES[DELETED]), 'big') ^ ((1 << (8 * n)) - 1)
+        mask = alive if mask is None else mask & alive
+        updated = mask.bit_count() // 8
+        if updated:
+            old = int.from_bytes(self._priorities, 'big')
+            fill = int.from_bytes(bytes([new_priority]) * n, 'big')
+            self._priorities[:] = ((old & ~mask) | (fill & mask)).to_bytes(n, 'big')
+            self._stamp(mask, next_modification_seq())
+        return updated
+
+    def _stamp(self, mask: int, seq: int) -> None:
+        """Pone 'seq' como número de modificación de las filas de la máscara (también en una pasada)."""
+        n = len(self._ids)
+        # Cada byte de la máscara (0 o 0xFF) se repite en los 8 bytes de su fila de la columna
+        mask_bytes = mask.to_bytes(n, 'big')
+        wide = bytearray(8 * n)
+        for offset in range(8):
+            wide[offset::8] = mask_bytes
+        lanes = int.from_bytes(wide, sys.byteorder)
+        old = int.from_bytes(self._mod_seqs.tobytes(), sys.byteorder)
+        fill = int.from_bytes(array('Q', [seq]).tobytes() * n, sys.byteorder)
+        stamped = array('Q')
+        stamped.frombytes(((old & ~lanes) | (fill & lanes)).to_bytes(8 * n, sys.byteorder))
+        self._mod_seqs = stamped
+
+    def count_by_priority(self, status: int | None = None) -> dict[int, int]:
+        """Devuelve {prioridad: número de tareas} para el estado indicado."""
+        return {int(priority): self.count(status, priority) for priority in sorted(Task.VALID_PRIORITIES)}
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    store = TaskStore()
+    for i in range(1, 11):
+        store.add(Task(i, f"Tarea {i}", "", priority=(i % 3) + 1))
+    store.get(3).changeStatus(Task.STATUS_COMPLETED)
+    print("Urgentes pendientes:", store.count(TaskStatus.PENDING, Task.PRIORITY_URGENT))
+    print("Bajas pendientes:", [t.task_id for t in store.select(TaskStatus.PENDING, Task.PRIORITY_LOW)])
+    print("Subidas a media:", store.set_priority(Task.PRIORITY_MEDIUM, TaskStatus.PENDING, Task.PRIORITY_LOW))
+    print(store.count_by_priority(TaskStatus.PENDING))
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Índice invertido de texto sobre el título y la descripción de las tareas.
+
+Cada palabra (normalizada: sin tildes y en minúsculas) apunta al conjunto de
+IDs de las tareas que la contienen. Las palabras se guardan además en una
+lista ordenada, de modo que las búsquedas por prefijo ("tar" -> "tarea",
+"tarjeta") son una búsqueda binaria más un recorrido de las coincidencias.
+La lista ordenada se pone al día de forma perezosa en la siguiente búsqueda,
+así que indexar cientos de miles de tareas seguidas no paga una inserción
+ordenada por cada palabra nueva.
+
+Se mantiene de forma incremental como oyente de un TaskIndex: se actualiza al
+añadir, completar, eliminar o editar tareas, sin volver a recorrer la lista.
+Las tareas que llegan como oyente solo se apuntan y se trocean en palabras
+en la primera búsqueda, de modo que cargar un archivo grande no paga el
+coste de indexar si nunca se busca.
+"""
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+from .Task import Task
+
+_WORD_RE = re.compile(r"\w+")
+# Marcas diacríticas combinables que deja NFKD al separar "á" en "a" + "´"
+_COMBINING_RE = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+def normalize(text: str) -> str:
+    """Quita las tildes y pasa a minúsculas ("Canción" -> "cancion")."""
+    if text.isascii():
+        return text.lower() # Caso más habitual: no hay nada que descomponer
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text)).casefold()
+
+def tokenize(text: str) -> list[str]:
+    """Divide el texto en palabras normalizadas (con repeticiones, en orden)."""
+    return _WORD_RE.findall(normalize(text))
+
+class TextSearchIndex:
+    """
+    Índice palabra -> {task_id} con búsqueda por prefijo.
+
+    search("inf tri") devuelve los IDs de las tareas que tienen alguna
+    palabra que empieza por "inf" Y alguna que empieza por "tri", entre el
+    título y la descripción.
+    """
+    TEXT_ATTRIBUTES = ("title", "description")
+
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._postings: dict[str, set[int]] = {} # palabra -> IDs
+        self._task_words: dict[int, frozenset[str]] = {} # ID -> palabras (para poder quitarlas)
+        self._words: list[str] = [] # Palabras ordenadas (puede tener palabras ya sin tareas)
+        self._new_words: set[str] = set() # Palabras nuevas aún no insertadas en _words
+        self._stale = 0 # Palabras de _words que ya no tienen tareas
+        self._pending: dict[int, Task] = {} # Registradas pero aún sin indexar
+
+    # --- Mantenimiento ---
+
+    @staticmethod
+    def _task_text_words(task: Task) -> frozenset[str]:
+        return frozenset(tokenize(f"{task.title} {task.description}"))
+
+    def add(self, task: Task) -> None:
+        """Indexa la tarea (o la reindexa si ya estaba)."""
+        words = self._task_text_words(task)
+        old_words = self._task_words.get(task.task_id)
+        if old_words == words:
+            return
+        if old_words is not None:
+            self._discard_words(task.task_id, old_words - words)
+            words_to_add = words - old_words
+        else:
+            words_to_add = words
+        self._task_words[task.task_id] = words
+        postings = self._postings
+        for word in words_to_add:
+            ids = postings.get(word)
+            if ids is None:
+                postings[word] = {task.task_id}
+                if self._stale and self._is_listed(word):
+                    self._stale -= 1 # Vuelve a tener tareas: ya estaba en la lista
+                else:
+                    self._new_words.add(word)
+            else:
+                ids.add(task.task_id)
+
+    def _index_pending(self) -> None:
+        """Indexa las tareas apuntadas por el oyente (antes de buscar)."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        # Igual que add() para tareas nuevas, con todo en variables locales
+        postings, task_words = self._postings, self._task_words
+        new_words = []
+        for task in pending.values():
+            task_id = task.task_id
+            words = frozenset(_WORD_RE.findall(normalize(f"{task.title} {task.description}")))
+            task_words[task_id] = words
+            for word in words:
+                ids = postings.get(word)
+                if ids is None:
+                    postings[word] = {task_id}
+                    new_words.append(word)
+                else:
+                    ids.add(task_id)
+        for word in new_words:
+            if self._stale and self._is_listed(word):
+                self._stale -= 1
+            else:
+                self._new_words.add(word)
+
+    def remove(self, task_id: int) -> bool:
+        """Quita la tarea del índice. Devuelve True si estaba."""
+        if self._pending.pop(task_id, None) is not None:
+            return True
+        words = self._task_words.pop(task_id, None)
+        if words is None:
+            return False
+        self._discard_words(task_id, words)
+        return True
+
+    def _discard_words(self, task_id: int, words) -> None:
+        postings = self._postings
+        for word in words:
+            ids = postings[word]
+            ids.discard(task_id)
+            if not ids:
+                del postings[word]
+                if word in self._new_words:
+                    self._new_words.discard(word)
+                else:
+                    self._stale += 1 # Se quita de la lista en la próxima reconstrucción
+
+    def _is_listed(self, word: str) -> bool:
+        i = bisect_left(self._words, word)
+        return i < len(self._words) and self._words[i] == word
+
+    def _sync_words(self) -> None:
+        """Inserta las palabras nuevas en la lista ordenada, o la reconstruye si conviene."""
+        if not self._new_words and self._stale <= len(self._words) // 2:
+            return
+        if len(self._new_words) > len(self._words) // 8 or self._stale > len(self._words) // 2:
+            self._words = sorted(self._postings)
+            self._stale = 0
+        else:
+            for word in self._new_words:
+                insort(self._words, word)
+        self._new_words.clear()
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._task_words.clear()
+        self._words.clear()
+        self._new_words.clear()
+        self._stale = 0
+        self._pending.clear()
+
+    # --- Oyente de TaskIndex ---
+
+    def task_registered(self, task: Task, location: str) -> None:
+        if task.task_id in self._task_words:
+            self.add(task) # Ya indexada (cambio de ubicación): solo si cambió el texto
+        else:
+            self._pending[task.task_id] = task
+
+    def task_unregistered(self, task: Task) -> None:
+        self.remove(task.task_id)
+
+    def task_edited(self, task: Task, attribute: str, old_value) -> None:
+        # Las pendientes de indexar ya se leerán con su texto nuevo
+        if attribute in self.TEXT_ATTRIBUTES and task.task_id not in self._pending:
+            self.add(task)
+
+    def index_cleared(self) -> None:
+        self.clear()
+
+    # --- Búsqueda ---
+
+    def _words_with_prefix(self, prefix: str):
+        """Palabras indexadas que empiezan por 'prefix' (búsqueda binaria en la lista ordenada)."""
+        self._sync_words()
+        words, postings = self._words, self._postings
+        i = bisect_left(words, prefix)
+        while i < len(words) and words[i].startswith(prefix):
+            if words[i] in postings: # Saltar las palabras que ya no tienen tareas
+                yield words[i]
+            i += 1
+
+    def search(self, query: str) -> set[int]:
+        """
+        Devuelve los IDs de las tareas que contienen todas las palabras de la
+        consulta, cada una como prefijo de alguna palabra de la tarea.
+        Una consulta sin palabras devuelve un conjunto vacío.
+        """
+        prefixes = set(tokenize(query))
+        if not prefixes:
+            return set()
+        self._index_pending()
+        postings = self._postings
+        matches = []
+        for prefix in prefixes:
+            ids = set().union(*[postings[word] for word in self._words_with_prefix(prefix)])
+            if not ids:
+                return set() # Un prefijo sin coincidencias anula la búsqueda
+            matches.append(ids)
+        # Intersecar empezando por el conjunto más pequeño
+        matches.sort(key=len)
+        result = matches[0]
+        for ids in matches[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def matches(task: Task, query: str) -> bool:
+        """
+        Comprueba una tarea suelta contra la consulta sin usar el índice
+        (para tareas no indexadas, como las archivadas).
+        """
+        prefixes = set(tokenize(query))
+        if not prefixes:
+            return False
+        words = TextSearchIndex._task_text_words(task)
+        return all(any(word.startswith(prefix) for word in words) for prefix in prefixes)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._task_words or task_id in self._pending
+
+    def __len__(self) -> int:
+        """Número de tareas indexadas (o pendientes de indexar)."""
+        return len(self._task_words) + len(self._pending)
+
+    def __repr__(self) -> str:
+        return f"TextSearchIndex(tareas={len(self)}, palabras={len(self._postings)})"
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    index = TextSearchIndex()
+    index.add(Task(1, "Canción de cumpleaños", "Ensayar la canción"))
+    index.add(Task(2, "Comprar pan", "Pan integral para el cumpleaños"))
+    index.add(Task(3, "Informe trimestral", "Entregar al jefe"))
+    print(index)
+    print("'cancion':", index.search("cancion"))
+    print("'cump':", index.search("cump"))
+    print("'pan cump':", index.search("pan cump"))
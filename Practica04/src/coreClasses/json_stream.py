@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura incremental de un objeto JSON de nivel superior.
+
+json.load necesita todo el texto en memoria y construye de una vez todos
+los diccionarios. Aquí el archivo se lee por bloques y cada valor se
+decodifica con JSONDecoder.raw_decode en cuanto está completo en el búfer;
+las listas indicadas se recorren elemento a elemento, así que la memoria
+necesaria depende del tamaño de un elemento, no del archivo.
+"""
+import json
+import re
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 # Caracteres leídos en cada bloque
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_AFTER_VALUE = frozenset(",:]} \t\n\r") # Caracteres que pueden seguir a un valor completo
+_DECODER = json.JSONDecoder()
+
+class _Buffer:
+    """Ventana sobre el texto del archivo: lo ya consumido se descarta al leer más."""
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int) -> bool:
+        """Añade hasta 'size' caracteres al búfer. Devuelve False al llegar al final."""
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Salta los espacios y devuelve el siguiente carácter ('' al final)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self.fill(self.chunk_size):
+                return self.text[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON no válido: se esperaba '{char}' y se encontró '{found or 'fin del archivo'}'.")
+        self.pos += 1
+
+    def value(self):
+        """Decodifica el siguiente valor, leyendo más bloques hasta que esté completo."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+                # Un número cortado por el final del bloque ("12" de "12.5", "12e5")
+                # se decodifica igual: solo está completo si le sigue un separador
+                if self.eof or (end < len(self.text) and self.text[end] in _AFTER_VALUE):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(size)
+            size *= 2 # Valores muy largos: bloques cada vez mayores, no un reintento por bloque
+
+def iter_object(file, array_keys=(), chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Generador de los pares de un objeto JSON de nivel superior leído de
+    'file' (abierto en modo texto).
+
+    Para las claves de 'array_keys' (cuyo valor debe ser una lista) genera
+    un par (clave, elemento) por cada elemento; para el resto, un par
+    (clave, valor) con el valor completo.
+
+    Raises:
+        json.JSONDecodeError, ValueError: Si el JSON no es válido.
+    """
+    buffer = _Buffer(file, chunk_size)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+    else:
+        yield from _iter_members(buffer, array_keys)
+    if buffer.peek():
+        raise ValueError("JSON no válido: hay datos después del objeto.")
+
+def _iter_members(buffer: _Buffer, array_keys):
+    """Pares del objeto a partir de su primera clave, hasta su '}' incluida."""
+    while True:
+        key = buffer.value()
+        if not isinstance(key, str):
+            raise ValueError(f"JSON no válido: clave {key!r} que no es una cadena.")
+        buffer.expect(":")
+        if key in array_keys:
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield key, buffer.value()
+                    if buffer.peek() != ",":
+                        buffer.expect("]")
+                        break
+                    buffer.pos += 1
+        else:
+            yield key, buffer.value()
+        if buffer.peek() != ",":
+            buffer.expect("}")
+            return
+        buffer.pos += 1
@@ -4,11 +4,37 @@
 """
 Implementación manual y optimizada de una Cola (Queue) usando Cython
 con un buffer circular basado en un array C de punteros a objetos Python.
+
+Opcionalmente la capacidad se mantiene en potencias de dos, de modo que el
+'wrap-around' de los índices es una máscara de bits en lugar de un módulo,
+y el buffer puede encogerse cuando la ocupación baja tras una ráfaga.
+
+IndexedCythonQueue añade un índice clave -> posición para eliminar elementos
+de en medio de la cola en O(1) amortizado, dejando lápidas (huecos NULL)
+que se saltan al desencolar y se compactan cuando son demasiadas.
+
+BlockingCythonQueue envuelve una CythonQueue para usarla desde varios hilos
+productores y consumidores (put/get bloqueantes con capacidad máxima).
 """
 
+from collections.abc import Sequence
+from queue import Empty, Full
+from threading import Condition, Lock
+from time import monotonic
+
+from .task_codec import encode_tasks, decode_tasks
+
 # Importar funciones C para manejo de memoria y objetos Python
 from libc.stdlib cimport malloc, free
 from cpython.ref cimport PyObject, Py_INCREF, Py_DECREF
+cimport cython
+
+cdef inline int _next_power_of_two(int n):
+    """Devuelve la menor potencia de dos mayor o igual que n."""
+    cdef int power = 1
+    while power < n:
+        power <<= 1
+    return power
 
 # Definición de la clase Cython
 cdef class CythonQueue:
@@ -19,18 +45,50 @@ cdef class CythonQueue:
     cdef int count               # Número actual de elementos en la cola
     cdef int capacity            # Tamaño actual del array 'items'
     cdef int initial_capacity    # Capacidad inicial con la que empieza la cola
+    cdef bint power_of_two       # Capacidad siempre potencia de dos (índices con máscara)
+    cdef int mask                # capacity - 1 en modo potencia de dos
+    cdef double growth_factor    # Factor de crecimiento al llenarse el buffer
+    cdef double shrink_threshold # Ocupación mínima antes de encoger (0 = nunca)
+    cdef int tombstones          # Huecos (NULL) eliminados dentro de [head, head + count)
+    cdef long long head_seq      # Número de secuencia del elemento en 'head'
+    cdef long long removals      # Elementos quitados de en medio (dejando lápida) hasta ahora
+    cdef int* live_offsets       # Caché de lectura con lápidas: desplazamiento desde 'head' de cada elemento vivo
+    cdef long long live_head_seq # head_seq, removals y count con los que se construyó live_offsets
+    cdef long long live_removals
+    cdef int live_count
 
-    def __init__(self, int initial_capacity=10):
+    def __init__(self, int initial_capacity=10, bint power_of_two=False,
+                 double growth_factor=2.0, double shrink_threshold=0.0):
         """
         Inicializa la cola Cython.
 
         Args:
             initial_capacity: Tamaño inicial del buffer interno (defecto: 10).
-                              Debe ser mayor que 0.
+                              Debe ser mayor que 0. En modo potencia de dos
+                              se redondea a la siguiente potencia de dos.
+            power_of_two: Si es True, la capacidad es siempre potencia de dos
+                          y los índices se calculan con una máscara de bits.
+            growth_factor: Factor por el que se multiplica la capacidad al
+                           llenarse el buffer (defecto: 2.0). Mayor que 1.
+            shrink_threshold: Si la ocupación cae por debajo de esta fracción
+                              de la capacidad, el buffer se encoge dividiendo
+                              su capacidad por growth_factor (nunca por debajo
+                              de la inicial). 0 desactiva el encogimiento.
+                              Debe cumplir shrink_threshold * growth_factor < 1
+                              para no encoger y crecer alternadamente.
         """
         if initial_capacity <= 0:
             raise ValueError("La capacidad inicial debe ser mayor que 0")
+        if growth_factor <= 1.0:
+            raise ValueError("El factor de crecimiento debe ser mayor que 1")
+        if shrink_threshold < 0.0 or shrink_threshold * growth_factor >= 1.0:
+            raise ValueError("El umbral de encogimiento debe estar en [0, 1 / growth_factor)")
 
+        self.power_of_two = power_of_two
+        self.growth_factor = growth_factor
+        self.shrink_threshold = shrink_threshold
+        if power_of_two:
+            initial_capacity = _next_power_of_two(initial_capacity)
         self.initial_capacity = initial_capacity
         self.capacity = initial_capacity
         # Asignar memoria C para el array de punteros a objetos Python
@@ -41,9 +99,14 @@ cdef class CythonQueue:
             raise MemoryError("No se pudo asignar memoria para la cola")
 
         # Inicializar índices y contador
+        self.mask = self.capacity - 1
         self.head = 0
         self.tail = 0
         self.count = 0
+        self.tombstones = 0
+        self.head_seq = 0
+        self.removals = 0
+        self.live_offsets = NULL
         # Inicializar todos los punteros a NULL (importante)
         for i in range(self.capacity):
             self.items[i] = NULL
@@ -61,29 +124,44 @@ cdef class CythonQueue:
             # Liberar la memoria del array C
             free(self.items)
             self.items = NULL # Evitar doble liberación
+        free(self.live_offsets)
+        self.live_offsets = NULL
+
+    cdef inline int _wrap(self, int idx):
+        """Reduce un índice al rango del buffer (máscara o módulo según el modo)."""
+        if self.power_of_two:
+            return idx & self.mask
+        return idx % self.capacity
+
+    cpdef int get_capacity(self):
+        """Devuelve la capacidad actual del buffer interno."""
+        return self.capacity
 
     cpdef int size(self):
         """Devuelve el número actual de elementos en la cola."""
-        return self.count
+        return self.count - self.tombstones
 
     cpdef bint isEmpty(self):
         """Comprueba si la cola está vacía."""
         return self.count == 0
 
     cdef _resize(self, int new_capacity):
-        """Redimensiona el buffer interno a una nueva capacidad."""
-        print(f"CythonQueue: Redimensionando de {self.capacity} a {new_capacity}") # Debug
+        """Redimensiona el buffer interno a una nueva capacidad (>= count)."""
         # Asignar nuevo bloque de memoria C
         new_items = <PyObject**>malloc(new_capacity * sizeof(PyObject*))
         if not new_items:
             raise MemoryError("No se pudo asignar memoria para redimensionar la cola")
 
         # Copiar elementos existentes al nuevo array, manteniendo el orden FIFO
-        # y manejando el posible 'wrap-around' del buffer circular
+        # y manejando el posible 'wrap-around' del buffer circular.
+        # Las lápidas no se copian: redimensionar también compacta.
         cdef int i, j
+        cdef bint compacted = self.tombstones > 0
         j = 0
         for i in range(self.count):
-            idx = (self.head + i) % self.capacity # Índice en el array viejo
+            idx = self._wrap(self.head + i) # Índice en el array viejo
+            if self.items[idx] == NULL:
+                continue # Lápida
             new_items[j] = self.items[idx] # Copiar puntero (no necesita INCREF aquí)
             self.items[idx] = NULL # Limpiar puntero viejo (evita doble DECREF)
             j += 1
@@ -98,23 +176,95 @@ cdef class CythonQueue:
         # Actualizar atributos con el nuevo array y capacidad
         self.items = new_items
         self.head = 0 # El nuevo head siempre empieza en 0
-        self.tail = self.count # El nuevo tail es el número de elementos copiados
+        self.count = j
+        self.tombstones = 0
         self.capacity = new_capacity
+        self.mask = new_capacity - 1
+        self.tail = self._wrap(self.count) # El nuevo tail es el número de elementos copiados
+        if compacted:
+            self._on_compact()
+
+    cdef _on_compact(self):
+        """
+        Se llama tras eliminar las lápidas, cuando las posiciones de los
+        elementos cambiaron. Las subclases la usan para actualizar sus índices.
+        """
+        pass
+
+    cdef _trim_tombstones(self):
+        """
+        Descarta las lápidas de los extremos para que, si la cola no está
+        vacía, 'head' y la última posición siempre contengan un elemento.
+        """
+        while self.count > 0 and self.items[self.head] == NULL:
+            self.head = self._wrap(self.head + 1)
+            self.head_seq += 1
+            self.count -= 1
+            self.tombstones -= 1
+        while self.count > 0 and self.items[self._wrap(self.tail + self.capacity - 1)] == NULL:
+            self.tail = self._wrap(self.tail + self.capacity - 1)
+            self.count -= 1
+            self.tombstones -= 1
+
+    cdef object _remove_at(self, int offset):
+        """
+        Quita el elemento situado 'offset' posiciones detrás de 'head',
+        dejando una lápida en su lugar, y lo devuelve.
+        """
+        cdef int idx = self._wrap(self.head + offset)
+        cdef PyObject* item_ptr = self.items[idx]
+        py_item = <object>item_ptr
+        self.items[idx] = NULL
+        Py_DECREF(py_item) # Soltar la referencia del array C
+        self.tombstones += 1
+        self.removals += 1
+        self._trim_tombstones()
+        return py_item
+
+    cpdef compact(self):
+        """Elimina las lápidas reorganizando el buffer (O(n))."""
+        if self.tombstones > 0:
+            self._resize(self.capacity)
+
+    cdef int _grown_capacity(self):
+        """Calcula la capacidad tras crecer según growth_factor."""
+        cdef int new_capacity = <int>(self.capacity * self.growth_factor)
+        if new_capacity <= self.capacity:
+            new_capacity = self.capacity + 1
+        if self.power_of_two:
+            new_capacity = _next_power_of_two(new_capacity)
+        return new_capacity
+
+    cdef _maybe_shrink(self):
+        """
+        Encoge el buffer si la ocupación cayó por debajo del umbral,
+        liberando la memoria que dejó una ráfaga ya drenada.
+        """
+        if self.shrink_threshold <= 0.0 or self.capacity <= self.initial_capacity:
+            return
+        if self.count >= self.capacity * self.shrink_threshold:
+            return
+        cdef int new_capacity = <int>(self.capacity / self.growth_factor)
+        if self.power_of_two:
+            new_capacity = _next_power_of_two(new_capacity)
+        if new_capacity < self.initial_capacity:
+            new_capacity = self.initial_capacity
+        if self.count < new_capacity < self.capacity:
+            self._resize(new_capacity)
 
     cpdef enqueue(self, object item):
         """Añade un elemento al final de la cola."""
         # Verificar si el buffer está lleno y redimensionar si es necesario
         if self.count == self.capacity:
-            # Estrategia de crecimiento (ej. duplicar capacidad)
-            new_capacity = self.capacity * 2 if self.capacity > 0 else self.initial_capacity
-            self._resize(new_capacity)
+            # Estrategia de crecimiento configurable (por defecto duplicar capacidad)
+            self._resize(self._grown_capacity())
 
         # Incrementar el contador de referencia del objeto Python a añadir
         Py_INCREF(item)
         # Guardar el puntero al objeto en la posición 'tail'
         self.items[self.tail] = <PyObject*>item
         # Mover 'tail' a la siguiente posición, con 'wrap-around'
-        self.tail = (self.tail + 1) % self.capacity
+        self.tail = self._wrap(self.tail + 1)
         # Incrementar el número de elementos
         self.count += 1
 
@@ -135,15 +285,121 @@ cdef class CythonQueue:
         # 2. Limpiar la posición en nuestro array C
         self.items[self.head] = NULL
         # 3. Mover 'head' a la siguiente posición, con 'wrap-around'
-        self.head = (self.head + 1) % self.capacity
-        # 4. Decrementar el número de elementos
+        self.head = self._wrap(self.head + 1)
+        self.head_seq += 1
+        # 4. Decrementar el número de elementos (y saltar lápidas siguientes)
         self.count -= 1
+        self._trim_tombstones()
         # 5. Decrementar la referencia original que teníamos en el array C
         Py_DECREF(py_item)
-        # 6. Devolver el objeto Python (que ahora tiene el ref count correcto)
+        # 6. Liberar memoria si la cola quedó casi vacía tras una ráfaga
+        self._maybe_shrink()
+        # 7. Devolver el objeto Python (que ahora tiene el ref count correcto)
         return py_item
 
 
+    cpdef reserve(self, int min_capacity):
+        """
+        Garantiza que el buffer pueda alojar al menos 'min_capacity' elementos
+        sin redimensionarse de nuevo (una sola reserva para cargas masivas).
+        """
+        cdef int new_capacity = self.capacity
+        if min_capacity <= new_capacity:
+            return
+        while new_capacity < min_capacity:
+            new_capacity = max(<int>(new_capacity * self.growth_factor), new_capacity + 1)
+        if self.power_of_two:
+            new_capacity = _next_power_of_two(new_capacity)
+        self._resize(new_capacity)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef extend_from_list(self, list items):
+        """
+        Encola todos los elementos de una lista en orden, reservando
+        capacidad una sola vez y copiando los punteros en un bucle C.
+        """
+        cdef Py_ssize_t n = len(items)
+        cdef Py_ssize_t i
+        cdef int tail
+        cdef object item
+        if n == 0:
+            return
+        self.reserve(self.count + <int>n)
+        tail = self.tail
+        for i in range(n):
+            item = items[i]
+            Py_INCREF(item)
+            self.items[tail] = <PyObject*>item
+            tail = self._wrap(tail + 1)
+        self.tail = tail
+        self.count += <int>n
+
+    cpdef enqueue_many(self, object iterable):
+        """
+        Encola todos los elementos de un iterable en orden.
+        Los iterables que no son listas se materializan una vez para
+        conocer su tamaño y reservar la capacidad de golpe.
+        """
+        if type(iterable) is list:
+            self.extend_from_list(iterable)
+        else:
+            self.extend_from_list(list(iterable))
+
+    cpdef list dequeue_many(self, int n):
+        """
+        Elimina y devuelve hasta 'n' elementos del frente de la cola,
+        en orden FIFO. Devuelve una lista vacía si la cola está vacía.
+        """
+        if n < 0:
+            raise ValueError("n no puede ser negativo")
+        cdef list result = []
+        cdef int taken = 0
+        cdef int head = self.head
+        cdef PyObject* item_ptr
+        while taken < n and self.count > 0:
+            item_ptr = self.items[head]
+            head = self._wrap(head + 1)
+            self.head_seq += 1
+            self.count -= 1
+            if item_ptr == NULL:
+                self.tombstones -= 1 # Saltar lápida
+                continue
+            self.items[self._wrap(head + self.capacity - 1)] = NULL
+            # append añade su propia referencia; soltamos la del array C
+            result.append(<object>item_ptr)
+            Py_DECREF(<object>item_ptr)
+            taken += 1
+        self.head = head
+        self._trim_tombstones()
+        self._maybe_shrink()
+        return result
+
+    cpdef clear(self):
+        """
+        Vacía la cola. Si el encogimiento está activado, el buffer vuelve
+        a la capacidad inicial.
+        """
+        cdef int i, idx
+        cdef int head = self.head
+        cdef int count = self.count
+        cdef PyObject* item_ptr
+        # Dejar la cola vacía antes de soltar referencias (los destructores
+        # de los elementos podrían volver a usar la cola)
+        self.head = 0
+        self.tail = 0
+        self.count = 0
+        self.tombstones = 0
+        for i in range(count):
+            idx = self._wrap(head + i)
+            item_ptr = self.items[idx]
+            if item_ptr == NULL:
+                continue # Lápida
+            self.items[idx] = NULL
+            Py_DECREF(<object>item_ptr)
+        if self.shrink_threshold > 0.0 and self.capacity > self.initial_capacity:
+            self._resize(self.initial_capacity)
+
     cpdef object peek(self):
         """
         Devuelve el elemento al frente de la cola sin eliminarlo.
@@ -164,23 +420,425 @@ cdef class CythonQueue:
         cdef list result_list = []
         cdef int i
         for i in range(self.count):
-            idx = (self.head + i) % self.capacity
+            idx = self._wrap(self.head + i)
+            if self.items[idx] == NULL:
+                continue # Lápida
             # Convertir puntero a objeto y añadir a la lista (maneja ref count)
             result_list.append(<object>self.items[idx])
         return result_list
 
     # Métodos mágicos para una mejor integración con Python
     def __len__(self):
-        return self.count
+        return self.count - self.tombstones
 
     def __iter__(self):
         """Permite iterar sobre los elementos de la cola en orden FIFO."""
         cdef int i
         for i in range(self.count):
-            idx = (self.head + i) % self.capacity
+            idx = self._wrap(self.head + i)
+            if self.items[idx] == NULL:
+                continue # Lápida
             yield <object>self.items[idx] # yield maneja ref counting
 
+    cdef int _live_offset(self, Py_ssize_t index):
+        """
+        Desplazamiento desde 'head' del elemento en la posición lógica
+        'index' (0 <= index < len). Con lápidas no coinciden: se consulta una
+        tabla de los elementos vivos, que se rehace (O(n)) la primera vez
+        que se lee tras cambiar la cola. No modifica el buffer ni el índice.
+        """
+        cdef int i, j
+        if self.tombstones == 0:
+            return <int>index
+        if (self.live_offsets == NULL or self.live_head_seq != self.head_seq
+                or self.live_removals != self.removals or self.live_count != self.count):
+            free(self.live_offsets)
+            self.live_offsets = <int*>malloc((self.count - self.tombstones) * sizeof(int))
+            if not self.live_offsets:
+                raise MemoryError("No se pudo asignar memoria para leer la cola")
+            j = 0
+            for i in range(self.count):
+                if self.items[self._wrap(self.head + i)] != NULL:
+                    self.live_offsets[j] = i
+                    j += 1
+            self.live_head_seq = self.head_seq
+            self.live_removals = self.removals
+            self.live_count = self.count
+        return self.live_offsets[index]
+
+    cdef object _item_at(self, Py_ssize_t index):
+        """Devuelve el elemento en la posición 'index' (0 = frente; admite negativos)."""
+        cdef Py_ssize_t n = self.count - self.tombstones
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("índice de cola fuera de rango")
+        return <object>self.items[self._wrap(self.head + self._live_offset(index))]
+
+    def __getitem__(self, index):
+        """
+        Acceso por posición en O(1) (0 = frente de la cola). Admite índices
+        negativos y slices, que devuelven una lista. Es de solo lectura: si
+        hay lápidas, la primera lectura tras un cambio recorre la cola una
+        vez para situar los elementos vivos (ver _live_offset).
+        """
+        if isinstance(index, slice):
+            return [self._item_at(i) for i in range(*index.indices(self.count - self.tombstones))]
+        return self._item_at(index)
+
+    def view(self):
+        """Devuelve una vista de solo lectura de la cola que no copia los elementos."""
+        return CythonQueueView(self)
+
+    # --- Serialización ---
+
+    def __reduce__(self):
+        """
+        Permite usar pickle: se guardan los parámetros de construcción y los
+        elementos vivos en orden FIFO (una sola pasada, sin lápidas).
+        """
+        return (type(self),
+                (self.initial_capacity, self.power_of_two, self.growth_factor, self.shrink_threshold),
+                self.get_items_list())
+
+    def __setstate__(self, list items):
+        """Restaura los elementos guardados por __reduce__."""
+        self.extend_from_list(items)
+
+    def to_bytes(self):
+        """Codifica las tareas de la cola (en orden FIFO) con el formato binario de task_codec."""
+        return encode_tasks(self)
+
+    @classmethod
+    def from_bytes(cls, data, *args, **kwargs):
+        """
+        Crea una cola con las tareas codificadas por to_bytes.
+        Los argumentos adicionales se pasan al constructor.
+        """
+        queue = cls(*args, **kwargs)
+        queue.extend_from_list(decode_tasks(data))
+        return queue
+
+    def __repr__(self):
+        """Representación textual de la cola."""
+        items_str = ", ".join(repr(item) for item in self)
+        return f"CythonQueue([{items_str}])"
+
+
+cdef class CythonQueueView:
+    """
+    Vista de solo lectura de una CythonQueue.
+
+    len, índices, slices e iteración leen directamente del buffer de la cola,
+    sin crear listas intermedias, y siempre reflejan su contenido actual.
+    """
+    cdef CythonQueue _queue
+
+    def __cinit__(self, CythonQueue queue):
+        self._queue = queue
+
+    def __len__(self):
+        return self._queue.count - self._queue.tombstones
+
+    def __getitem__(self, index):
+        return self._queue[index]
+
+    def __iter__(self):
+        return iter(self._queue)
+
+    def __reversed__(self):
+        cdef Py_ssize_t i
+        for i in range(len(self) - 1, -1, -1):
+            yield self._queue._item_at(i)
+
+    def __contains__(self, item):
+        """Busca el elemento (no la clave) recorriendo la cola: O(n)."""
+        for other in self._queue:
+            if other is item or other == item:
+                return True
+        return False
+
+    def __repr__(self):
+        return f"CythonQueueView(len={len(self)})"
+
+# La vista cumple el protocolo de secuencia de solo lectura
+Sequence.register(CythonQueueView)
+
+
+cdef class IndexedCythonQueue(CythonQueue):
+    """
+    Cola FIFO que además mantiene un índice clave -> número de secuencia,
+    de modo que buscar o eliminar un elemento por su clave es O(1) amortizado.
+
+    Al eliminar se deja una lápida en el buffer; las lápidas se saltan al
+    desencolar y se compactan (O(n)) cuando superan 'tombstone_ratio' de las
+    posiciones ocupadas, así que el coste de la compactación se reparte.
+    Las claves deben ser únicas.
+    """
+    cdef dict index              # clave -> número de secuencia del elemento
+    cdef object key_func         # Función que obtiene la clave de un elemento
+    cdef double tombstone_ratio  # Proporción de lápidas que dispara la compactación
+
+    def __init__(self, key, int initial_capacity=10, bint power_of_two=False,
+                 double growth_factor=2.0, double shrink_threshold=0.0,
+                 double tombstone_ratio=0.5):
+        """
+        Inicializa la cola indexada.
+
+        Args:
+            key: Función que devuelve la clave única de un elemento
+                 (ej. operator.attrgetter("task_id")).
+            tombstone_ratio: Proporción de lápidas sobre las posiciones
+                             ocupadas a partir de la cual se compacta (0-1].
+            El resto de argumentos son los de CythonQueue.
+        """
+        if not 0.0 < tombstone_ratio <= 1.0:
+            raise ValueError("tombstone_ratio debe estar en (0, 1]")
+        CythonQueue.__init__(self, initial_capacity, power_of_two, growth_factor, shrink_threshold)
+        self.index = {}
+        self.key_func = key
+        self.tombstone_ratio = tombstone_ratio
+
+    cdef _on_compact(self):
+        """Recalcula los números de secuencia tras compactar."""
+        cdef int i
+        self.index.clear()
+        for i in range(self.count):
+            self.index[self.key_func(<object>self.items[self._wrap(self.head + i)])] = self.head_seq + i
+
+    cdef _check_new_key(self, object key):
+        """Lanza ValueError si la clave ya está en la cola."""
+        if key in self.index:
+            raise ValueError(f"La clave {key!r} ya está en la cola")
+
+    cpdef enqueue(self, object item):
+        """Añade un elemento al final de la cola y lo indexa por su clave."""
+        key = self.key_func(item)
+        self._check_new_key(key)
+        CythonQueue.enqueue(self, item)
+        self.index[key] = self.head_seq + self.count - 1
+
+    cpdef extend_from_list(self, list items):
+        """Encola todos los elementos de una lista en orden y los indexa."""
+        cdef Py_ssize_t i, n = len(items)
+        cdef long long first_seq
+        keys = [self.key_func(item) for item in items]
+        if len(set(keys)) != n:
+            raise ValueError("La lista contiene claves repetidas")
+        for key in keys:
+            self._check_new_key(key)
+        CythonQueue.extend_from_list(self, items)
+        first_seq = self.head_seq + self.count - n
+        for i in range(n):
+            self.index[keys[i]] = first_seq + i
+
+    cpdef object dequeue(self):
+        """Elimina y devuelve el elemento al frente de la cola."""
+        item = CythonQueue.dequeue(self)
+        # Si la cola se encogió al desencolar, el índice ya se reconstruyó sin la clave
+        self.index.pop(self.key_func(item), None)
+        return item
+
+    cpdef list dequeue_many(self, int n):
+        """Elimina y devuelve hasta 'n' elementos del frente de la cola."""
+        cdef list result = CythonQueue.dequeue_many(self, n)
+        for item in result:
+            self.index.pop(self.key_func(item), None)
+        return result
+
+    cpdef clear(self):
+        """Vacía la cola y su índice."""
+        self.index.clear()
+        CythonQueue.clear(self)
+
+    cpdef object get(self, object key, object default=None):
+        """Devuelve el elemento con esa clave en O(1), o 'default' si no está."""
+        seq = self.index.get(key)
+        if seq is None:
+            return default
+        return <object>self.items[self._wrap(self.head + <int>(seq - self.head_seq))]
+
+    cpdef object remove(self, object key):
+        """
+        Elimina de la cola el elemento con esa clave en O(1) amortizado
+        y lo devuelve. Lanza KeyError si la clave no está.
+        """
+        seq = self.index.pop(key)
+        item = self._remove_at(<int>(seq - self.head_seq))
+        if self.tombstones > 0 and self.tombstones >= self.tombstone_ratio * self.count:
+            self._resize(self.capacity) # Compactar
+        else:
+            self._maybe_shrink()
+        return item
+
+    def __contains__(self, key):
+        """Indica si hay un elemento con esa clave (no compara elementos)."""
+        return key in self.index
+
+    def __reduce__(self):
+        """Como CythonQueue.__reduce__; la función de clave también debe poder serializarse."""
+        return (type(self),
+                (self.key_func, self.initial_capacity, self.power_of_two, self.growth_factor,
+                 self.shrink_threshold, self.tombstone_ratio),
+                self.get_items_list())
+
     def __repr__(self):
         """Representación textual de la cola."""
         items_str = ", ".join(repr(item) for item in self)
-        return f"CythonQueue([{items_str}])"
\ No newline at end of file
+        return f"IndexedCythonQueue([{items_str}])"
+
+
+
+cdef class BlockingCythonQueue:
+    """
+    Cola FIFO segura para hilos con varios productores y consumidores.
+
+    Sigue la interfaz de queue.Queue (put/get con 'block' y 'timeout',
+    lanzando queue.Full y queue.Empty) y añade operaciones por lotes.
+    Con maxsize > 0 los productores esperan cuando la cola está llena
+    (contrapresión). El candado solo se mantiene mientras se ejecuta la
+    operación en C sobre la CythonQueue interna; las esperas lo liberan.
+    """
+    cdef CythonQueue _queue
+    cdef readonly int maxsize
+    cdef object _mutex
+    cdef object _not_empty
+    cdef object _not_full
+
+    def __init__(self, int maxsize=0, int initial_capacity=10, bint power_of_two=False):
+        """
+        Inicializa la cola.
+
+        Args:
+            maxsize: Número máximo de elementos (0 = sin límite).
+            initial_capacity: Capacidad inicial del buffer interno.
+            power_of_two: Mantener la capacidad en potencias de dos.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize no puede ser negativo")
+        self.maxsize = maxsize
+        self._queue = CythonQueue(initial_capacity, power_of_two)
+        self._mutex = Lock()
+        self._not_empty = Condition(self._mutex)
+        self._not_full = Condition(self._mutex)
+
+    cdef inline int _free_slots(self):
+        """Huecos libres (-1 si la cola no tiene límite). Llamar con el candado tomado."""
+        if self.maxsize <= 0:
+            return -1
+        return self.maxsize - self._queue.size()
+
+    cdef _wait_not_full(self, bint block, object timeout):
+        """Espera a que haya sitio. Llamar con el candado tomado."""
+        if self._free_slots() != 0:
+            return
+        if not block:
+            raise Full
+        if timeout is None:
+            while self._free_slots() == 0:
+                self._not_full.wait()
+            return
+        if timeout < 0:
+            raise ValueError("'timeout' debe ser un número no negativo")
+        deadline = monotonic() + timeout
+        while self._free_slots() == 0:
+            remaining = deadline - monotonic()
+            if remaining <= 0.0:
+                raise Full
+            self._not_full.wait(remaining)
+
+    cdef _wait_not_empty(self, bint block, object timeout):
+        """Espera a que haya elementos. Llamar con el candado tomado."""
+        if self._queue.count > 0:
+            return
+        if not block:
+            raise Empty
+        if timeout is None:
+            while self._queue.count == 0:
+                self._not_empty.wait()
+            return
+        if timeout < 0:
+            raise ValueError("'timeout' debe ser un número no negativo")
+        deadline = monotonic() + timeout
+        while self._queue.count == 0:
+            remaining = deadline - monotonic()
+            if remaining <= 0.0:
+                raise Empty
+            self._not_empty.wait(remaining)
+
+    def put(self, item, bint block=True, timeout=None):
+        """
+        Añade un elemento al final de la cola. Si está llena espera (hasta
+        'timeout' segundos si se indica) y lanza queue.Full si no hay sitio.
+        """
+        with self._mutex:
+            self._wait_not_full(block, timeout)
+            self._queue.enqueue(item)
+            self._not_empty.notify()
+
+    def put_nowait(self, item):
+        """Equivale a put(item, block=False)."""
+        self.put(item, False)
+
+    def put_many(self, items, bint block=True, timeout=None):
+        """
+        Añade varios elementos en orden, en tantos tramos como permita la
+        capacidad. 'timeout' limita cada espera por sitio; si vence, lanza
+        queue.Full y los elementos ya añadidos quedan en la cola.
+        """
+        cdef list pending = list(items)
+        cdef Py_ssize_t start = 0, n = len(pending)
+        cdef int free
+        while start < n:
+            with self._mutex:
+                self._wait_not_full(block, timeout)
+                free = self._free_slots()
+                if free < 0 or free > n - start:
+                    free = n - start
+                self._queue.extend_from_list(pending[start:start + free])
+                start += free
+                self._not_empty.notify(free)
+
+    def get(self, bint block=True, timeout=None):
+        """
+        Extrae el elemento del frente. Si la cola está vacía espera (hasta
+        'timeout' segundos si se indica) y lanza queue.Empty si no llega ninguno.
+        """
+        with self._mutex:
+            self._wait_not_empty(block, timeout)
+            item = self._queue.dequeue()
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self):
+        """Equivale a get(block=False)."""
+        return self.get(False)
+
+    def get_many(self, int max_items, bint block=True, timeout=None):
+        """
+        Extrae hasta 'max_items' elementos en una sola sección crítica.
+        Espera solo hasta que haya al menos uno; devuelve los disponibles.
+        """
+        if max_items <= 0:
+            raise ValueError("max_items debe ser positivo")
+        with self._mutex:
+            self._wait_not_empty(block, timeout)
+            items = self._queue.dequeue_many(max_items)
+            self._not_full.notify(len(items))
+            return items
+
+    def qsize(self):
+        """Número aproximado de elementos (puede cambiar en cuanto se lee)."""
+        return self._queue.size()
+
+    def empty(self):
+        return self._queue.size() == 0
+
+    def full(self):
+        return 0 < self.maxsize <= self._queue.size()
+
+    def __len__(self):
+        return self._queue.size()
+
+    def __repr__(self):
+        return f"BlockingCythonQueue(size={self._queue.size()}, maxsize={self.maxsize})"
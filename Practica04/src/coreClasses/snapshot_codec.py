@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Formato binario de las instantáneas del estado de las tareas.
+
+Formato (little-endian):
+    cabecera: b"TQSN", versión (uint8), número de tareas (uint32), cuántas
+              de ellas son pendientes (uint32), último ID usado (int64) y
+              segmentos archivados (int32, -1 = sin archivo de completadas)
+    tabla de cadenas: número de cadenas (uint16) y, por cadena, su longitud
+              (uint16) y su texto en UTF-8. Guarda los nombres de los
+              estados: cada registro solo lleva el índice (uint8) del suyo.
+    registros: primero las pendientes en el orden de la cola y después las
+              completadas de la más reciente a la más antigua. Cada uno va
+              precedido de su longitud (uint32) y contiene:
+              task_id (int64), índice del estado (uint8), prioridad (uint8),
+              created_at y due_at (float64, NaN = sin fecha), número de
+              dependencias (uint16), longitudes del título y la descripción
+              (uint32), los IDs de las dependencias (int64) y el título y la
+              descripción en UTF-8.
+    series: longitud (uint32, 0 = sin series) y la lista de reglas
+              (RecurrenceRule.to_dict) en JSON UTF-8.
+    envejecimiento: longitud (uint32, 0 = sin él) y el estado de la cola por
+              prioridad (PendingTasks.agingState) en JSON UTF-8. Los
+              archivos anteriores terminan tras las series y se leen igual.
+
+A diferencia de task_codec (secuencias de tareas: segmentos de TaskArchive
+y CythonQueue.to_bytes), guarda todo lo que guarda el JSON de FileManager.
+Gracias a la longitud de cada registro se lee por bloques, y un lector
+puede saltarse los campos que una versión posterior añada al final de un
+registro.
+"""
+import io
+import json
+import math
+import struct
+
+from .Task import Task
+
+MAGIC = b"TQSN"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBIIqi")
+_COUNT = struct.Struct("<H")
+_LENGTH = struct.Struct("<I")
+_RECORD = struct.Struct("<qBBddHII")
+_NAN = float("nan")
+
+# Posición del último ID usado en la cabecera (se puede reescribir sin tocar el resto)
+COUNTER_OFFSET = struct.calcsize("<4sBII")
+COUNTER = struct.Struct("<q")
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024 # Bytes leídos en cada bloque
+_WRITE_BATCH = 10000 # Registros que se juntan antes de cada write
+
+def _status_table() -> tuple[list[str], dict[int, int]]:
+    """Nombres de los estados (tabla de cadenas) e índice de cada código en ella."""
+    names = list(Task.STATUS_NAME_BY_CODE.values())
+    return names, {Task.STATUS_CODE_BY_NAME[name]: index for index, name in enumerate(names)}
+
+def dump_snapshot(file, pending, completed, id_counter: int = 0,
+                  archived_segments: int | None = None, series: list | None = None,
+                  aging: dict | None = None) -> int:
+    """
+    Escribe una instantánea en 'file' (abierto en modo binario).
+
+    Args:
+        pending, completed: Secuencias de tuplas de Task.to_tuple (las
+                            completadas, de la más reciente a la más antigua).
+        id_counter: Último ID de tarea usado.
+        archived_segments: Segmentos de TaskArchive válidos (None: sin archivo).
+        series: Reglas de las series recurrentes (None: sin series).
+        aging: Envejecimiento de la cola por prioridad (None: sin él).
+
+    Returns:
+        El número de tareas escritas.
+    """
+    names, index_of = _status_table()
+    count = len(pending) + len(completed)
+    file.write(_HEADER.pack(MAGIC, VERSION, count, len(pending), id_counter,
+                            -1 if archived_segments is None else archived_segments))
+    table = [_COUNT.pack(len(names))]
+    for name in names:
+        encoded = name.encode("utf-8")
+        table.append(_COUNT.pack(len(encoded)))
+        table.append(encoded)
+    file.write(b"".join(table))
+
+    pack = _RECORD.pack
+    pack_length = _LENGTH.pack
+    record_size = _RECORD.size
+    parts = []
+    for tasks in (pending, completed):
+        for task_id, title, description, status_code, priority, created_at, due_at, depends_on in tasks:
+            title = title.encode("utf-8")
+            description = description.encode("utf-8")
+            dependencies = struct.pack(f"<{len(depends_on)}q", *depends_on) if depends_on else b""
+            parts.append(pack_length(record_size + len(dependencies) + len(title) + len(description)))
+            parts.append(pack(task_id, index_of[status_code], priority,
+                              _NAN if created_at is None else created_at, _NAN if due_at is None else due_at,
+                              len(depends_on), len(title), len(description)))
+            parts.append(dependencies)
+            parts.append(title)
+            parts.append(description)
+            if len(parts) >= 5 * _WRITE_BATCH:
+                file.write(b"".join(parts))
+                parts.clear()
+    file.write(b"".join(parts))
+
+    series_data = json.dumps(series, ensure_ascii=False).encode("utf-8") if series is not None else b""
+    file.write(_LENGTH.pack(len(series_data)))
+    file.write(series_data)
+    aging_data = json.dumps(aging).encode("utf-8") if aging is not None else b""
+    file.write(_LENGTH.pack(len(aging_data)))
+    file.write(aging_data)
+    return count
+
+def encode_snapshot(pending, completed, id_counter: int = 0,
+                    archived_segments: int | None = None, series: list | None = None,
+                    aging: dict | None = None) -> bytes:
+    """Como dump_snapshot, pero devuelve los bytes."""
+    buffer = io.BytesIO()
+    dump_snapshot(buffer, pending, completed, id_counter, archived_segments, series, aging)
+    return buffer.getvalue()
+
+class _Reader:
+    """Lectura por bloques de un archivo binario, con lo pendiente de leer en un búfer."""
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.data = b""
+        self.pos = 0
+
+    def need(self, size: int) -> None:
+        """Asegura que hay 'size' bytes en el búfer a partir de 'pos'."""
+        missing = size - (len(self.data) - self.pos)
+        if missing > 0:
+            chunk = self.file.read(max(self.chunk_size, missing))
+            self.data = self.data[self.pos:] + chunk
+            self.pos = 0
+            if len(chunk) < missing:
+                raise ValueError("Instantánea de tareas truncada.")
+
+    def at_end(self) -> bool:
+        """Indica si ya no queda nada por leer (ni en el búfer ni en el archivo)."""
+        if self.pos < len(self.data):
+            return False
+        self.data = self.file.read(self.chunk_size)
+        self.pos = 0
+        return not self.data
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        self.need(layout.size)
+        values = layout.unpack_from(self.data, self.pos)
+        self.pos += layout.size
+        return values
+
+    def take(self, size: int) -> bytes:
+        self.need(size)
+        value = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return value
+
+def read_header(reader: _Reader) -> dict:
+    """
+    Lee la cabecera y la tabla de cadenas.
+
+    Returns:
+        {"version", "task_count", "pending_count", "id_counter",
+         "archived_segments" (None si no hay archivo), "statuses" (código
+         de estado de cada índice de la tabla)}.
+
+    Raises:
+        ValueError: Si no es una instantánea de una versión conocida.
+    """
+    magic, version, task_count, pending_count, id_counter, archived_segments = reader.unpack(_HEADER)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Formato de instantánea no reconocido (cabecera {magic!r}, versión {version}).")
+    if pending_count > task_count:
+        raise ValueError("Cabecera de instantánea no válida: más pendientes que tareas.")
+    statuses = []
+    for _ in range(reader.unpack(_COUNT)[0]):
+        name = str(reader.take(reader.unpack(_COUNT)[0]), "utf-8")
+        if name not in Task.STATUS_CODE_BY_NAME:
+            raise ValueError(f"Estado '{name}' no reconocido en la instantánea.")
+        statuses.append(Task.STATUS_CODE_BY_NAME[name])
+    return {"version": version, "task_count": task_count, "pending_count": pending_count,
+            "id_counter": id_counter, "archived_segments": None if archived_segments < 0 else archived_segments,
+            "statuses": statuses}
+
+def read_snapshot(file, batch_size: int, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Generador de pares (clave, valor) con las claves de TaskStorage.read():
+    "archived_segments" (si hay archivo), lotes de hasta 'batch_size' tareas
+    de "pending_tasks" y de "completed_tasks", "recurring_series" (si hay
+    series), "pending_aging" (si se guardó) y, además, "id_counter". Lee 'file' (modo binario) por bloques
+    de 'chunk_size' bytes.
+
+    Las tareas se crean sin volver a pasar por Task.__init__ (como en
+    task_codec); sí se comprueban el estado y la prioridad.
+
+    Raises:
+        ValueError: Si los datos no tienen el formato esperado.
+    """
+    reader = _Reader(file, chunk_size)
+    header = read_header(reader)
+    yield "id_counter", header["id_counter"]
+    if header["archived_segments"] is not None:
+        yield "archived_segments", header["archived_segments"]
+
+    statuses = header["statuses"]
+    valid_priorities = Task.VALID_PRIORITIES
+    unpack_from = _RECORD.unpack_from
+    record_size = _RECORD.size
+    unpack_length = _LENGTH.unpack_from
+    isnan = math.isnan
+    new_task = Task.__new__
+    remaining = {"pending_tasks": header["pending_count"],
+                 "completed_tasks": header["task_count"] - header["pending_count"]}
+    try:
+        for key, count in remaining.items():
+            while count:
+                batch = []
+                for _ in range(min(batch_size, count)):
+                    reader.need(4)
+                    length = unpack_length(reader.data, reader.pos)[0]
+                    reader.pos += 4
+                    reader.need(length)
+                    data, start = reader.data, reader.pos
+                    (task_id, status_index, priority, created_at, due_at,
+                     dependency_count, title_len, description_len) = unpack_from(data, start)
+                    offset = start + record_size
+                    depends_on = struct.unpack_from(f"<{dependency_count}q", data, offset) if dependency_count else ()
+                    offset += 8 * dependency_count
+                    title_end = offset + title_len
+                    description_end = title_end + description_len
+                    if description_end > start + length:
+                        raise ValueError(f"Registro de la tarea {task_id} más largo que su longitud.")
+                    if status_index >= len(statuses) or priority not in valid_priorities:
+                        raise ValueError(f"Estado o prioridad no válidos en la tarea {task_id}.")
+                    task = new_task(Task)
+                    task.task_id = task_id
+                    task.title = str(data[offset:title_end], "utf-8")
+                    task.description = str(data[title_end:description_end], "utf-8")
+                    task.status_code = statuses[status_index]
+                    task.priority = priority
+                    task.created_at = None if isnan(created_at) else created_at
+                    task.due_at = None if isnan(due_at) else due_at
+                    task.depends_on = depends_on
+                    task.mod_seq = 0 # Igual que en disco: sin cambios por guardar
+                    task._listener = None
+                    batch.append(task)
+                    reader.pos = start + length # Salta los campos de versiones posteriores
+                count -= len(batch)
+                yield key, batch
+    except struct.error as e:
+        raise ValueError(f"Instantánea de tareas truncada: {e}")
+
+    series_length = reader.unpack(_LENGTH)[0]
+    if series_length:
+        yield "recurring_series", json.loads(str(reader.take(series_length), "utf-8"))
+    if not reader.at_end(): # Sección añadida después: los archivos anteriores no la tienen
+        aging_length = reader.unpack(_LENGTH)[0]
+        if aging_length:
+            yield "pending_aging", json.loads(str(reader.take(aging_length), "utf-8"))
+
+def decode_snapshot(data: bytes) -> dict:
+    """Decodifica los bytes de encode_snapshot en un diccionario como el de TaskStorage.read()."""
+    result = {"pending_tasks": [], "completed_tasks": []}
+    for key, value in read_snapshot(io.BytesIO(data), batch_size=len(data) or 1):
+        if key in result:
+            result[key].extend(value)
+        else:
+            result[key] = value
+    return result
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    pending = [Task(1, "Comprar pan", "Integral").to_tuple(), Task(3, "Pagar", "", depends_on=(1,)).to_tuple()]
+    completed = [Task(2, "Llamar", "", status=Task.STATUS_COMPLETED, priority=Task.PRIORITY_URGENT).to_tuple()]
+    data = encode_snapshot(pending, completed, id_counter=3)
+    print(len(data), "bytes ->", decode_snapshot(data))
@@ -0,0 +1,296 @@
+# distutils: language = c
+# cython: language_level=3
+# -*- coding: utf-8 -*-
+"""
+Implementación de una Pila (Stack) con Cython sobre un array C de punteros
+a objetos Python, siguiendo el mismo diseño que CythonQueue.
+
+Además de push/pop ofrece acceso por posición en O(1) en ambos sentidos,
+un iterador de cima a fondo y una vista LIFO de solo lectura que no copia
+los elementos (la usa CompletedTasks para mostrar la más reciente primero).
+"""
+from collections.abc import Sequence
+
+from libc.stdlib cimport malloc, free
+from libc.string cimport memmove
+from cpython.ref cimport PyObject, Py_INCREF, Py_DECREF
+cimport cython
+
+cdef class CythonStack:
+    # --- Atributos C definidos con cdef ---
+    cdef PyObject** items        # Array C de punteros; items[0] es el fondo
+    cdef int count               # Número actual de elementos
+    cdef int capacity            # Tamaño actual del array 'items'
+    cdef int initial_capacity    # Capacidad inicial
+
+    def __cinit__(self, int initial_capacity=10):
+        """Reserva el array C inicial."""
+        if initial_capacity <= 0:
+            raise ValueError("La capacidad inicial debe ser mayor que 0")
+        self.initial_capacity = initial_capacity
+        self.capacity = initial_capacity
+        self.count = 0
+        self.items = <PyObject**>malloc(self.capacity * sizeof(PyObject*))
+        if not self.items:
+            raise MemoryError("No se pudo asignar memoria para la pila Cython")
+
+    def __init__(self, int initial_capacity=10):
+        """
+        Inicializa una pila vacía.
+
+        Args:
+            initial_capacity: Número de elementos que caben sin redimensionar.
+                              Debe ser mayor que 0.
+        """
+        pass # Todo el trabajo se hace en __cinit__
+
+    def __dealloc__(self):
+        """Libera las referencias a los elementos y el array C."""
+        cdef int i
+        if self.items != NULL:
+            for i in range(self.count):
+                Py_DECREF(<object>self.items[i])
+            free(self.items)
+            self.items = NULL
+
+    cdef _resize(self, int new_capacity):
+        """Cambia el tamaño del array C conservando los elementos."""
+        cdef PyObject** new_items = <PyObject**>malloc(new_capacity * sizeof(PyObject*))
+        if not new_items:
+            raise MemoryError("No se pudo redimensionar la pila Cython")
+        cdef int i
+        for i in range(self.count):
+            new_items[i] = self.items[i] # Solo se mueven punteros: sin INCREF/DECREF
+        free(self.items)
+        self.items = new_items
+        self.capacity = new_capacity
+
+    cpdef reserve(self, int min_capacity):
+        """Asegura capacidad para 'min_capacity' elementos sin más redimensiones."""
+        cdef int new_capacity = self.capacity
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+        if new_capacity != self.capacity:
+            self._resize(new_capacity)
+
+    # --- Operaciones de pila ---
+
+    cpdef push(self, object item):
+        """Añade un elemento a la cima de la pila."""
+        if self.count == self.capacity:
+            self._resize(self.capacity * 2)
+        Py_INCREF(item)
+        self.items[self.count] = <PyObject*>item
+        self.count += 1
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef extend_from_list(self, list items):
+        """Apila todos los elementos de una lista en orden (el último queda en la cima)."""
+        cdef Py_ssize_t i, n = len(items)
+        self.reserve(self.count + <int>n)
+        for i in range(n):
+            item = items[i]
+            Py_INCREF(item)
+            self.items[self.count] = <PyObject*>item
+            self.count += 1
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef extend_bottom(self, list items):
+        """
+        Inserta los elementos de una lista debajo de los que ya hay. La lista
+        va de la cima hacia el fondo (orden LIFO, como lifo_view), así que su
+        último elemento queda en el fondo. Desplaza el resto con un único memmove.
+        """
+        cdef Py_ssize_t i, n = len(items)
+        if n == 0:
+            return
+        self.reserve(self.count + <int>n)
+        memmove(self.items + n, self.items, self.count * sizeof(PyObject*))
+        for i in range(n):
+            item = items[i]
+            Py_INCREF(item)
+            self.items[n - 1 - i] = <PyObject*>item
+        self.count += <int>n
+
+    def push_many(self, iterable):
+        """Apila los elementos de cualquier iterable, reservando capacidad una sola vez."""
+        self.extend_from_list(iterable if type(iterable) is list else list(iterable))
+
+    cpdef object pop(self):
+        """
+        Elimina y devuelve el elemento de la cima.
+        Lanza IndexError si la pila está vacía.
+        """
+        if self.count == 0:
+            raise IndexError("pop desde una pila vacía")
+        self.count -= 1
+        py_item = <object>self.items[self.count]
+        self.items[self.count] = NULL
+        Py_DECREF(py_item) # Soltar la referencia del array C
+        return py_item
+
+    cpdef list pop_bottom(self, int n):
+        """
+        Elimina y devuelve hasta 'n' elementos del fondo de la pila (los más
+        antiguos), del más antiguo al más reciente. Desplaza el resto con
+        un único memmove.
+        """
+        if n < 0:
+            raise ValueError("n no puede ser negativo")
+        if n > self.count:
+            n = self.count
+        cdef list result = []
+        cdef int i
+        for i in range(n):
+            # append añade su propia referencia; soltamos la del array C
+            result.append(<object>self.items[i])
+            Py_DECREF(<object>self.items[i])
+        memmove(self.items, self.items + n, (self.count - n) * sizeof(PyObject*))
+        self.count -= n
+        return result
+
+    cpdef object peek(self):
+        """
+        Devuelve el elemento de la cima sin eliminarlo.
+        Lanza IndexError si la pila está vacía.
+        """
+        if self.count == 0:
+            raise IndexError("peek en una pila vacía")
+        return <object>self.items[self.count - 1]
+
+    cpdef bint isEmpty(self):
+        """Comprueba si la pila está vacía."""
+        return self.count == 0
+
+    cpdef int size(self):
+        """Devuelve el número de elementos en la pila."""
+        return self.count
+
+    cpdef clear(self):
+        """Vacía la pila y vuelve a la capacidad inicial."""
+        cdef int i
+        cdef int count = self.count
+        self.count = 0
+        for i in range(count):
+            Py_DECREF(<object>self.items[i])
+            self.items[i] = NULL
+        if self.capacity != self.initial_capacity:
+            self._resize(self.initial_capacity)
+
+    cpdef list get_items_list(self, bint reverse=False):
+        """
+        Devuelve una lista con los elementos, del fondo a la cima
+        (o de la cima al fondo con reverse=True), en una sola copia.
+        """
+        cdef list result = []
+        cdef int i
+        if reverse:
+            for i in range(self.count - 1, -1, -1):
+                result.append(<object>self.items[i])
+        else:
+            for i in range(self.count):
+                result.append(<object>self.items[i])
+        return result
+
+    # --- Acceso por posición ---
+
+    cdef object _item_at(self, Py_ssize_t index):
+        """Elemento en la posición 'index' contando desde el fondo (admite negativos)."""
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("índice de pila fuera de rango")
+        return <object>self.items[index]
+
+    def __getitem__(self, index):
+        """Acceso en O(1) desde el fondo (0 = fondo, -1 = cima); los slices devuelven una lista."""
+        if isinstance(index, slice):
+            return [self._item_at(i) for i in range(*index.indices(self.count))]
+        return self._item_at(index)
+
+    def from_top(self, Py_ssize_t index):
+        """Acceso en O(1) desde la cima (0 = cima)."""
+        if index < 0:
+            index += self.count
+        return self._item_at(self.count - 1 - index)
+
+    def lifo_view(self):
+        """Vista de solo lectura en orden LIFO (0 = cima) que no copia los elementos."""
+        return CythonStackLIFOView(self)
+
+    # Métodos mágicos para una mejor integración con Python
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Permite iterar sobre la pila (desde fondo a cima), como Stack."""
+        cdef int i = 0
+        while i < self.count: # La pila pudo encogerse durante la iteración
+            yield <object>self.items[i]
+            i += 1
+
+    def __reversed__(self):
+        """Itera de la cima al fondo sin copiar."""
+        cdef int i = self.count - 1
+        while i >= 0:
+            if i < self.count: # La pila pudo encogerse durante la iteración
+                yield <object>self.items[i]
+            i -= 1
+
+    def __reduce__(self):
+        """Permite usar pickle: capacidad inicial y elementos del fondo a la cima."""
+        return (type(self), (self.initial_capacity,), self.get_items_list())
+
+    def __setstate__(self, list items):
+        """Restaura los elementos guardados por __reduce__."""
+        self.extend_from_list(items)
+
+    def __repr__(self):
+        """Representación textual de la pila (la cima al final)."""
+        return f"CythonStack({self.get_items_list()!r})"
+
+
+cdef class CythonStackLIFOView:
+    """
+    Vista de solo lectura de una CythonStack en orden LIFO: el índice 0 es
+    la cima. Lee directamente del array de la pila y siempre refleja su
+    contenido actual.
+    """
+    cdef CythonStack _stack
+
+    def __cinit__(self, CythonStack stack):
+        self._stack = stack
+
+    def __len__(self):
+        return self._stack.count
+
+    def __getitem__(self, index):
+        cdef Py_ssize_t n = self._stack.count
+        if isinstance(index, slice):
+            return [self._stack._item_at(n - 1 - i) for i in range(*index.indices(n))]
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("índice de pila fuera de rango")
+        return self._stack._item_at(n - 1 - index)
+
+    def __iter__(self):
+        return reversed(self._stack)
+
+    def __reversed__(self):
+        return iter(self._stack)
+
+    def __contains__(self, item):
+        """Busca el elemento recorriendo la pila: O(n)."""
+        for other in self._stack:
+            if other is item or other == item:
+                return True
+        return False
+
+    def __repr__(self):
+        return f"CythonStackLIFOView(len={self._stack.count})"
+
+# La vista cumple el protocolo de secuencia de solo lectura
+Sequence.register(CythonStackLIFOView)
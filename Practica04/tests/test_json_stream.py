@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de json_stream.iter_object: con cualquier tamaño de bloque debe
+dar lo mismo que json.loads, aunque un bloque corte un valor por la mitad.
+
+Uso (desde la carpeta Practica04):
+    python -m unittest discover -s tests
+"""
+import io
+import json
+import unittest
+
+from src.coreClasses.json_stream import iter_object
+
+DOCUMENTOS = [
+    '{"a": 1234.5}',
+    '{"a": 12e5, "b": 1}',
+    '{"a": -0.25E-3,"b":[1,2.5,-3e2 ,4],"c":true,"d":null}',
+    '{\n    "pending_tasks": [\n        {"task_id": 10, "title": "Café", "priority": 2, "due_at": 1718000000.125}\n    ],'
+    '\n    "archived_segments": 3,\n    "completed_tasks": [{"task_id": 7, "created_at": 1.5e9}, {"task_id": 8}]\n}',
+    '{}',
+    '{"lista": []}',
+]
+
+class TestIterObject(unittest.TestCase):
+
+    def test_todos_los_tamanos_de_bloque(self):
+        for texto in DOCUMENTOS:
+            esperado = json.loads(texto)
+            claves_lista = [clave for clave, valor in esperado.items() if isinstance(valor, list)]
+            for chunk_size in range(1, len(texto) + 2):
+                with self.subTest(texto=texto, chunk_size=chunk_size):
+                    obtenido = {clave: [] for clave in claves_lista}
+                    for clave, valor in iter_object(io.StringIO(texto), claves_lista, chunk_size):
+                        if clave in claves_lista:
+                            obtenido[clave].append(valor)
+                        else:
+                            obtenido[clave] = valor
+                    self.assertEqual(obtenido, esperado)
+
+    def test_json_no_valido(self):
+        for texto in ('{"a": 1', '{"a": 1.}', '{"a": 1} x', '[1]'):
+            for chunk_size in (1, 2, 3, 64):
+                with self.subTest(texto=texto, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError): # json.JSONDecodeError hereda de ValueError
+                        list(iter_object(io.StringIO(texto), (), chunk_size))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del envejecimiento de la planificación por prioridad al guardar y
+volver a cargar: las pendientes se siguen sirviendo en el mismo orden con
+cada motor de almacenamiento y en modo diario (también tras compactar).
+
+Requiere haber compilado la extensión (python setup.py build_ext --inplace).
+
+Uso (desde la carpeta Practica04):
+    python -m unittest discover -s tests
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.FileManager import FileManager
+from src.PendingTasks import PendingTasks
+from src.coreClasses.Task import Task
+
+def silencioso(funcion, *args, **kwargs):
+    """Ejecuta la función sin los mensajes de FileManager."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcion(*args, **kwargs)
+
+def llenar(pendientes: PendingTasks, completadas) -> None:
+    """
+    Tareas de prioridad baja y media que esperan mientras se sirven otras
+    urgentes (y suben de nivel), seguidas de urgentes nuevas.
+    """
+    pendientes.addTasks([Task(i, f"Baja {i}", "", priority=Task.PRIORITY_LOW) for i in range(1, 4)])
+    pendientes.addTasks([Task(i, f"Media {i}", "", priority=Task.PRIORITY_MEDIUM) for i in range(4, 7)])
+    pendientes.addTasks([Task(i, f"Urgente {i}", "", priority=Task.PRIORITY_URGENT) for i in range(7, 19)])
+    for _ in range(12):
+        completadas.addTask(pendientes.completeTask())
+    pendientes.addTasks([Task(i, f"Urgente {i}", "", priority=Task.PRIORITY_URGENT) for i in range(19, 29)])
+
+def orden(pendientes: PendingTasks) -> list[int]:
+    return [task.task_id for task in pendientes.taskList()]
+
+class TestEnvejecimientoPersistente(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def gestor(self, nombre: str, **kwargs) -> FileManager:
+        return silencioso(FileManager, os.path.join(self.directorio.name, nombre),
+                          os.path.join(self.directorio.name, nombre + "_contador.json"), **kwargs)
+
+    def cargar(self, gestor: FileManager):
+        return silencioso(gestor.load_all_data, scheduling=PendingTasks.SCHEDULING_PRIORITY)
+
+    def test_motores(self):
+        for nombre in ("tareas.json", "tareas.db", "tareas.bin"):
+            with self.subTest(nombre=nombre):
+                gestor = self.gestor(nombre)
+                pendientes, completadas = self.cargar(gestor)
+                llenar(pendientes, completadas)
+                esperado = orden(pendientes)
+                # El envejecimiento ya cambia el orden respecto a la prioridad sin más
+                prioridades = {task.task_id: task.priority for task in pendientes.taskList()}
+                self.assertNotEqual(esperado, sorted(esperado, key=lambda i: -prioridades[i]))
+                self.assertTrue(silencioso(gestor.save_all_data, pendientes, completadas))
+
+                pendientes, completadas = self.cargar(self.gestor(nombre))
+                self.assertEqual(orden(pendientes), esperado)
+                servidas = [pendientes.completeTask().task_id for _ in range(len(esperado))]
+                self.assertEqual(servidas, esperado)
+
+    def test_diario_y_compactacion(self):
+        gestor = self.gestor("diario.json", journal=True)
+        pendientes, completadas = self.cargar(gestor)
+        silencioso(gestor.save_all_data, pendientes, completadas) # Primera instantánea (vacía)
+        llenar(pendientes, completadas)
+        esperado = orden(pendientes)
+        self.assertTrue(silencioso(gestor.save_all_data, pendientes, completadas))
+        silencioso(gestor.close)
+
+        # Sin compactar: instantánea vacía + diario
+        gestor = self.gestor("diario.json", journal=True)
+        pendientes, completadas = self.cargar(gestor)
+        self.assertEqual(orden(pendientes), esperado)
+        # Tras compactar: todo en la instantánea
+        self.assertTrue(silencioso(gestor.compact, pendientes, completadas, wait=True))
+        silencioso(gestor.close)
+        gestor = self.gestor("diario.json", journal=True)
+        pendientes, completadas = self.cargar(gestor)
+        self.assertEqual(orden(pendientes), esperado)
+        silencioso(gestor.close)
+
+    def test_estado_no_valido(self):
+        pendientes = PendingTasks(scheduling=PendingTasks.SCHEDULING_PRIORITY)
+        pendientes.addTasks([Task(1, "A", ""), Task(2, "B", "")])
+        antes = pendientes.agingState()
+        for estado in ({"served": 1, "arrivals": 2, "tasks": [[1, 5, 0]]}, {"served": 0},
+                       {"served": 0, "arrivals": 1, "tasks": [[1, 0]]}):
+            with self.subTest(estado=estado):
+                with self.assertRaises((ValueError, TypeError, KeyError)):
+                    pendientes.restoreAging(estado)
+                self.assertEqual(pendientes.agingState(), antes)
+
+if __name__ == "__main__":
+    unittest.main()
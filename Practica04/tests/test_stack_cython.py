@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de CythonStack: recorrer la pila mientras se modifica no debe
+leer posiciones ya liberadas.
+
+Requiere haber compilado la extensión (python setup.py build_ext --inplace).
+
+Uso (desde la carpeta Practica04):
+    python -m unittest discover -s tests
+"""
+import unittest
+
+from src.coreClasses.stack_cython import CythonStack
+
+def crear_pila(n: int) -> CythonStack:
+    pila = CythonStack()
+    for i in range(n):
+        pila.push(i)
+    return pila
+
+class TestIteracionConCambios(unittest.TestCase):
+
+    def test_pop_durante_iteracion(self):
+        pila = crear_pila(5)
+        recorridos = []
+        for elemento in pila:
+            recorridos.append(elemento)
+            pila.pop()
+        self.assertEqual(recorridos, [0, 1, 2])
+        self.assertEqual(pila.get_items_list(), [0, 1])
+
+    def test_vaciar_durante_iteracion(self):
+        for recorrido in (iter, reversed, lambda pila: iter(pila.lifo_view())):
+            with self.subTest(recorrido=recorrido):
+                pila = crear_pila(5)
+                recorridos = []
+                for elemento in recorrido(pila):
+                    recorridos.append(elemento)
+                    while not pila.isEmpty():
+                        pila.pop()
+                self.assertEqual(len(recorridos), 1)
+                self.assertEqual(len(pila), 0)
+
+    def test_push_durante_iteracion(self):
+        pila = crear_pila(3)
+        recorridos = []
+        for elemento in pila:
+            recorridos.append(elemento)
+            if len(pila) < 6:
+                pila.push(elemento + 10)
+        self.assertEqual(recorridos, [0, 1, 2, 10, 11, 12])
+
+if __name__ == "__main__":
+    unittest.main()
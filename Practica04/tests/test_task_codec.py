@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de task_codec: ida y vuelta sin perder campos (también a través de
+CythonQueue.to_bytes/from_bytes) y lectura de las versiones anteriores.
+
+Requiere haber compilado la extensión (python setup.py build_ext --inplace).
+
+Uso (desde la carpeta Practica04):
+    python -m unittest discover -s tests
+"""
+import struct
+import unittest
+
+from src.coreClasses.Task import Task
+from src.coreClasses.queue_cython import CythonQueue
+from src.coreClasses.task_codec import decode_tasks, encode_tasks
+
+def crear_tareas() -> list[Task]:
+    return [Task(1, "Comprar pan", "Integral", created_at=1700000000.5),
+            Task(2, "Llamar", "", priority=Task.PRIORITY_URGENT, due_at=1800000000.0, depends_on=(1,)),
+            Task(3, "Pagar", "Ñandú", depends_on=(1, 2))]
+
+class TestTaskCodec(unittest.TestCase):
+
+    def test_ida_y_vuelta(self):
+        tareas = crear_tareas()
+        recuperadas = decode_tasks(encode_tasks(tareas))
+        self.assertEqual([task.to_dict() for task in recuperadas], [task.to_dict() for task in tareas])
+
+    def test_cola_conserva_dependencias(self):
+        cola = CythonQueue()
+        cola.extend_from_list(crear_tareas())
+        recuperada = CythonQueue.from_bytes(cola.to_bytes())
+        self.assertEqual([task.depends_on for task in recuperada], [(), (1,), (1, 2)])
+
+    def test_versiones_anteriores(self):
+        # Versión 2: con fechas, sin dependencias
+        titulo = "Tarea".encode("utf-8")
+        v2 = (struct.pack("<2sBI", b"TQ", 2, 1)
+              + struct.pack("<qBBIIdd", 7, Task.STATUS_CODE_BY_NAME[Task.STATUS_PENDING], 2, len(titulo), 0,
+                            1700000000.0, float("nan"))
+              + titulo)
+        tarea = decode_tasks(v2)[0]
+        self.assertEqual((tarea.task_id, tarea.title, tarea.priority, tarea.created_at, tarea.due_at, tarea.depends_on),
+                         (7, "Tarea", 2, 1700000000.0, None, ()))
+        # Versión 1: sin fechas ni dependencias
+        v1 = (struct.pack("<2sBI", b"TQ", 1, 1)
+              + struct.pack("<qBBII", 8, Task.STATUS_CODE_BY_NAME[Task.STATUS_COMPLETED], 1, len(titulo), 0)
+              + titulo)
+        tarea = decode_tasks(v1)[0]
+        self.assertEqual((tarea.task_id, tarea.status, tarea.created_at, tarea.depends_on),
+                         (8, Task.STATUS_COMPLETED, None, ()))
+
+    def test_datos_truncados(self):
+        datos = encode_tasks(crear_tareas())
+        for final in (3, len(datos) // 2, len(datos) - 1):
+            with self.subTest(final=final):
+                with self.assertRaises(ValueError):
+                    decode_tasks(datos[:final])
+
+if __name__ == "__main__":
+    unittest.main()
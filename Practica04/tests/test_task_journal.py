@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del modo diario de FileManager: lo que se cambia se recupera al
+volver a cargar, también con el almacén columnar (TaskStore).
+
+Requiere haber compilado la extensión (python setup.py build_ext --inplace).
+
+Uso (desde la carpeta Practica04):
+    python -m unittest discover -s tests
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.FileManager import FileManager
+from src.coreClasses.Task import Task
+from src.coreClasses.TaskStore import TaskStore
+
+def silencioso(funcion, *args, **kwargs):
+    """Ejecuta la función sin los mensajes de FileManager."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcion(*args, **kwargs)
+
+class TestDiario(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def cargar(self, con_almacen: bool):
+        """Carga en modo diario los archivos de la prueba (uno por tipo de contenedor)."""
+        nombre = "almacen" if con_almacen else "tareas"
+        gestor = silencioso(FileManager, os.path.join(self.directorio.name, nombre + ".json"),
+                            os.path.join(self.directorio.name, nombre + "_contador.json"), journal=True)
+        pendientes, completadas = silencioso(gestor.load_all_data, store=TaskStore() if con_almacen else None)
+        return gestor, pendientes, completadas
+
+    def test_edicion_masiva_de_prioridad(self):
+        for con_almacen in (False, True):
+            with self.subTest(con_almacen=con_almacen):
+                gestor, pendientes, completadas = self.cargar(con_almacen)
+                pendientes.addTasks([Task(i, f"Tarea {i}", "") for i in range(1, 5)])
+                completadas.addTask(pendientes.completeTask())
+                self.assertEqual(pendientes.bulkEditPriority(Task.PRIORITY_URGENT), 3)
+                self.assertEqual(completadas.bulkEditPriority(Task.PRIORITY_MEDIUM), 1)
+                silencioso(gestor.save_all_data, pendientes, completadas)
+                silencioso(gestor.close)
+
+                gestor, pendientes, completadas = self.cargar(con_almacen)
+                self.assertEqual([task.priority for task in pendientes.taskList()], [Task.PRIORITY_URGENT] * 3)
+                self.assertEqual([task.priority for task in completadas.taskList()], [Task.PRIORITY_MEDIUM])
+                self.assertEqual(pendientes.countTasks(Task.PRIORITY_URGENT), 3)
+                silencioso(gestor.close)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Benchmark comparativo entre el árbol AVL y el árbol B.
+
+Mide el tiempo de inserción, búsqueda, consulta por rango y eliminación
+para distintos tamaños y muestra a partir de qué tamaño el árbol B
+supera al AVL en cada operación.
+
+Uso (desde la carpeta Practica05):
+    python benchmarks/benchmark_arboles.py [tamaño1 tamaño2 ...]
+"""
+import os
+import random
+import sys
+import time
+
+# Permite importar src.* al ejecutar el script directamente
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.avl import AVL
+from src.arbol_b import ArbolB
+
+TAMANIOS_POR_DEFECTO = [1_000, 10_000, 100_000, 300_000]
+ORDEN_ARBOL_B = 64
+CONSULTAS_RANGO = 200
+
+def _cronometrar(funcion):
+    """Ejecuta la función y devuelve (segundos, resultado)."""
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+def medir(arbol, valores, busquedas, rangos):
+    """
+    Mide las cuatro operaciones sobre un árbol vacío.
+
+    Returns:
+        dict: Segundos empleados por operación.
+    """
+    def insertar_todos():
+        raiz = None
+        for valor in valores:
+            raiz = arbol.insertar(raiz, valor)
+        return raiz
+
+    tiempos = {}
+    tiempos["insertar"], raiz = _cronometrar(insertar_todos)
+    tiempos["buscar"], _ = _cronometrar(lambda: [arbol.buscar(raiz, v) for v in busquedas])
+    tiempos["rango"], _ = _cronometrar(lambda: [sum(1 for _ in arbol.rango(raiz, a, b)) for a, b in rangos])
+
+    def eliminar_todos():
+        actual = raiz
+        for valor in busquedas:
+            actual = arbol.eliminar(actual, valor)
+        return actual
+
+    tiempos["eliminar"], _ = _cronometrar(eliminar_todos)
+    return tiempos
+
+def main(tamanios):
+    """Ejecuta el benchmark para cada tamaño e imprime la tabla de resultados."""
+    sys.setrecursionlimit(10_000)
+    random.seed(42)
+    operaciones = ["insertar", "buscar", "rango", "eliminar"]
+    cruce = {op: None for op in operaciones}
+
+    print(f"Árbol B de orden {ORDEN_ARBOL_B}. Tiempos en segundos (AVL / B).")
+    print(f"{'n':>9} | " + " | ".join(f"{op:^19}" for op in operaciones))
+    for n in tamanios:
+        valores = random.sample(range(n * 10), n)
+        busquedas = random.sample(valores, min(n, 10_000))
+        rangos = []
+        for _ in range(CONSULTAS_RANGO):
+            a = random.randrange(n * 10)
+            rangos.append((a, a + 500))
+
+        avl = medir(AVL(), valores, busquedas, rangos)
+        arbol_b = medir(ArbolB(ORDEN_ARBOL_B), valores, busquedas, rangos)
+
+        celdas = []
+        for op in operaciones:
+            celdas.append(f"{avl[op]:8.4f} / {arbol_b[op]:8.4f}")
+            if cruce[op] is None and arbol_b[op] < avl[op]:
+                cruce[op] = n
+        print(f"{n:>9} | " + " | ".join(celdas))
+
+    print("\nTamaño a partir del cual el árbol B es más rápido:")
+    for op in operaciones:
+        print(f"  {op:<9}: {cruce[op] if cruce[op] is not None else 'no lo supera en los tamaños medidos'}")
+
+if __name__ == "__main__":
+    argumentos = [int(arg) for arg in sys.argv[1:]]
+    main(argumentos or TAMANIOS_POR_DEFECTO)
@@ -0,0 +1,97 @@
+"""
+Prueba de estrés del AVL concurrente: N hilos lectores y 1 escritor.
+
+El escritor inserta (y elimina) valores por lotes y, tras cada lote,
+verifica las invariantes del AVL. En modo copia en escritura los lectores
+también verifican cada instantánea que toman, comprobando que nunca ven
+un árbol a medio modificar.
+
+Uso (desde la carpeta Practica05):
+    python benchmarks/estres_avl_concurrente.py [lectores] [lotes] [tamaño_lote]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.avl_concurrente import AVLConcurrente, verificar_invariantes
+
+def ejecutar(copia_en_escritura, lectores, lotes, tamanio_lote):
+    """
+    Ejecuta la prueba en un modo.
+
+    Returns:
+        tuple: (errores, lecturas realizadas, segundos)
+    """
+    arbol = AVLConcurrente(copia_en_escritura=copia_en_escritura)
+    terminado = threading.Event()
+    errores = []
+    lecturas = [0] * lectores
+
+    def lector(indice):
+        rnd = random.Random(indice)
+        while not terminado.is_set():
+            try:
+                if copia_en_escritura and rnd.random() < 0.05:
+                    # Una instantánea debe ser siempre un AVL válido
+                    foto = arbol.instantanea()
+                    verificar_invariantes(foto)
+                else:
+                    arbol.buscar(rnd.randrange(lotes * tamanio_lote * 4))
+                    arbol.rango(0, 100)
+                lecturas[indice] += 1
+            except Exception as e:
+                errores.append(f"Lector {indice}: {e!r}")
+                return
+
+    hilos = [threading.Thread(target=lector, args=(i,)) for i in range(lectores)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+
+    rnd = random.Random(1234)
+    insertados = []
+    try:
+        for _ in range(lotes):
+            lote = [rnd.randrange(lotes * tamanio_lote * 4) for _ in range(tamanio_lote)]
+            arbol.insertar_lote(lote)
+            insertados.extend(lote)
+            # Eliminar algunos para ejercitar también las rotaciones de borrado
+            for valor in rnd.sample(insertados, tamanio_lote // 4):
+                if arbol.eliminar(valor):
+                    insertados.remove(valor)
+            nodos = verificar_invariantes(arbol.instantanea())
+            if nodos != len(arbol) or nodos != len(insertados):
+                errores.append(f"Escritor: {nodos} nodos, se esperaban {len(insertados)}")
+                break
+    except Exception as e:
+        errores.append(f"Escritor: {e!r}")
+    finally:
+        terminado.set()
+        for hilo in hilos:
+            hilo.join()
+
+    if sorted(insertados) != arbol.rango():
+        errores.append("El contenido final no coincide con los valores insertados")
+    return errores, sum(lecturas), time.perf_counter() - inicio
+
+def main(lectores=4, lotes=200, tamanio_lote=100):
+    """Ejecuta la prueba en ambos modos e informa del resultado."""
+    correcto = True
+    for copia_en_escritura in (False, True):
+        modo = "copia en escritura" if copia_en_escritura else "candado lectores-escritor"
+        errores, lecturas, segundos = ejecutar(copia_en_escritura, lectores, lotes, tamanio_lote)
+        estado = "OK" if not errores else f"{len(errores)} ERRORES"
+        print(f"[{modo}] {lectores} lectores, {lotes} lotes de {tamanio_lote}: "
+              f"{lecturas} lecturas en {segundos:.2f} s -> {estado}")
+        for error in errores[:10]:
+            print("   ", error)
+        correcto = correcto and not errores
+    return correcto
+
+if __name__ == "__main__":
+    argumentos = [int(arg) for arg in sys.argv[1:4]]
+    sys.exit(0 if main(*argumentos) else 1)
@@ -1,8 +1,24 @@
 from src.persistencia import guardar_valores, leer_valores
-from src.visualizacion import generar_visualizacion_avl
+from src.visualizacion import generar_visualizacion_avl, generar_visualizacion_arbol_b
 from src.avl import AVL # Importa la clase AVL para crear el árbol
+from src.arbol_b import ArbolB # Backend alternativo con la misma interfaz
 import sys # Para salir del programa
 
+# Backend usado para construir el árbol: "avl" o "b"
+TIPO_ARBOL = "avl"
+ORDEN_ARBOL_B = 4 # Fanout del árbol B (orden bajo para que la imagen sea legible)
+
+def crear_arbol(tipo_arbol=TIPO_ARBOL, orden=ORDEN_ARBOL_B):
+    """
+    Crea el árbol del tipo indicado. Ambos comparten la interfaz
+    insertar/eliminar/buscar/rango, por lo que son intercambiables.
+    """
+    if tipo_arbol == "avl":
+        return AVL()
+    if tipo_arbol == "b":
+        return ArbolB(orden)
+    raise ValueError(f"Tipo de árbol no soportado: '{tipo_arbol}'")
+
 def mostrar_menu():
     """Muestra el menú de opciones al usuario."""
     print("\n¿Qué deseas hacer?")
@@ -67,9 +83,12 @@ def opcion_modificar_valores():
         print("No se introdujeron valores para modificar.")
 
 
-def opcion_visualizar_arbol():
+def opcion_visualizar_arbol(tipo_arbol=TIPO_ARBOL):
     """
     Maneja la opción 3: Visualizar el árbol.
+
+    Args:
+        tipo_arbol (str): "avl" (por defecto) o "b" para usar el árbol B.
     """
     print("\n--- Visualizar Árbol ---")
     nombre_archivo = input("Introduce el nombre de tu archivo (ej: Arboles.txt): ")
@@ -89,8 +108,8 @@ def opcion_visualizar_arbol():
     print(f"Valores leídos: {valores}")
 
     #Crea el árbol AVL y lo visualiza
-    print("Construyendo el árbol AVL...")
-    arbol = AVL()
+    print("Construyendo el árbol AVL..." if tipo_arbol == "avl" else "Construyendo el árbol B...")
+    arbol = crear_arbol(tipo_arbol)
     raiz = None
     for valor in valores:
         raiz = arbol.insertar(raiz, valor)
@@ -99,7 +118,10 @@ def opcion_visualizar_arbol():
     if not nombre_archivo_salida:
         nombre_archivo = nombre_archivo.split('.')[0] # Extrae el nombre sin extensión
         nombre_archivo_salida = nombre_archivo # Valor por defecto si no se ingresa nada
-    generar_visualizacion_avl(raiz, nombre_archivo_salida)
+    if tipo_arbol == "b":
+        generar_visualizacion_arbol_b(raiz, nombre_archivo_salida)
+    else:
+        generar_visualizacion_avl(raiz, nombre_archivo_salida)
 
 
 def main():
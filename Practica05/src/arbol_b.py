@@ -0,0 +1,273 @@
+from bisect import bisect_left, bisect_right
+
+class NodoB:
+    """
+    Clase para representar un nodo en el árbol B.
+
+    A diferencia del Nodo del AVL, cada nodo guarda varias claves en una
+    lista contigua, por lo que una búsqueda recorre pocos nodos (uno por nivel)
+    y compara las claves dentro de cada nodo con búsqueda binaria.
+    """
+    __slots__ = ("claves", "hijos")
+
+    def __init__(self, claves=None, hijos=None):
+        """
+        Inicializa un nodo.
+
+        Args:
+            claves (list): Claves ordenadas del nodo.
+            hijos (list): Hijos del nodo (lista vacía si es hoja).
+        """
+        self.claves = claves if claves is not None else []
+        self.hijos = hijos if hijos is not None else []
+
+    @property
+    def es_hoja(self):
+        """Indica si el nodo no tiene hijos."""
+        return not self.hijos
+
+class ArbolB:
+    """
+    Clase para representar la estructura de datos Árbol B.
+
+    Ofrece la misma interfaz que la clase AVL (insertar, eliminar, buscar,
+    rango e inorden reciben la raíz y devuelven la nueva raíz cuando la
+    modifican), de modo que ambos árboles son intercambiables.
+    Al igual que el AVL, admite valores repetidos.
+    """
+    def __init__(self, orden=32):
+        """
+        Inicializa el árbol.
+
+        Args:
+            orden (int): Número máximo de hijos por nodo (fanout). Debe ser
+                         par y al menos 4. Cada nodo guarda hasta orden - 1 claves.
+        """
+        if orden < 4:
+            raise ValueError("El orden del árbol B debe ser al menos 4.")
+        if orden % 2:
+            # La división de nodos llenos (insertar de una pasada) necesita 2t hijos
+            raise ValueError("El orden del árbol B debe ser par.")
+        # Grado mínimo: todo nodo salvo la raíz tiene al menos t - 1 claves
+        self.t = orden // 2
+        self.max_claves = 2 * self.t - 1
+
+    def _dividir_hijo(self, padre, i):
+        """
+        Divide el hijo i (lleno) del padre en dos nodos y sube la clave
+        central al padre.
+        """
+        t = self.t
+        hijo = padre.hijos[i]
+        nuevo = NodoB(hijo.claves[t:], hijo.hijos[t:])
+        padre.claves.insert(i, hijo.claves[t - 1])
+        padre.hijos.insert(i + 1, nuevo)
+        del hijo.claves[t - 1:]
+        del hijo.hijos[t:]
+
+    def insertar(self, raiz, valor):
+        """
+        Inserta un valor en el árbol B dividiendo los nodos llenos
+        en el camino de bajada.
+
+        Returns:
+            La nueva raíz del árbol.
+        """
+        if not raiz:
+            return NodoB([valor])
+
+        # Si la raíz está llena, el árbol crece en altura
+        if len(raiz.claves) == self.max_claves:
+            nueva_raiz = NodoB([], [raiz])
+            self._dividir_hijo(nueva_raiz, 0)
+            raiz = nueva_raiz
+
+        nodo = raiz
+        while not nodo.es_hoja:
+            i = bisect_right(nodo.claves, valor)
+            if len(nodo.hijos[i].claves) == self.max_claves:
+                self._dividir_hijo(nodo, i)
+                if valor >= nodo.claves[i]:
+                    i += 1
+            nodo = nodo.hijos[i]
+        nodo.claves.insert(bisect_right(nodo.claves, valor), valor)
+        return raiz
+
+    def buscar(self, raiz, valor):
+        """
+        Busca un valor en el árbol.
+
+        Returns:
+            El nodo que contiene el valor, o None si no existe.
+        """
+        nodo = raiz
+        while nodo:
+            i = bisect_left(nodo.claves, valor)
+            if i < len(nodo.claves) and nodo.claves[i] == valor:
+                return nodo
+            if nodo.es_hoja:
+                return None
+            nodo = nodo.hijos[i]
+        return None
+
+    def _maximo(self, nodo):
+        """Devuelve la clave más grande del subárbol."""
+        while not nodo.es_hoja:
+            nodo = nodo.hijos[-1]
+        return nodo.claves[-1]
+
+    def _minimo(self, nodo):
+        """Devuelve la clave más pequeña del subárbol."""
+        while not nodo.es_hoja:
+            nodo = nodo.hijos[0]
+        return nodo.claves[0]
+
+    def _fusionar(self, padre, i):
+        """
+        Fusiona el hijo i + 1 del padre dentro del hijo i, bajando
+        la clave que los separa.
+        """
+        izquierdo = padre.hijos[i]
+        derecho = padre.hijos.pop(i + 1)
+        izquierdo.claves.append(padre.claves.pop(i))
+        izquierdo.claves.extend(derecho.claves)
+        izquierdo.hijos.extend(derecho.hijos)
+
+    def _rellenar(self, padre, i):
+        """
+        Garantiza que el hijo i del padre tenga al menos t claves antes de
+        bajar a él, pidiendo prestada una clave a un hermano o fusionando.
+
+        Returns:
+            El índice del hijo por el que debe continuar la eliminación.
+        """
+        t = self.t
+        hijo = padre.hijos[i]
+        # Préstamo del hermano izquierdo
+        if i > 0 and len(padre.hijos[i - 1].claves) >= t:
+            hermano = padre.hijos[i - 1]
+            hijo.claves.insert(0, padre.claves[i - 1])
+            padre.claves[i - 1] = hermano.claves.pop()
+            if not hermano.es_hoja:
+                hijo.hijos.insert(0, hermano.hijos.pop())
+            return i
+        # Préstamo del hermano derecho
+        if i < len(padre.claves) and len(padre.hijos[i + 1].claves) >= t:
+            hermano = padre.hijos[i + 1]
+            hijo.claves.append(padre.claves[i])
+            padre.claves[i] = hermano.claves.pop(0)
+            if not hermano.es_hoja:
+                hijo.hijos.append(hermano.hijos.pop(0))
+            return i
+        # Ningún hermano puede prestar: fusionar
+        if i < len(padre.claves):
+            self._fusionar(padre, i)
+            return i
+        self._fusionar(padre, i - 1)
+        return i - 1
+
+    def _eliminar(self, nodo, valor):
+        """Elimina el valor del subárbol cuya raíz tiene al menos t claves."""
+        t = self.t
+        while True:
+            i = bisect_left(nodo.claves, valor)
+            if i < len(nodo.claves) and nodo.claves[i] == valor:
+                if nodo.es_hoja:
+                    del nodo.claves[i]
+                    return
+                izquierdo, derecho = nodo.hijos[i], nodo.hijos[i + 1]
+                if len(izquierdo.claves) >= t:
+                    # Reemplazar por el predecesor y eliminarlo del hijo izquierdo
+                    valor = self._maximo(izquierdo)
+                    nodo.claves[i] = valor
+                    nodo = izquierdo
+                elif len(derecho.claves) >= t:
+                    # Reemplazar por el sucesor y eliminarlo del hijo derecho
+                    valor = self._minimo(derecho)
+                    nodo.claves[i] = valor
+                    nodo = derecho
+                else:
+                    self._fusionar(nodo, i)
+                    nodo = izquierdo
+                continue
+
+            if nodo.es_hoja:
+                return # El valor no está en el árbol
+            if len(nodo.hijos[i].claves) < t:
+                i = self._rellenar(nodo, i)
+            nodo = nodo.hijos[i]
+
+    def eliminar(self, raiz, valor):
+        """
+        Elimina una aparición del valor del árbol B. Si el valor no existe,
+        el árbol no cambia.
+
+        Returns:
+            La nueva raíz del árbol.
+        """
+        if not raiz:
+            return raiz
+        self._eliminar(raiz, valor)
+        # Si la raíz se quedó sin claves, el árbol pierde un nivel
+        if not raiz.claves:
+            return raiz.hijos[0] if not raiz.es_hoja else None
+        return raiz
+
+    def rango(self, raiz, minimo=None, maximo=None):
+        """
+        Generador que recorre en orden los valores comprendidos en
+        [minimo, maximo]. Un límite None se considera abierto.
+        """
+        if not raiz:
+            return
+        claves = raiz.claves
+        inicio = 0 if minimo is None else bisect_left(claves, minimo)
+        if raiz.es_hoja:
+            fin = len(claves) if maximo is None else bisect_right(claves, maximo)
+            yield from claves[inicio:fin]
+            return
+        for i in range(inicio, len(claves)):
+            yield from self.rango(raiz.hijos[i], minimo, maximo)
+            if maximo is not None and claves[i] > maximo:
+                return
+            yield claves[i]
+        yield from self.rango(raiz.hijos[-1], minimo, maximo)
+
+    def inorden(self, raiz):
+        """
+        Generador con todos los valores del árbol en orden ascendente.
+        """
+        return self.rango(raiz)
+
+    # Método auxiliar para imprimir el árbol (puede ser útil para pruebas)
+    def preorden(self, raiz, nivel=0):
+        """
+        Recorrido preorden para imprimir el árbol, un nodo por línea
+        con sangría según su nivel.
+        """
+        if not raiz:
+            return
+        print("  " * nivel + str(raiz.claves))
+        for hijo in raiz.hijos:
+            self.preorden(hijo, nivel + 1)
+
+# Ejemplo básico de uso para probar inserciones y eliminaciones en consola
+if __name__ == "__main__":
+    arbol_b = ArbolB(orden=4)
+    raiz = None
+
+    valores = [30, 20, 40, 10, 25, 5, 15, 27, 35, 50, 1]
+
+    print("Insertando valores:", valores)
+    for valor in valores:
+        raiz = arbol_b.insertar(raiz, valor)
+
+    print("\nÁrbol B final (preorden):")
+    arbol_b.preorden(raiz)
+
+    print("\nValores entre 10 y 30:", list(arbol_b.rango(raiz, 10, 30)))
+
+    for valor in [20, 5, 40]:
+        raiz = arbol_b.eliminar(raiz, valor)
+        print(f"\nEliminado {valor}. Árbol actual (preorden):")
+        arbol_b.preorden(raiz)
@@ -100,11 +100,12 @@ class AVL:
             return self.rotacion_derecha(raiz)
 
         # Caso Derecha Derecha (Rotación Simple Izquierda)
-        if balance < -1 and valor > raiz.hijo_derecho.valor:
+        # Los valores repetidos se insertan a la derecha, por eso se usa >=
+        if balance < -1 and valor >= raiz.hijo_derecho.valor:
             return self.rotacion_izquierda(raiz)
 
         # Caso Izquierda Derecha (Rotación Doble Izquierda-Derecha)
-        if balance > 1 and valor > raiz.hijo_izquierdo.valor:
+        if balance > 1 and valor >= raiz.hijo_izquierdo.valor:
             raiz.hijo_izquierdo = self.rotacion_izquierda(raiz.hijo_izquierdo)
             return self.rotacion_derecha(raiz)
 
@@ -116,6 +117,114 @@ class AVL:
         # Si no hubo desbalanceo, retornar la raíz sin cambios
         return raiz
 
+    def _rebalancear(self, raiz):
+        """
+        Actualiza la altura de un nodo y aplica la rotación necesaria
+        usando el balance de sus hijos (útil tras una eliminación, donde
+        no se conoce el valor que provocó el desbalanceo).
+        """
+        raiz.altura = 1 + max(self.get_altura(raiz.hijo_izquierdo),
+                           self.get_altura(raiz.hijo_derecho))
+        balance = self.get_balance(raiz)
+
+        # Subárbol izquierdo más alto
+        if balance > 1:
+            if self.get_balance(raiz.hijo_izquierdo) < 0: # Caso Izquierda Derecha
+                raiz.hijo_izquierdo = self.rotacion_izquierda(raiz.hijo_izquierdo)
+            return self.rotacion_derecha(raiz)
+
+        # Subárbol derecho más alto
+        if balance < -1:
+            if self.get_balance(raiz.hijo_derecho) > 0: # Caso Derecha Izquierda
+                raiz.hijo_derecho = self.rotacion_derecha(raiz.hijo_derecho)
+            return self.rotacion_izquierda(raiz)
+
+        return raiz
+
+    def get_nodo_minimo(self, raiz):
+        """
+        Devuelve el nodo con el valor más pequeño del subárbol.
+        """
+        actual = raiz
+        while actual and actual.hijo_izquierdo:
+            actual = actual.hijo_izquierdo
+        return actual
+
+    def eliminar(self, raiz, valor):
+        """
+        Elimina una aparición del valor del árbol AVL y mantiene el balance.
+        Si el valor no existe, el árbol no cambia.
+
+        Returns:
+            La nueva raíz del subárbol.
+        """
+        # 1. Eliminación estándar de un ABB
+        if not raiz:
+            return raiz
+        elif valor < raiz.valor:
+            raiz.hijo_izquierdo = self.eliminar(raiz.hijo_izquierdo, valor)
+        elif valor > raiz.valor:
+            raiz.hijo_derecho = self.eliminar(raiz.hijo_derecho, valor)
+        else:
+            # Nodo con un solo hijo o sin hijos
+            if raiz.hijo_izquierdo is None:
+                return raiz.hijo_derecho
+            if raiz.hijo_derecho is None:
+                return raiz.hijo_izquierdo
+            # Nodo con dos hijos: copiar el sucesor en orden y eliminarlo
+            sucesor = self.get_nodo_minimo(raiz.hijo_derecho)
+            raiz.valor = sucesor.valor
+            raiz.hijo_derecho = self.eliminar(raiz.hijo_derecho, sucesor.valor)
+
+        # 2. Actualizar altura y rebalancear
+        return self._rebalancear(raiz)
+
+    def buscar(self, raiz, valor):
+        """
+        Busca un valor en el árbol de forma iterativa.
+
+        Returns:
+            El nodo que contiene el valor, o None si no existe.
+        """
+        actual = raiz
+        while actual:
+            if valor < actual.valor:
+                actual = actual.hijo_izquierdo
+            elif valor > actual.valor:
+                actual = actual.hijo_derecho
+            else:
+                return actual
+        return None
+
+    def rango(self, raiz, minimo=None, maximo=None):
+        """
+        Generador que recorre en orden los valores comprendidos en
+        [minimo, maximo]. Un límite None se considera abierto.
+        Usa una pila explícita para no depender del límite de recursión.
+        """
+        pila = []
+        actual = raiz
+        while pila or actual:
+            if actual:
+                # Solo bajar a la izquierda si puede haber valores >= minimo
+                if minimo is not None and actual.valor < minimo:
+                    actual = actual.hijo_derecho
+                    continue
+                pila.append(actual)
+                actual = actual.hijo_izquierdo
+            else:
+                nodo = pila.pop()
+                if maximo is not None and nodo.valor > maximo:
+                    return
+                yield nodo.valor
+                actual = nodo.hijo_derecho
+
+    def inorden(self, raiz):
+        """
+        Generador con todos los valores del árbol en orden ascendente.
+        """
+        return self.rango(raiz)
+
     # Método auxiliar para imprimir el árbol (puede ser útil para pruebas)
     def preorden(self, raiz):
         """
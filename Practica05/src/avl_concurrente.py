@@ -0,0 +1,257 @@
+import threading
+from contextlib import contextmanager
+
+if __name__ == "__main__": #Para evitar errores de importación al ejecutar el script directamente
+    from avl import AVL, Nodo
+else:
+    from src.avl import AVL, Nodo
+
+class CandadoLectoresEscritor:
+    """
+    Candado de lectores-escritor: permite varios lectores simultáneos o un
+    único escritor. Da preferencia a los escritores para que un flujo
+    continuo de lecturas no los deje esperando indefinidamente.
+    """
+    def __init__(self):
+        """Inicializa el candado sin lectores ni escritores activos."""
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritor_activo = False
+        self._escritores_esperando = 0
+
+    def adquirir_lectura(self):
+        """Bloquea hasta que no haya escritores activos ni esperando."""
+        with self._condicion:
+            while self._escritor_activo or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+
+    def liberar_lectura(self):
+        """Libera una lectura y despierta a los escritores si era la última."""
+        with self._condicion:
+            self._lectores -= 1
+            if self._lectores == 0:
+                self._condicion.notify_all()
+
+    def adquirir_escritura(self):
+        """Bloquea hasta tener acceso exclusivo."""
+        with self._condicion:
+            self._escritores_esperando += 1
+            while self._escritor_activo or self._lectores:
+                self._condicion.wait()
+            self._escritores_esperando -= 1
+            self._escritor_activo = True
+
+    def liberar_escritura(self):
+        """Libera el acceso exclusivo."""
+        with self._condicion:
+            self._escritor_activo = False
+            self._condicion.notify_all()
+
+    @contextmanager
+    def lectura(self):
+        """Permite usar el candado de lectura con 'with'."""
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar_lectura()
+
+    @contextmanager
+    def escritura(self):
+        """Permite usar el candado de escritura con 'with'."""
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar_escritura()
+
+class AVLPersistente(AVL):
+    """
+    Variante del AVL que nunca modifica nodos existentes: copia los nodos
+    del camino que cambia (path copying) y devuelve una raíz nueva.
+    Las raíces anteriores siguen siendo árboles válidos e inmutables,
+    por lo que sirven como instantáneas para lectores concurrentes.
+    """
+    def _copiar(self, nodo):
+        """Devuelve una copia superficial del nodo (o None)."""
+        if nodo is None:
+            return None
+        copia = Nodo(nodo.valor)
+        copia.hijo_izquierdo = nodo.hijo_izquierdo
+        copia.hijo_derecho = nodo.hijo_derecho
+        copia.altura = nodo.altura
+        return copia
+
+    def rotacion_derecha(self, z):
+        """Rotación derecha sobre copias de los nodos que se modifican."""
+        z = self._copiar(z)
+        z.hijo_izquierdo = self._copiar(z.hijo_izquierdo)
+        return super().rotacion_derecha(z)
+
+    def rotacion_izquierda(self, y):
+        """Rotación izquierda sobre copias de los nodos que se modifican."""
+        y = self._copiar(y)
+        y.hijo_derecho = self._copiar(y.hijo_derecho)
+        return super().rotacion_izquierda(y)
+
+    def insertar(self, raiz, valor):
+        """
+        Inserta copiando cada nodo del camino. Las llamadas recursivas de
+        AVL.insertar vuelven a pasar por aquí, así que todo el camino se copia.
+        """
+        return super().insertar(self._copiar(raiz), valor)
+
+    def eliminar(self, raiz, valor):
+        """Elimina copiando cada nodo del camino."""
+        return super().eliminar(self._copiar(raiz), valor)
+
+class AVLConcurrente:
+    """
+    Envoltura segura para hilos sobre un árbol AVL.
+
+    Tiene dos modos:
+        * Con candado (por defecto): las lecturas comparten un candado de
+          lectores-escritor y las escrituras lo toman en exclusiva.
+        * Copia en escritura (copia_en_escritura=True): el escritor construye
+          una raíz nueva con AVLPersistente y la publica con una sola
+          asignación. Los lectores trabajan sobre una instantánea consistente
+          sin bloquear ni ser bloqueados por el escritor.
+    """
+    def __init__(self, copia_en_escritura=False):
+        """
+        Inicializa un árbol vacío.
+
+        Args:
+            copia_en_escritura (bool): Activa el modo de instantáneas.
+        """
+        self.copia_en_escritura = copia_en_escritura
+        self._raiz = None
+        self._tamanio = 0
+        if copia_en_escritura:
+            self._arbol = AVLPersistente()
+            # Solo serializa a los escritores entre sí
+            self._candado_escritura = threading.Lock()
+        else:
+            self._arbol = AVL()
+            self._candado = CandadoLectoresEscritor()
+
+    @contextmanager
+    def _escritura(self):
+        """Sección crítica de escritura según el modo."""
+        if self.copia_en_escritura:
+            with self._candado_escritura:
+                yield
+        else:
+            with self._candado.escritura():
+                yield
+
+    @contextmanager
+    def _lectura(self):
+        """
+        Devuelve la raíz sobre la que leer. En modo copia en escritura no
+        toma ningún candado: la raíz leída es inmutable.
+        """
+        if self.copia_en_escritura:
+            yield self._raiz
+        else:
+            with self._candado.lectura():
+                yield self._raiz
+
+    def insertar(self, valor):
+        """Inserta un valor en el árbol."""
+        with self._escritura():
+            self._raiz = self._arbol.insertar(self._raiz, valor)
+            self._tamanio += 1
+
+    def insertar_lote(self, valores):
+        """
+        Inserta varios valores en una sola sección crítica. En modo copia en
+        escritura los lectores ven el lote completo o nada de él.
+        """
+        with self._escritura():
+            raiz = self._raiz
+            for valor in valores:
+                raiz = self._arbol.insertar(raiz, valor)
+                self._tamanio += 1
+            self._raiz = raiz
+
+    def eliminar(self, valor):
+        """
+        Elimina una aparición del valor.
+
+        Returns:
+            bool: True si el valor existía y fue eliminado.
+        """
+        with self._escritura():
+            if self._arbol.buscar(self._raiz, valor) is None:
+                return False
+            self._raiz = self._arbol.eliminar(self._raiz, valor)
+            self._tamanio -= 1
+            return True
+
+    def buscar(self, valor):
+        """Indica si el valor está en el árbol."""
+        with self._lectura() as raiz:
+            return self._arbol.buscar(raiz, valor) is not None
+
+    def rango(self, minimo=None, maximo=None):
+        """Devuelve la lista ordenada de valores en [minimo, maximo]."""
+        with self._lectura() as raiz:
+            return list(self._arbol.rango(raiz, minimo, maximo))
+
+    def instantanea(self):
+        """
+        Devuelve la raíz actual. Solo es una instantánea consistente en modo
+        copia en escritura; en modo con candado el árbol puede cambiar después.
+        """
+        return self._raiz
+
+    def __len__(self):
+        return self._tamanio
+
+def verificar_invariantes(raiz):
+    """
+    Comprueba que el árbol cumple las propiedades de un AVL: orden de
+    búsqueda, alturas almacenadas correctas y balance entre -1 y 1.
+
+    Returns:
+        int: Número de nodos del árbol.
+
+    Raises:
+        ValueError: Si alguna propiedad no se cumple.
+    """
+    total = 0
+    # Recorrido postorden iterativo con límites (minimo, maximo) por nodo
+    pila = [(raiz, None, None, False)]
+    alturas = {}
+    while pila:
+        nodo, minimo, maximo, visitado = pila.pop()
+        if nodo is None:
+            continue
+        if not visitado:
+            if (minimo is not None and nodo.valor < minimo) or (maximo is not None and nodo.valor > maximo):
+                raise ValueError(f"Orden inválido en el nodo {nodo.valor}")
+            pila.append((nodo, minimo, maximo, True))
+            pila.append((nodo.hijo_izquierdo, minimo, nodo.valor, False))
+            pila.append((nodo.hijo_derecho, nodo.valor, maximo, False))
+            continue
+        altura_izq = alturas.pop(id(nodo.hijo_izquierdo), 0)
+        altura_der = alturas.pop(id(nodo.hijo_derecho), 0)
+        if nodo.altura != 1 + max(altura_izq, altura_der):
+            raise ValueError(f"Altura incorrecta en el nodo {nodo.valor}")
+        if abs(altura_izq - altura_der) > 1:
+            raise ValueError(f"Nodo {nodo.valor} desbalanceado")
+        alturas[id(nodo)] = nodo.altura
+        total += 1
+    return total
+
+# Ejemplo básico de uso
+if __name__ == "__main__":
+    arbol = AVLConcurrente(copia_en_escritura=True)
+    arbol.insertar_lote([30, 20, 40, 10, 25])
+    foto = arbol.instantanea()
+    arbol.insertar_lote([5, 15, 27, 35, 50, 1])
+    print("Instantánea anterior:", list(AVL().inorden(foto)))
+    print("Árbol actual:", arbol.rango())
+    print("Nodos válidos:", verificar_invariantes(arbol.instantanea()))
@@ -71,6 +71,48 @@ def generar_visualizacion_avl(raiz_nodo, nombre_archivo_salida="arbol_avl_img"):
         print(f"\nOcurrió un error al generar o mostrar la visualización: {e}")
         print(f"Se generó el archivo de definición: '{nombre_archivo_salida}.gv'")
 
+def _agregar_nodos_b(nodo, dot):
+    """
+    Función auxiliar recursiva para agregar los nodos de un árbol B
+    (una caja por nodo con todas sus claves) y sus aristas.
+    """
+    dot.node(
+        name=str(id(nodo)),
+        label=" | ".join(str(clave) for clave in nodo.claves),
+        shape='record',
+        fillcolor='lightblue',
+        style='filled'
+    )
+    for hijo in nodo.hijos:
+        _agregar_nodos_b(hijo, dot)
+        dot.edge(str(id(nodo)), str(id(hijo)))
+
+def generar_visualizacion_arbol_b(raiz_nodo, nombre_archivo_salida="arbol_b_img"):
+    """
+    Genera una visualización del árbol B usando Graphviz.
+
+    Args:
+        raiz_nodo (NodoB): El nodo raíz del árbol B a visualizar.
+        nombre_archivo_salida (str): El nombre base para el archivo de imagen
+                                     (sin extensión).
+    """
+    if raiz_nodo is None:
+        print("El árbol está vacío, no se puede generar visualización.")
+        return
+
+    dot = graphviz.Digraph(comment='Árbol B')
+    _agregar_nodos_b(raiz_nodo, dot)
+
+    try:
+        archivo_renderizado = dot.render(nombre_archivo_salida, format='png', view=True, cleanup=True)
+        print(f"Visualización del árbol guardada como '{archivo_renderizado}' y abierta.")
+    except graphviz.backend.execute.ExecutableNotFound:
+        print("\nError: No se encontró la instalación de Graphviz.")
+        print(f"Se generó el archivo de definición: '{nombre_archivo_salida}.gv'")
+    except Exception as e:
+        print(f"\nOcurrió un error al generar o mostrar la visualización: {e}")
+        print(f"Se generó el archivo de definición: '{nombre_archivo_salida}.gv'")
+
 
 # Ejemplo de uso:
 if __name__ == "__main__":